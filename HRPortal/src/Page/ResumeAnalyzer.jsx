@@ -3,7 +3,6 @@ import { useNavigate } from "react-router-dom";
 import SuccessToaster from "../Components/Toaster/SuccessToaser";
 import ErrorToaster from "../Components/Toaster/ErrorToaster";
 import { apibaseURl } from "../config";
-import axios from "axios";
 import {
   FileText,
   Zap,
@@ -48,6 +47,7 @@ export default function ResumeAnalyzer() {
   const [errorMessage, setErrorMessage] = useState("");
   const [isLoading, setIsLoading] = useState(false);
   const [isDragOver, setIsDragOver] = useState(false);
+  const [progress, setProgress] = useState(null);
 
   const analysisTypes = [
     {
@@ -121,6 +121,7 @@ export default function ResumeAnalyzer() {
       setSuccessMessage("");
       setErrorMessage("");
       setIsLoading(true);
+      setProgress(null);
 
       const requiresJobRole = crew === "full";
 
@@ -143,23 +144,18 @@ export default function ResumeAnalyzer() {
         crew,
       });
 
-      // API call
-      const response = await axios.post(`${apibaseURl}/analyze`, formData, {
-        headers: {
-          "Content-Type": "multipart/form-data",
-          withCredentials: true,
-        },
-      });
+      // API call: sections arrive as Server-Sent Events while the crew runs
+      const result = await streamAnalysis(formData);
 
-      if (response.data.success || response.status === 200) {
+      if (result) {
         setSuccessMessage("Resume analyzed successfully!");
-        console.log("Analysis Result:", response.data);
+        console.log("Analysis Result:", result);
 
         // Navigate to results page after a short delay
         setTimeout(() => {
           navigate("/analysis-result", {
             state: {
-              result: response.data,
+              result,
               analysisType: crew,
             },
           });
@@ -173,6 +169,44 @@ export default function ResumeAnalyzer() {
     }
   };
 
+  const streamAnalysis = async (formData) => {
+    const response = await fetch(`${apibaseURl}/analyze/stream`, {
+      method: "POST",
+      body: formData,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Analysis request failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+      const { value, done } = await reader.read();
+      // Closed without a "done" event (server restart, proxy timeout)
+      if (done) throw new Error("Analysis stream ended before the result arrived");
+      buffer += decoder.decode(value, { stream: true });
+
+      const frames = buffer.split("\n\n");
+      buffer = frames.pop();
+      for (const frame of frames) {
+        const event = frame.match(/^event: (.*)$/m)?.[1];
+        const data = frame.match(/^data: (.*)$/m)?.[1];
+        if (!event || !data) continue;
+
+        const payload = JSON.parse(data);
+        if (event === "error") throw new Error(payload.detail);
+        if (event === "done") return payload;
+        if (event === "ats") {
+          setProgress((prev) => ({ ...prev, atsScore: payload.ats?.score }));
+        } else if (event === "resume_markdown" || event === "job_fit") {
+          setProgress((prev) => ({ ...prev, [event]: true }));
+        }
+      }
+    }
+  };
+
   const selectedAnalysis = analysisTypes.find((t) => t.value === crew);
 
   return (
@@ -427,6 +461,14 @@ export default function ResumeAnalyzer() {
                   </>
                 )}
               </Button>
+
+              {isLoading && progress?.atsScore && (
+                <p className="text-center text-sm text-muted-foreground">
+                  ATS score: <span className="font-semibold text-foreground">{progress.atsScore}</span>
+                  {crew !== "ats" && !progress.resume_markdown && " · rewriting resume..."}
+                  {crew === "full" && progress.resume_markdown && !progress.job_fit && " · checking job fit..."}
+                </p>
+              )}
             </form>
           </CardContent>
         </Card>
@@ -1,12 +1,21 @@
+import os
+
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 
+from automatedFormatting.notice_store import CHANGED, NEW, NoticeStore
+
+# Paths next to this script, whatever the working directory
+HERE = os.path.dirname(os.path.abspath(__file__))
+STATE_DB = os.path.join(HERE, "automatedFormatting", "notices.db")
+EXCEL_FILE = os.path.join(HERE, "Book1.xlsx")
+
 # Example URL
 url = "https://ongcindia.com/web/eng/career/recruitment-notice"  # Replace with the actual URL of the page
 
 # Fetch the webpage
-response = requests.get(url)
+response = requests.get(url, timeout=30)
 if response.status_code == 200:
     print("Successfully fetched the webpage.")
 else:
@@ -48,11 +57,22 @@ for item in list_items:
     data.append({'Title': title, 'Date': date, 'Link': full_url})
 
 
-# Convert to DataFrame
+# Compare with the notices seen in earlier runs (recorded only once the sheet is saved)
+store = NoticeStore(STATE_DB)
+notices = [{"title": row['Title'], "date": row['Date'], "link": row['Link']} for row in data]
+delta = store.preview("ongc", notices)
+print(f"{len(delta[NEW])} new and {len(delta[CHANGED])} changed notices.")
+if not delta[NEW] and not delta[CHANGED]:
+    print("Nothing new; Book1.xlsx left as it is.")
+    exit()
+
+# Convert to DataFrame, marking what is new since the last run
+status = {(notice['title'], notice['link']): notice['status'] for notice in delta[NEW] + delta[CHANGED]}
 df = pd.DataFrame(data)
+df['Status'] = [status.get((row['Title'], row['Link']), "") for row in data]
 
-# Save to Excel
-excel_file = "Book1.xlsx"
-df.to_excel(excel_file, index=False, engine='openpyxl')
-print(f"Data successfully saved to {excel_file}.")
+# Save to Excel, then mark the notices as seen (a failed write keeps them new for the next run)
+df.to_excel(EXCEL_FILE, index=False, engine='openpyxl')
+store.update("ongc", notices)
+print(f"Data successfully saved to {EXCEL_FILE}.")
  
\ No newline at end of file
@@ -0,0 +1,74 @@
+import argparse
+import json
+import statistics
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+from webscraping import extract_content_and_links
+
+# Saved copy of https://upsc.gov.in/exams-related-info/exam-notification
+SAVED_PAGE = "fixtures/upsc_exam_notification.html"
+PAGE_URL = "https://upsc.gov.in/exams-related-info/exam-notification"
+
+
+def html_parser_extract(content):
+    # The previous extractor: html.parser, every text node kept (scripts and comments included)
+    soup = BeautifulSoup(content, 'html.parser')
+    content_with_links = []
+    for element in soup.descendants:
+        if isinstance(element, str):
+            if element.strip():
+                content_with_links.append(element.strip())
+        elif element.name == 'a' and element.has_attr('href'):
+            content_with_links.append(f"[Link: {element['href']}]")
+    return content_with_links
+
+
+def measure(extract, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = extract()
+        timings.append(time.perf_counter() - start)
+    return output, {
+        "best_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "items": len(output),
+        "output_bytes": len("".join(item + "\n" for item in output).encode("utf-8")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the html.parser and lxml page extractors")
+    parser.add_argument("--page", default=SAVED_PAGE, help="saved HTML page to parse")
+    parser.add_argument("--url", default=PAGE_URL, help="base URL the page was saved from")
+    parser.add_argument("--fetch", action="store_true", help="download --url to --page first")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.fetch:
+        response = requests.get(args.url, timeout=30)
+        response.raise_for_status()
+        with open(args.page, "wb") as file:
+            file.write(response.content)
+
+    with open(args.page, "rb") as file:
+        content = file.read()
+
+    _, before = measure(lambda: html_parser_extract(content), args.repeat)
+    _, after = measure(lambda: extract_content_and_links(content, args.url), args.repeat)
+    report = {
+        "page": args.page,
+        "page_bytes": len(content),
+        "html_parser": before,
+        "lxml": after,
+        "speedup": round(before["median_ms"] / after["median_ms"], 1),
+        "output_reduction": round(before["output_bytes"] / after["output_bytes"], 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+import argparse
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from formatter import FIELD_LABELS, LABEL_RE, LINK_RE, format_data_locally, new_record, read_raw_data_from_file
+from notice_store import normalize
+
+# Formats a large scrape in pieces. The text/link stream from
+# scrape_content_and_links is cut into chunks at notice boundaries (a notice
+# is never split between chunks), the chunks are formatted concurrently by a
+# backend, and the JSON records are merged and de-duplicated by notice name.
+# A chunk that fails is retried on its own; if it still fails, the records
+# of the other chunks are kept and the failed chunk is reported (and can be
+# written out with --failed to be formatted again later).
+#
+# The local and stub backends read labelled notices ("Name of Examination"
+# ...) only. Plain link listings without labels (ONGC's recruitment page) are
+# still chunked row by row for the chatgpt backend, but give no local records;
+# use the crawler's Site adapters for those pages.
+#
+#   python chunked_formatter.py raw_data.txt exam_data.json --backend stub --failure-rate 0.3
+
+MAX_CHUNK_CHARS = 6000  # about 1500 tokens of prompt per chunk
+MAX_WORKERS = 4
+RETRIES = 2  # extra attempts per chunk
+BACKOFF = 1.0  # seconds before the first retry, doubled for each one
+
+
+class BackendError(Exception):
+    pass
+
+
+# ============================================================================
+# CHUNKING
+# ============================================================================
+
+def notice_starts(items):
+    # Index of the first line of each notice: the line with its name label
+    starts, current_name = [], None
+    label_index = None  # name label whose value is on the next line
+    for index, item in enumerate(items):
+        if LINK_RE.match(item):
+            continue
+        match = LABEL_RE.match(item)
+        if match and match.group("name"):
+            value = match.groups()[-1].strip()
+            if not value:
+                label_index = index
+                continue
+            start = index
+        elif label_index is not None and not match:
+            value, start = item, label_index
+        else:
+            label_index = None
+            continue
+        label_index = None
+        # Same rule as store_value: a repeated name (heading, then table row) is the same notice
+        if value != current_name:
+            starts.append(start)
+            current_name = value
+    return starts
+
+
+def row_starts(items):
+    # No name labels (plain listings): a row starts at its link, followed by its text. Only an LLM
+    # backend makes records of such rows; format_data_locally needs the name labels.
+    return [index for index, item in enumerate(items)
+            if LINK_RE.match(item) and (index == 0 or not LINK_RE.match(items[index - 1]))]
+
+
+@dataclass
+class Chunk:
+    index: int
+    start: int  # item range [start, end) in the stream
+    end: int
+    items: list
+
+    @property
+    def chars(self):
+        return sum(len(item) + 1 for item in self.items)
+
+
+def split_into_chunks(raw_data, max_chars=MAX_CHUNK_CHARS):
+    # Whole notices are packed into chunks of up to max_chars; a longer notice gets a chunk of its own.
+    # Lines before the first notice (site header, menus) are left out.
+    items = raw_data.splitlines() if isinstance(raw_data, str) else raw_data
+    items = [item.strip() for item in items if item and item.strip()]
+
+    starts = notice_starts(items) or row_starts(items)
+    if not starts:
+        starts = [0] if items else []
+    bounds = list(zip(starts, starts[1:] + [len(items)]))
+
+    chunks, chunk_start, chunk_chars = [], None, 0
+    for start, end in bounds:
+        chars = sum(len(item) + 1 for item in items[start:end])
+        if chunk_start is not None and chunk_chars + chars > max_chars:
+            chunks.append(Chunk(len(chunks), chunk_start, start, items[chunk_start:start]))
+            chunk_start = None
+        if chunk_start is None:
+            chunk_start, chunk_chars = start, 0
+        chunk_chars += chars
+    if chunk_start is not None:
+        chunks.append(Chunk(len(chunks), chunk_start, len(items), items[chunk_start:]))
+    return chunks
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class Backend(ABC):
+    name = ""
+    max_workers = None  # cap on concurrent chunks for this backend; None = no cap
+
+    @abstractmethod
+    def format(self, items):
+        # Formats one chunk (a list of lines); returns the records, or the JSON text of an LLM reply
+        ...
+
+    def close(self):
+        # Called once the run is over, to release browsers or connections
+        pass
+
+
+class LocalBackend(Backend):
+    # Rule-based formatter (formatter.format_data_locally)
+    name = "local"
+
+    def format(self, items):
+        return format_data_locally(items)
+
+
+class StubBackend(Backend):
+    # Stands in for an LLM: answers with JSON text after `latency` seconds and fails a share of the
+    # calls (error or malformed reply), to try the pipeline without a browser or API key
+    name = "stub"
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def format(self, items):
+        with self._lock:
+            roll = self._random.random()
+        time.sleep(self.latency)
+        if roll < self.failure_rate / 2:
+            raise BackendError("stub backend: request failed")
+        reply = json.dumps(format_data_locally(items), indent=2)
+        if roll < self.failure_rate:
+            return reply[: len(reply) // 2]  # cut off mid-answer
+        return f"Here is the formatted data:\n```json\n{reply}\n```"
+
+
+class ChatGPTBackend(Backend):
+    # formatter.ChatGPTSession: one Chrome window and one login for the whole run, so chunks go
+    # one at a time; the browser is closed when the run ends
+    name = "chatgpt"
+    max_workers = 1
+
+    def __init__(self):
+        from formatter import ChatGPTSession
+
+        self.session = ChatGPTSession()
+
+    def format(self, items):
+        reply = self.session.ask("\n".join(items))
+        if not reply:
+            raise BackendError("ChatGPT returned no response")
+        return reply
+
+    def close(self):
+        self.session.close()
+
+
+BACKENDS = {backend.name: backend for backend in (LocalBackend, StubBackend, ChatGPTBackend)}
+
+
+def parse_records(reply):
+    # Records from a backend reply: a list, or text holding a JSON array/object (code fences and
+    # surrounding prose are skipped). Raises ValueError when there is no usable JSON.
+    if isinstance(reply, str):
+        decoder = json.JSONDecoder()
+        starts = [index for index in (reply.find("["), reply.find("{")) if index != -1]
+        if not starts:
+            raise ValueError("no JSON in the reply")
+        reply, _ = decoder.raw_decode(reply, min(starts))
+    if isinstance(reply, dict):
+        # {"name": ...} is one record; {"exams": [...]} wraps the list
+        lists = [value for value in reply.values() if isinstance(value, list)]
+        reply = [reply] if "name" in reply or not lists else lists[0]
+    if not isinstance(reply, list) or not all(isinstance(record, dict) for record in reply):
+        raise ValueError("the reply is not a list of records")
+    return [{**new_record(None), **record} for record in reply]
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+@dataclass
+class ChunkResult:
+    index: int
+    start: int
+    end: int
+    chars: int
+    attempts: int = 0
+    seconds: float = 0.0
+    records: list = field(default_factory=list)
+    error: str = None
+
+
+def format_chunk(backend, chunk, retries=RETRIES, backoff=BACKOFF):
+    started = time.perf_counter()
+    result = ChunkResult(index=chunk.index, start=chunk.start, end=chunk.end, chars=chunk.chars)
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        result.attempts = attempt + 1
+        try:
+            result.records = parse_records(backend.format(chunk.items))
+            result.error = None
+            break
+        except Exception as e:  # a failed chunk must not take the others down
+            result.error = f"{e.__class__.__name__}: {e}"
+    result.seconds = round(time.perf_counter() - started, 3)
+    return result
+
+
+def merge_records(results):
+    # Records of all chunks in page order; the same notice (by name) is merged into one record,
+    # keeping the first value of each field and every distinct link
+    merged, by_name = [], {}
+    for result in sorted(results, key=lambda result: result.index):
+        for record in result.records:
+            name = normalize(record.get("name")).lower()
+            key = name or json.dumps(record, sort_keys=True)
+            existing = by_name.get(key)
+            if existing is None:
+                existing = by_name[key] = {**record, "apply_links": [], "document_links": []}
+                merged.append(existing)
+            for field_name in FIELD_LABELS:
+                if not existing.get(field_name) and record.get(field_name):
+                    existing[field_name] = record[field_name]
+            for links in ("apply_links", "document_links"):
+                for link in record.get(links) or []:
+                    if link not in existing[links]:
+                        existing[links].append(link)
+    return merged
+
+
+def format_in_chunks(raw_data, backend=None, max_chars=MAX_CHUNK_CHARS, max_workers=MAX_WORKERS,
+                     retries=RETRIES, backoff=BACKOFF):
+    # Returns (merged records, [ChunkResult]); failed chunks have `error` set and no records
+    backend = backend or LocalBackend()
+    chunks = split_into_chunks(raw_data, max_chars)
+    if backend.max_workers:
+        max_workers = min(max_workers, backend.max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="format") as pool:
+            results = list(pool.map(lambda chunk: format_chunk(backend, chunk, retries, backoff), chunks))
+    finally:
+        backend.close()
+    return merge_records(results), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Format a large scrape in parallel, notice-aligned chunks")
+    parser.add_argument("input_file", nargs="?", default="raw_data.txt")  # raw data file path
+    parser.add_argument("output_file", nargs="?", default="exam_data.json")  # merged JSON records
+    parser.add_argument("--backend", choices=list(BACKENDS), default="local")
+    parser.add_argument("--max-chars", type=int, default=MAX_CHUNK_CHARS, help="character budget per chunk")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--retries", type=int, default=RETRIES, help="extra attempts for a failed chunk")
+    parser.add_argument("--backoff", type=float, default=BACKOFF, help="seconds before the first retry")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub backend: seconds per call")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="stub backend: share of failed calls")
+    parser.add_argument("--failed", help="write the lines of chunks that still failed to this file")
+    args = parser.parse_args()
+
+    raw_data = read_raw_data_from_file(args.input_file)
+    if not raw_data:
+        return
+
+    if args.backend == "stub":
+        backend = StubBackend(args.latency, args.failure_rate)
+    else:
+        backend = BACKENDS[args.backend]()
+    if args.backend != "chatgpt" and not notice_starts([item.strip() for item in raw_data.splitlines()]):
+        print("No 'Name of ...' labels in the input: the local formatter will find no notices "
+              "(plain listings need --backend chatgpt or a crawler Site adapter).")
+
+    started = time.perf_counter()
+    records, results = format_in_chunks(raw_data, backend, args.max_chars, args.workers,
+                                        args.retries, args.backoff)
+    for result in results:
+        detail = result.error or f"{len(result.records)} records"
+        print(f"chunk {result.index:3} items {result.start}-{result.end} {result.chars:6} chars "
+              f"{result.attempts} attempt(s) {result.seconds:7.3f}s  {detail}")
+    failed = [result for result in results if result.error]
+    print(f"Formatted {len(records)} notices from {len(results)} chunks "
+          f"({len(failed)} failed) in {time.perf_counter() - started:.3f}s")
+
+    with open(args.output_file, "w", encoding="utf-8") as file:
+        json.dump(records, file, indent=2, ensure_ascii=False)
+    print(f"Formatted data has been saved to '{args.output_file}'")
+
+    if args.failed and failed:
+        items = [item.strip() for item in raw_data.splitlines() if item.strip()]
+        with open(args.failed, "w", encoding="utf-8") as file:
+            for result in failed:
+                file.write("".join(item + "\n" for item in items[result.start:result.end]))
+        print(f"Lines of {len(failed)} failed chunks saved to '{args.failed}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import argparse
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from lxml import html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from notice_store import CHANGED, NEW, STATE_DB, NoticeStore
+from webscraping import PARSER, extract_content_and_links
+
+# Crawls many recruitment portals at once over one pooled requests.Session.
+# Each portal is a Site adapter (URL + parser). Responses are fetched with
+# If-None-Match / If-Modified-Since from the cache file, so an unchanged
+# page costs a 304 and its notices are served from the cache unparsed.
+# With a NoticeStore, every page's notices are compared with the previous
+# runs and each result lists only the new and changed ones.
+#
+# Try it offline against the saved pages (http.server answers 304 to
+# If-Modified-Since):
+#   python -m http.server 8000 --directory fixtures
+#   python crawler.py --site upsc=http://127.0.0.1:8000/upsc_exam_notification.html \
+#                     --site ongc=http://127.0.0.1:8000/ongc_recruitment_notice.html
+
+TIMEOUT = (5, 30)  # connect, read (seconds)
+MAX_WORKERS = 8
+PER_HOST_LIMIT = 2  # concurrent requests to one host
+RETRIES = 2  # on connection errors and 429/5xx, with backoff
+CACHE_FILE = "crawl_cache.json"
+USER_AGENT = "Mozilla/5.0 (compatible; HRPortalCrawler/1.0)"
+
+
+def has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# ============================================================================
+# SITE ADAPTERS
+# ============================================================================
+
+class Site(ABC):
+    # Adapter for one portal: where its notice list is and how to read it
+    name = ""
+    url = ""
+
+    def __init__(self, url=None):
+        if url:
+            self.url = url
+
+    def parse(self, content, url):
+        # Returns (text/link stream for formatting, [{"title", "date", "link"}])
+        items = extract_content_and_links(content, url)
+        return items, self.notices(content, url, items)
+
+    @abstractmethod
+    def notices(self, content, url, items):
+        # [{"title", "date", "link"}] listed on the page
+        ...
+
+
+class UPSCSite(Site):
+    name = "upsc"
+    url = "https://upsc.gov.in/exams-related-info/exam-notification"
+
+    TITLE_PREFIX = "Name of Examination:"
+    # Label in the notice table -> field whose value follows it
+    LABELS = {"Date of Notification": "date", "Document": "link"}
+
+    def notices(self, content, url, items):
+        notices, current, pending = [], None, None
+        for item in items:
+            is_link = item.startswith("[Link: ")
+            if item.startswith(self.TITLE_PREFIX):
+                current = {"title": item[len(self.TITLE_PREFIX):].strip(), "date": None, "link": None}
+                notices.append(current)
+                pending = None
+            elif current is None:
+                continue
+            elif item in self.LABELS:
+                pending = self.LABELS[item]
+            elif pending == "link" and is_link:
+                current["link"] = item[len("[Link: "):-1]
+                pending = None
+            elif pending == "date" and not is_link:
+                current["date"] = item
+                pending = None
+        return notices
+
+
+class ONGCSite(Site):
+    name = "ongc"
+    url = "https://ongcindia.com/web/eng/career/recruitment-notice"
+
+    ITEMS_XPATH = f"//div[{has_class('accordion-content')}]//li[{has_class('list-group-item')}]"
+
+    def notices(self, content, url, items):
+        root = html.document_fromstring(content, parser=PARSER)
+        notices = []
+        for item in root.xpath(self.ITEMS_XPATH):
+            link_tag = item.find(".//a[@href]")
+            title_tag = item.xpath(f".//span[{has_class('list-group-title')}]")
+            date_tag = item.xpath(f".//p[{has_class('list-group-subtitle')}]")
+            title = (title_tag[0] if title_tag else link_tag).text_content() if link_tag is not None else None
+            notices.append({
+                "title": " ".join(title.split()) if title else None,
+                "date": date_tag[0].text_content().strip() if date_tag else None,
+                "link": urljoin(url, link_tag.get("href")) if link_tag is not None else None,
+            })
+        return notices
+
+
+SITES = {site.name: site for site in (UPSCSite, ONGCSite)}
+
+
+# ============================================================================
+# CONDITIONAL GET CACHE
+# ============================================================================
+
+class HttpCache:
+    # url -> validators (ETag, Last-Modified) and the parsed page, saved as JSON
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._entries = json.load(file)
+
+    def get(self, url):
+        with self._lock:
+            return self._entries.get(url)
+
+    def validators(self, url):
+        entry = self.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url, response, content, notices):
+        with self._lock:
+            self._entries[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "content": content,
+                "notices": notices,
+            }
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._entries, ensure_ascii=False)
+        # Write then rename, so an interrupted run keeps the previous cache
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(data)
+        os.replace(temp_path, self.path)
+
+
+# ============================================================================
+# CRAWLER
+# ============================================================================
+
+@dataclass
+class PageResult:
+    site: str
+    url: str
+    status: str  # "fetched", "not_modified" or "error"
+    http_status: int = None
+    seconds: float = 0.0
+    bytes: int = 0
+    content: list = field(default_factory=list)
+    notices: list = field(default_factory=list)
+    new: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    error: str = None
+
+
+def make_session(pool_size=MAX_WORKERS, retries=RETRIES):
+    # One connection pool per host, reused by every request to it
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class Crawler:
+    def __init__(self, sites, cache=None, session=None, max_workers=MAX_WORKERS,
+                 per_host_limit=PER_HOST_LIMIT, timeout=TIMEOUT, store=None):
+        self.sites = list(sites)
+        self.cache = cache if cache is not None else HttpCache(None)
+        self.store = store
+        self.session = session or make_session(max_workers)
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def host_slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def fetch(self, site):
+        started = time.perf_counter()
+        result = PageResult(site=site.name, url=site.url, status="error")
+        try:
+            with self.host_slot(site.url):
+                response = self.session.get(site.url, headers=self.cache.validators(site.url),
+                                            timeout=self.timeout)
+            result.http_status = response.status_code
+            cached = self.cache.get(site.url)
+            if response.status_code == 304 and cached is not None:
+                result.status = "not_modified"
+                result.content, result.notices = cached["content"], cached["notices"]
+            elif response.status_code == 200:
+                result.status = "fetched"
+                result.bytes = len(response.content)
+                result.content, result.notices = site.parse(response.content, response.url)
+                self.cache.put(site.url, response, result.content, result.notices)
+            else:
+                result.error = f"Unable to retrieve the content. Status code {response.status_code}"
+        except requests.RequestException as e:
+            result.error = str(e) or e.__class__.__name__
+        result.seconds = round(time.perf_counter() - started, 3)
+        return result
+
+    def crawl(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawl") as pool:
+            results = list(pool.map(self.fetch, self.sites))
+        self.cache.save()
+        if self.store is not None:
+            for result in results:
+                if result.status != "error":
+                    delta = self.store.update(result.site, result.notices)
+                    result.new, result.changed = delta[NEW], delta[CHANGED]
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl recruitment portals concurrently")
+    parser.add_argument("--only", nargs="+", choices=list(SITES), help="sites to crawl (default: all)")
+    parser.add_argument("--site", action="append", default=[], metavar="NAME=URL",
+                        help="override a site's URL, e.g. to point it at a local fixture server")
+    parser.add_argument("--cache", default=CACHE_FILE, help="conditional GET cache file ('' to disable)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--per-host", type=int, default=PER_HOST_LIMIT)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT[1], help="read timeout in seconds")
+    parser.add_argument("--state", default=STATE_DB, help="notice state database ('' to disable)")
+    parser.add_argument("--output", help="write every page's notices and content to this JSON file")
+    parser.add_argument("--output-new", help="write only the new and changed notices to this JSON file")
+    args = parser.parse_args()
+
+    urls = dict(override.split("=", 1) for override in args.site)
+    sites = [SITES[name](urls.get(name)) for name in (args.only or SITES)]
+    store = NoticeStore(args.state) if args.state else None
+    crawler = Crawler(sites, HttpCache(args.cache), max_workers=args.workers,
+                      per_host_limit=args.per_host, timeout=(TIMEOUT[0], args.timeout), store=store)
+
+    started = time.perf_counter()
+    results = crawler.crawl()
+    for result in results:
+        detail = result.error or f"{len(result.notices)} notices, {result.bytes} bytes"
+        if store is not None and not result.error:
+            detail += f" ({len(result.new)} new, {len(result.changed)} changed)"
+        print(f"{result.site:8} {result.status:13} {result.seconds:7.3f}s  {detail}")
+    print(f"Crawled {len(results)} sites in {time.perf_counter() - started:.3f}s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump([asdict(result) for result in results], file, ensure_ascii=False, indent=2)
+    if args.output_new:
+        with open(args.output_new, "w", encoding="utf-8") as file:
+            json.dump([notice for result in results for notice in result.new + result.changed],
+                      file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
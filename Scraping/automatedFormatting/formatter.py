@@ -1,44 +1,217 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import argparse
+import json
+import re
 import time
 import os
-from selenium import webdriver
-import selenium.common.exceptions
+from datetime import date, datetime
+from urllib.parse import urlsplit
 
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"  # Suppresses TensorFlow messages
 
 
-# Function to open ChatGPT and format raw data
-def format_data_with_chatgpt(raw_data):
-    # Manually specify the path to the downloaded ChromeDriver
-    driver_service = Service('./chromedriver.exe')  # Replace with your downloaded path
+# ============================================================================
+# LOCAL RULE-BASED FORMATTER
+# ============================================================================
+# Turns the scraped text/link stream (one item per line, links as
+# "[Link: url]") into the same JSON records the ChatGPT prompt asks for,
+# without a browser: a notice starts at its name, labelled values are read
+# inline ("Label: value") or from the next line, dates are normalised to
+# ISO format and links are classified as apply or document links.
 
-    # Open ChatGPT in Chrome using Selenium
-    options = webdriver.ChromeOptions()
+LINK_RE = re.compile(r"^\[Link: (.*)\]$")
 
-    driver = webdriver.Chrome(service=driver_service,options=options)
-    driver.get("https://chat.openai.com/")
+# Field -> label patterns (matched at the start of a line, case-insensitive)
+FIELD_LABELS = {
+    "name": r"name of (?:the )?(?:examination|exam|post|notice|advertisement)|examination name|post name",
+    "date_of_notification": r"date of (?:notification|advertisement|publication|issue)|notification date"
+                            r"|date of release|published on",
+    "commencement_date": r"date of commencement(?: of (?:the )?(?:examination|exam))?|(?:examination|exam) date"
+                         r"|commencement date|date of (?:examination|exam)",
+    "last_date_for_receipt": r"last date(?: (?:for|of) (?:the )?(?:receipt|submission) of (?:online )?applications?)?"
+                             r"|closing date|last date to apply|apply (?:by|before)",
+}
+LABEL_RE = re.compile(
+    r"^(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in FIELD_LABELS.items()) + r")\b\s*[:\-]?\s*(.*)$",
+    re.IGNORECASE,
+)
 
-    # Wait for the page to load and the user to log in
-    print("Please log in to ChatGPT manually...")
-    time.sleep(20)  # Adjust based on your login time
+# Labels and link texts that say what the following link is
+APPLY_RE = re.compile(r"apply|application form|online application|registration|register|click here", re.IGNORECASE)
+DOCUMENT_RE = re.compile(r"document|notification|notice|advertisement|advt|corrigendum|addendum|pdf|download"
+                         r"|\(\s*[\d.]+\s*[kmg]b\s*\)", re.IGNORECASE)
+DOCUMENT_EXTENSIONS = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".zip", ".rtf", ".odt")
 
-    # Wait for the input box to become visible (adjust XPath as necessary)
-    try:
-        input_box = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.XPATH, '//*[@id="prompt-textarea"]/p'))
-        )
-    except:
-        print("Error: Unable to find the input box.")
-        driver.quit()
-        return None
+MONTHS = {name: number for number, names in enumerate((
+    ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",), ("jun", "june"),
+    ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"),
+    ("nov", "november"), ("dec", "december")), start=1) for name in names}
+MONTH = "(?P<month_name>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+
+# Day-first numeric dates (Indian portals), ISO dates and dates with month names
+DATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"\b(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\b",
+    r"\b(?P<day>\d{1,2})[/.\-](?P<month>\d{1,2})[/.\-](?P<year>\d{4}|\d{2})\b",
+    r"\b(?P<day>\d{1,2})(?:st|nd|rd|th)?[\s\-]+" + MONTH + r"[\s,\-]+(?P<year>\d{4})\b",
+    r"\b" + MONTH + r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})\b",
+)]
+TIME_RE = re.compile(r"\b(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap]\.?m\.?)", re.IGNORECASE)
+
+
+def parse_date(text):
+    # First date in the text as "YYYY-MM-DD" ("YYYY-MM-DDTHH:MM" when a time follows it), else None
+    for pattern in DATE_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        parts = match.groupdict()
+        month = MONTHS[parts["month_name"].lower()] if parts.get("month_name") else int(parts["month"])
+        year = int(parts["year"])
+        if year < 100:
+            year += 2000
+        try:
+            parsed = date(year, month, int(parts["day"]))
+        except ValueError:
+            continue
+        clock = TIME_RE.search(text, match.end())
+        if clock:
+            hour = int(clock.group("hour")) % 12 + (12 if clock.group("ampm").lower().startswith("p") else 0)
+            minute = int(clock.group("minute") or 0)
+            return datetime(parsed.year, parsed.month, parsed.day, hour, minute).isoformat(timespec="minutes")
+        return parsed.isoformat()
+    return None
+
+
+def classify_link(url, context):
+    # "document" or "apply" from the file type, the label before the link and its text; None otherwise
+    path = urlsplit(url).path.lower()
+    if path.endswith(DOCUMENT_EXTENSIONS):
+        return "document"
+    if APPLY_RE.search(context):
+        return "apply"
+    if DOCUMENT_RE.search(context):
+        return "document"
+    return None
+
+
+def new_record(name):
+    return {
+        "name": name,
+        "date_of_notification": None,
+        "commencement_date": None,
+        "last_date_for_receipt": None,
+        "apply_links": [],
+        "document_links": [],
+    }
+
+
+def format_data_locally(raw_data):
+    # raw_data: the raw_data.txt text, or the list returned by scrape_content_and_links
+    items = raw_data.splitlines() if isinstance(raw_data, str) else raw_data
+    items = [item.strip() for item in items if item and item.strip()]
+
+    records, current = [], None
+    pending = None  # field whose value is on the next line
+    label = ""  # text line before the next link ("Apply Online", "Document"); used by one link only
+    after_link = False  # the line after a link is its text, not a label
+    for index, item in enumerate(items):
+        link = LINK_RE.match(item)
+        if link:
+            if current is not None:
+                following = items[index + 1] if index + 1 < len(items) else ""
+                kind = classify_link(link.group(1), f"{label} {'' if LINK_RE.match(following) else following}")
+                target = current["apply_links" if kind == "apply" else "document_links"] if kind else None
+                if target is not None and link.group(1) not in target:
+                    target.append(link.group(1))
+            label, after_link = "", True
+            continue
+
+        match = LABEL_RE.match(item)
+        if match:
+            field = next(name for name in FIELD_LABELS if match.group(name))
+            value = match.groups()[-1].strip()
+            if value:
+                current = store_value(records, current, field, value)
+                pending = None
+            else:
+                pending = field
+        elif pending:
+            current = store_value(records, current, pending, item)
+            pending = None
+        if not after_link:
+            label = item
+        after_link = False
+
+    # Same rule as the ChatGPT prompt: only notices with exam or application dates
+    return [record for record in records
+            if record["commencement_date"] or record["last_date_for_receipt"]]
+
+
+def store_value(records, current, field, value):
+    if field == "name":
+        # A notice starts at its name; a repeated name (heading, then table row) is the same notice
+        if current is None or (current["name"] and current["name"] != value):
+            current = new_record(value)
+            records.append(current)
+        current["name"] = value
+    elif current is not None:
+        current[field] = parse_date(value) or value
+    return current
+
+
+# ============================================================================
+# CHATGPT FORMATTER (browser automation)
+# ============================================================================
+
+class ChatGPTSession:
+    # One Chrome window logged in to ChatGPT, reused for every prompt until close()
+
+    INPUT_XPATH = '//*[@id="prompt-textarea"]/p'
+    RESPONSE_XPATH = '//*[@id="chat-messages"]/div[last()]'
+
+    def __init__(self):
+        self.driver = None
+
+    def open(self):
+        # Selenium is only needed for this path
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
 
-    # Prepare the prompt
-    prompt = f"""
+        # Manually specify the path to the downloaded ChromeDriver
+        driver_service = Service('./chromedriver.exe')  # Replace with your downloaded path
+
+        # Open ChatGPT in Chrome using Selenium
+        options = webdriver.ChromeOptions()
+
+        self.driver = webdriver.Chrome(service=driver_service,options=options)
+        self.driver.get("https://chat.openai.com/")
+
+        # Wait for the page to load and the user to log in
+        print("Please log in to ChatGPT manually...")
+        time.sleep(20)  # Adjust based on your login time
+
+    def wait_for(self, xpath):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        return WebDriverWait(self.driver, 20).until(EC.presence_of_element_located((By.XPATH, xpath)))
+
+    def ask(self, raw_data):
+        from selenium.webdriver.common.keys import Keys
+        import selenium.common.exceptions
+
+        if self.driver is None:
+            self.open()
+
+        # Wait for the input box to become visible (adjust XPath as necessary)
+        try:
+            input_box = self.wait_for(self.INPUT_XPATH)
+        except:
+            print("Error: Unable to find the input box.")
+            return None
+
+        # Prepare the prompt
+        prompt = f"""
     I need the following raw data formatted into a structured JSON format. 
     The JSON should contain key-value pairs for each upcoming examination, where:
     - 'name' is the name of the examination
@@ -56,44 +229,51 @@ def format_data_with_chatgpt(raw_data):
     {raw_data}
     """
 
-    # Retry logic for sending the prompt if the element becomes stale
-    retry_attempts = 3
-    for attempt in range(retry_attempts):
+        # Retry logic for sending the prompt if the element becomes stale
+        retry_attempts = 3
+        for attempt in range(retry_attempts):
+            try:
+                input_box.send_keys(prompt)
+                input_box.send_keys(Keys.RETURN)
+                break
+            except selenium.common.exceptions.StaleElementReferenceException:
+                print(f"Attempt {attempt + 1} failed: The input box is stale. Retrying...")
+                # Re-find the element after waiting for a short time
+                input_box = self.wait_for(self.INPUT_XPATH)
+                time.sleep(1)
+
+        # Wait for the response to generate
+        time.sleep(10)
+
+        # Find the response (formatted data)
         try:
-            input_box.send_keys(prompt)
-            input_box.send_keys(Keys.RETURN)
-            break
-        except selenium.common.exceptions.StaleElementReferenceException:
-            print(f"Attempt {attempt + 1} failed: The input box is stale. Retrying...")
-            # Re-find the element after waiting for a short time
-            input_box = WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, '//*[@id="prompt-textarea"]/p'))
-            )
-            time.sleep(1)
-
-    # Wait for the response to generate
-    time.sleep(10)
-
-    # Find the response (formatted data)
-    try:
-        response = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.XPATH, '//*[@id="chat-messages"]/div[last()]'))
-        )
-        formatted_data = response.text.strip()
+            response = self.wait_for(self.RESPONSE_XPATH)
+            formatted_data = response.text.strip()
 
-        # Ensure we only capture valid response
-        if formatted_data:
-            return formatted_data
-        else:
-            print("Error: The response does not contain valid data.")
+            # Ensure we only capture valid response
+            if formatted_data:
+                return formatted_data
+            else:
+                print("Error: The response does not contain valid data.")
+                return None
+        except Exception as e:
+            print(f"Error: {e}")
             return None
-    except Exception as e:
-        print(f"Error: {e}")
-        driver.quit()
-        return None
 
-    # Close the browser
-    driver.quit()
+    def close(self):
+        # Close the browser
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+# Function to open ChatGPT and format raw data
+def format_data_with_chatgpt(raw_data):
+    session = ChatGPTSession()
+    try:
+        return session.ask(raw_data)
+    finally:
+        session.close()
 
 # Function to save the formatted data into a text file
 def save_to_text(formatted_data, output_file):
@@ -116,17 +296,26 @@ def read_raw_data_from_file(file_path):
         print(f"Error: The file '{file_path}' was not found.")
         return None
 
-# Example usage
-input_file = 'raw_data.txt'  # Specify the file path for raw data here
-output_file = 'exam_data.txt'  # Specify the output file for the formatted response
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Format scraped notices as JSON")
+    parser.add_argument("input_file", nargs="?", default="raw_data.txt")  # raw data file path
+    parser.add_argument("output_file", nargs="?", default="exam_data.txt")  # formatted response file
+    parser.add_argument("--chatgpt", action="store_true", help="format through ChatGPT in Chrome instead")
+    args = parser.parse_args()
 
-# Read the raw data from the file
-raw_data = read_raw_data_from_file(input_file)
+    # Read the raw data from the file
+    raw_data = read_raw_data_from_file(args.input_file)
 
-if raw_data:
-    # Call ChatGPT to format the data by interacting with the browser
-    formatted_data = format_data_with_chatgpt(raw_data)
+    if raw_data:
+        if args.chatgpt:
+            # Call ChatGPT to format the data by interacting with the browser
+            formatted_data = format_data_with_chatgpt(raw_data)
+        else:
+            started = time.perf_counter()
+            records = format_data_locally(raw_data)
+            formatted_data = json.dumps(records, indent=2, ensure_ascii=False)
+            print(f"Formatted {len(records)} notices in {(time.perf_counter() - started) * 1000:.1f} ms")
 
-    if formatted_data:
-        # Save the formatted data to a text file
-        save_to_text(formatted_data, output_file)
+        if formatted_data:
+            # Save the formatted data to a text file
+            save_to_text(formatted_data, args.output_file)
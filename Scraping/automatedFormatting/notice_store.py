@@ -0,0 +1,118 @@
+import hashlib
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+# Remembers every notice seen per site, so a run can report only what is new
+# or changed since the last one. A notice is identified by its site and
+# title; its content hash covers title, date and link, so a corrected date
+# or a replaced document shows up as "changed". Titles listed more than once
+# on a page ("Corrigendum") are told apart by their link.
+
+STATE_DB = "notices.db"
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+def normalize(value):
+    return " ".join(str(value or "").split())
+
+
+def notice_key(notice, shared_title=False):
+    identity = normalize(notice.get("title")).lower()
+    if shared_title:
+        identity += "\x1f" + normalize(notice.get("link"))
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:20]
+
+
+def content_hash(notice):
+    parts = (normalize(notice.get(name)) for name in ("title", "date", "link"))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:20]
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class NoticeStore:
+    def __init__(self, path=STATE_DB):
+        # ":memory:" keeps the state for this process only
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS notices ("
+            "site TEXT NOT NULL, notice_key TEXT NOT NULL, content_hash TEXT NOT NULL, "
+            "title TEXT, date TEXT, link TEXT, "
+            "first_seen TEXT NOT NULL, last_seen TEXT NOT NULL, changed_at TEXT, "
+            "PRIMARY KEY (site, notice_key))"
+        )
+        self._db.commit()
+
+    def update(self, site, notices, seen_at=None):
+        # Record one scrape of `site`; returns its notices split into new / changed / unchanged
+        seen_at = seen_at or now()
+        with self._lock:
+            result, inserts, changes, touched = self._compare(site, notices, seen_at)
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO notices (site, notice_key, content_hash, title, date, link, "
+                    "first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", inserts)
+                self._db.executemany(
+                    "UPDATE notices SET content_hash = ?, title = ?, date = ?, link = ?, "
+                    "last_seen = ?, changed_at = ? WHERE site = ? AND notice_key = ?", changes)
+                self._db.executemany(
+                    "UPDATE notices SET last_seen = ? WHERE site = ? AND notice_key = ?", touched)
+        return result
+
+    def preview(self, site, notices):
+        # Same split as update() without recording anything, e.g. to save the output first
+        with self._lock:
+            return self._compare(site, notices, now())[0]
+
+    def _compare(self, site, notices, seen_at):
+        result = {NEW: [], CHANGED: [], UNCHANGED: []}
+        known = dict(self._db.execute(
+            "SELECT notice_key, content_hash FROM notices WHERE site = ?", (site,)
+        ).fetchall())
+        inserts, changes, touched = [], [], []
+        titles = Counter(normalize(notice.get("title")).lower() for notice in notices)
+        for notice in notices:
+            shared_title = titles[normalize(notice.get("title")).lower()] > 1
+            key, digest = notice_key(notice, shared_title), content_hash(notice)
+            if key not in known:
+                status = NEW
+                inserts.append((site, key, digest, notice.get("title"), notice.get("date"),
+                                notice.get("link"), seen_at, seen_at))
+            elif known[key] != digest:
+                status = CHANGED
+                changes.append((digest, notice.get("title"), notice.get("date"), notice.get("link"),
+                                seen_at, seen_at, site, key))
+            else:
+                status = UNCHANGED
+                touched.append((seen_at, site, key))
+            # The same notice listed twice in one page counts once
+            known[key] = digest
+            result[status].append({**notice, "site": site, "status": status})
+        return result, inserts, changes, touched
+
+    def notices(self, site=None):
+        query = "SELECT site, title, date, link, first_seen, last_seen, changed_at FROM notices"
+        params = ()
+        if site:
+            query += " WHERE site = ?"
+            params = (site,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY first_seen DESC, site, title", params).fetchall()
+        names = ("site", "title", "date", "link", "first_seen", "last_seen", "changed_at")
+        return [dict(zip(names, row)) for row in rows]
+
+    def stats(self):
+        with self._lock:
+            rows = self._db.execute("SELECT site, COUNT(*) FROM notices GROUP BY site").fetchall()
+        return dict(rows)
+
+    def close(self):
+        self._db.close()
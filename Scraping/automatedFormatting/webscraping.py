@@ -1,30 +1,74 @@
+from urllib.parse import urljoin
+
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html
+
+# Subtrees that never hold notice content: code, styling and site chrome
+PRUNED_TAGS = ("script", "style", "noscript", "template", "iframe", "svg", "nav", "footer")
+PRUNED_ROLES = ("navigation", "contentinfo", "search")
+PRUNED_CLASSES = ("navbar", "breadcrumb")
+
+# One XPath query finds every subtree to drop
+PRUNE_XPATH = " | ".join(
+    [f"//{tag}" for tag in PRUNED_TAGS]
+    + [f"//*[@role='{role}']" for role in PRUNED_ROLES]
+    + [f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]" for name in PRUNED_CLASSES]
+)
+
+# Links that lead nowhere useful in the scraped output
+SKIPPED_LINK_PREFIXES = ("#", "javascript:")
+
+# Comments (IE conditional blocks, "/.block" markers) are dropped while parsing
+PARSER = html.HTMLParser(remove_comments=True, remove_pis=True)
+
+
+def resolve_link(href, base_url):
+    href = (href or "").strip()
+    if not href or href.lower().startswith(SKIPPED_LINK_PREFIXES):
+        return None
+    return urljoin(base_url, href) if base_url else href
+
+
+def extract_content_and_links(content, base_url=None):
+    # Parse the page with lxml (C parser) and drop scripts, styles, navigation and footers
+    root = html.document_fromstring(content, parser=PARSER)
+    for element in root.xpath(PRUNE_XPATH):
+        element.drop_tree()  # keeps the text that follows the element
+
+    # A <base href> on the page takes precedence for relative links
+    base = root.find(".//base[@href]")
+    if base is not None:
+        base_url = urljoin(base_url or "", base.get("href"))
+
+    # Text and links in the order they appear in the page
+    content_with_links = []
+    for event, element in etree.iterwalk(root, events=("start", "end")):
+        if not isinstance(element.tag, str):
+            continue
+        if event == "start":
+            if element.tag == "a":
+                link = resolve_link(element.get("href"), base_url)
+                if link:
+                    content_with_links.append(f"[Link: {link}]")  # Save link in the position it appears
+            text = element.text
+        else:
+            text = element.tail
+        if text and text.strip():
+            content_with_links.append(" ".join(text.split()))
+
+    return content_with_links
+
+
+def scrape_content_and_links(url, session=None, timeout=30):
+    # Send an HTTP request to the URL (optionally over a pooled session, see crawler.make_session)
+    response = (session or requests).get(url, timeout=timeout)
 
-def scrape_content_and_links(url):
-    # Send an HTTP request to the URL
-    response = requests.get(url)
-    
     if response.status_code == 200:
-        # Parse the HTML content using BeautifulSoup
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # List to hold the extracted content and links in the order they appear
-        content_with_links = []
-
-        # Extract the content and links in the order they appear in the page
-        for element in soup.descendants:
-            if isinstance(element, str):  # If it's a text node, add the text
-                if element.strip():  # Avoid adding empty strings
-                    content_with_links.append(element.strip())
-            elif element.name == 'a' and element.has_attr('href'):  # If it's an anchor tag
-                link = element['href']
-                content_with_links.append(f"[Link: {link}]")  # Save link in the position it appears
-        
-        return content_with_links
+        return extract_content_and_links(response.content, response.url)
     else:
         return f"Error: Unable to retrieve the content. Status code {response.status_code}"
 
+
 def save_to_file(content, filename):
     # Open the file in write mode and save the content
     with open(filename, 'w', encoding='utf-8') as file:
@@ -32,12 +76,14 @@ def save_to_file(content, filename):
             file.write(item + "\n")
     print(f"Content and links saved to {filename}")
 
-# Example usage
-url = "https://upsc.gov.in/exams-related-info/exam-notification"
-content = scrape_content_and_links(url)
 
-# Save the content and links to a file
-# if content.startswith("Error"):
-#     print(content)
-# else:
-save_to_file(content, "raw_data.txt")
+if __name__ == "__main__":
+    # Example usage
+    url = "https://upsc.gov.in/exams-related-info/exam-notification"
+    content = scrape_content_and_links(url)
+
+    # Save the content and links to a file
+    if isinstance(content, str):
+        print(content)
+    else:
+        save_to_file(content, "raw_data.txt")
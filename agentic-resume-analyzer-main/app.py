@@ -1,17 +1,69 @@
-from fastapi import FastAPI, File, UploadFile, Form
-from fastapi.responses import JSONResponse
+import time
+_APP_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import List, Optional
+import asyncio
+import logging
 import os
 import re
 import json
+import threading
+
+from resume_agent import (
+    STARTUP_TIMINGS, check_llm_config, extract_text_from_bytes, is_warm, warmup
+)
+from execution import (
+    JOB_ROLE_MODES, LOCAL_MODES, PREFILTER_MIN_SCORE, TASK_SECTIONS, AnalysisCancelled, execute, output_labels
+)
+from text_extraction import DOCX_ENGINE, DOCX_ENGINES
+from compaction import PAGE_BREAK, compact_resume
+from job_queue import job_queue, QueueFullError, CANCELLED, DONE, FAILED
+from result_cache import result_cache, cache_key
+from batch import BatchError, expand_batch, get_extraction_pool, is_supported, resolve_concurrency
+from ingest import BodySizeLimitMiddleware, UploadTooLargeError, read_upload
+from ranking import DEFAULT_TOP_K, rank_resumes
+from role_profiles import role_profiles
+from revisions import merge_ats, revisions
+from llm_governor import BATCH, llm_governor, run_with_priority
+from dedup_index import DEDUP_ENABLED, DEDUP_REUSE, content_hash, dedup_index, minhash
+from metrics import ANALYSES, HTTP_SECONDS, SERVER_TIMING, Spans, registry
+from structured_output import OUTPUT_REPAIR, parse_task_output, repair_task_output
+
+logger = logging.getLogger("resume_analyzer")
+
+STARTUP_TIMINGS["import_app_seconds"] = round(time.perf_counter() - _APP_IMPORT_STARTED, 4)
+
+# Build the LLM client and crews at startup instead of on the first request
+WARMUP = os.getenv("ANALYZER_WARMUP", "false").lower() in ("1", "true", "yes")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    logger.info("Cold start timings: %s", STARTUP_TIMINGS)
+    warmup_task = None
+    if WARMUP:
+        # Runs off the event loop so /healthz answers while crews are built
+        warmup_task = asyncio.create_task(asyncio.to_thread(warmup))
+        warmup_task.add_done_callback(
+            lambda t: logger.info("Warmup finished: %s", STARTUP_TIMINGS) if not t.exception()
+            else logger.error("Warmup failed: %s", t.exception())
+        )
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    job_queue.shutdown()
+    dedup_index.save()
 
-from resume_agent import extract_text_from_resume, min_crew, full_crew, only_ats_crew
 
 app = FastAPI(
     title="Resume Analyzer API",
     description="ATS Scan + Resume Rewrite + Job Match using CrewAI & Gemini",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ---------------- CORS CONFIG ----------------
@@ -33,6 +85,10 @@ else:
     if not allow_origin_list:
         allow_origin_list = ["*"]
 
+# Refuses oversized bodies while they are received, before multipart parsing finishes;
+# added first so CORS wraps it and a 413 still carries the CORS headers
+app.add_middleware(BodySizeLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allow_origin_list,
@@ -41,6 +97,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# ---------------- METRICS ----------------
+registry.register_stats("cache", result_cache.stats)
+registry.register_stats("jobs", job_queue.stats)
+registry.register_stats("llm", llm_governor.stats)
+registry.register_stats("dedup", dedup_index.stats)
+registry.register_stats("role_profiles", role_profiles.stats)
+registry.register_stats("revisions", revisions.stats)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Route template, not the raw path, so /jobs/{job_id} stays one series
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_SECONDS.observe(time.perf_counter() - started, method=request.method,
+                         route=route, status=response.status_code)
+    return response
+
 # ---------------- HELPERS ----------------
 def clean_markdown(md_text: str) -> str:
     lines = md_text.splitlines()
@@ -53,13 +129,8 @@ def clean_markdown(md_text: str) -> str:
     return "\n".join(cleaned_lines).strip()
 
 
-def format_output(raw_result):
-    """
-    DISPLAY ONLY:
-    Structured JSON output without touching agent prompts
-    """
-
-    response = {
+def empty_response():
+    return {
         "ats": {
             "score": None,
             "top_issues": [],
@@ -70,37 +141,280 @@ def format_output(raw_result):
         "job_fit": None
     }
 
+
+def apply_task_output(response, parsed):
+    """
+    Merge one parsed task payload into the response.
+    Returns the sections that were filled ("ats", "resume_markdown", "job_fit").
+    """
+    sections = []
+
+    # ---------- ATS ----------
+    if "ats" in parsed:
+        response["ats_full_report"] = parsed["ats"]
+        response["ats"]["score"] = parsed["ats"].get("overall_score")
+        response["ats"]["top_issues"] = parsed["ats"].get("critical_issues", [])
+        response["ats"]["top_improvements"] = parsed["ats"].get("recommendations", [])
+        sections.append("ats")
+
+    # ---------- RESUME ----------
+    if "resume_markdown" in parsed:
+        response["resume_markdown"] = parsed["resume_markdown"]
+        sections.append("resume_markdown")
+
+    # ---------- JOB FIT ----------
+    if "job_fit" in parsed:
+        response["job_fit"] = parsed["job_fit"]
+        sections.append("job_fit")
+
+    # ---------- ATS RE-SCAN ----------
+    # Partial scan of a revision; analyze_text merges it into the previous report
+    if "ats_delta" in parsed:
+        response["ats_delta"] = parsed["ats_delta"]
+
+    return sections
+
+
+def format_output(raw_result, labels: Optional[List[str]] = None):
+    """
+    DISPLAY ONLY:
+    Structured JSON output without touching agent prompts.
+    With `labels` (the task of each output), a malformed output is counted
+    and re-asked for just its JSON instead of being dropped.
+    """
+
+    response = empty_response()
+
     if not hasattr(raw_result, "tasks_output") or not raw_result.tasks_output:
         return {"error": "No readable output from CrewAI"}
 
-    for out in raw_result.tasks_output:
+    for index, out in enumerate(raw_result.tasks_output):
+        label = labels[index] if labels and index < len(labels) else None
+        section = TASK_SECTIONS.get(label)
         text = str(out)
+        parsed = parse_task_output(text, section, task=label)
+        if parsed is None and section and OUTPUT_REPAIR:
+            parsed = repair_task_output(label, section, text)
+        if parsed is not None:
+            apply_task_output(response, parsed)
 
-        json_match = re.search(r"\{[\s\S]*\}", text)
-        if not json_match:
-            continue
+    return response
 
-        try:
-            parsed = json.loads(json_match.group())
-        except Exception:
-            continue
 
-        # ---------- ATS ----------
-        if "ats" in parsed:
-            response["ats_full_report"] = parsed["ats"]
-            response["ats"]["score"] = parsed["ats"].get("overall_score")
-            response["ats"]["top_issues"] = parsed["ats"].get("critical_issues", [])
-            response["ats"]["top_improvements"] = parsed["ats"].get("recommendations", [])
+def missing_sections(result, mode: str, incremental: bool = False) -> List[str]:
+    """Sections the crew mode should have produced but that are empty (unparseable task output)."""
+    expected = []
+    for label in output_labels(mode, incremental):
+        # The ATS re-scan is merged into the full report
+        section = "ats" if label == "ats_rescan" else TASK_SECTIONS[label]
+        if section not in expected:
+            expected.append(section)
+    return [section for section in expected if not result.get(SECTION_KEYS[section][0])]
 
-        # ---------- RESUME ----------
-        if "resume_markdown" in parsed:
-            response["resume_markdown"] = parsed["resume_markdown"]
 
-        # ---------- JOB FIT ----------
-        if "job_fit" in parsed:
-            response["job_fit"] = parsed["job_fit"]
+def run_analysis(filename: str, data: bytes, job_role: str, crew_value: str, use_cache: bool = True,
+                 docx_engine: str = DOCX_ENGINE, token_budget: Optional[int] = None,
+                 on_task_output=None, cancel_event: Optional[threading.Event] = None,
+                 prefilter_min_score: Optional[int] = None, reuse_duplicates: Optional[bool] = None,
+                 spans: Optional[Spans] = None, candidate_id: Optional[str] = None):
+    """
+    Blocking pipeline executed on a worker thread:
+    extract text -> near-duplicate check -> compact -> cache lookup -> [local pre-filter]
+    -> kickoff crew -> format output
+    """
+    if spans is None:
+        spans = Spans()
+    else:
+        # Created when the request arrived: time until a worker picked the job up
+        spans.add("queue", time.perf_counter() - spans.created - spans.stages.get("upload", 0.0))
+    with spans.span("extract"):
+        resume_text = extract_text_from_bytes(filename, data, docx_engine, PAGE_BREAK)
+    return analyze_text(resume_text, job_role, crew_value, use_cache, token_budget,
+                        on_task_output, cancel_event, prefilter_min_score,
+                        source_name=filename, reuse_duplicates=reuse_duplicates, spans=spans,
+                        candidate_id=candidate_id)
+
+
+def find_near_duplicate(resume_text: str, source_name: Optional[str]):
+    """Look the resume up in the MinHash index, then add it. Returns (doc_id, match or None)."""
+    content = content_hash(resume_text)
+    signature = minhash(resume_text)
+    match = dedup_index.query(signature, exclude_content=content)
+    return dedup_index.add(signature, content, source_name), match
+
+
+def merged_listener(on_task_output, plan):
+    """Stream the re-scan as the merged full ATS report, like a regular ats_scan."""
+    if on_task_output is None or plan is None:
+        return on_task_output
+
+    def listener(label, output):
+        if TASK_SECTIONS.get(label) == "ats_delta":
+            parsed = parse_task_output(str(output), "ats_delta")
+            if parsed is not None:
+                label, output = "ats_scan", json.dumps({"ats": merge_ats(plan, parsed["ats_delta"])["ats"]})
+        on_task_output(label, output)
+
+    return listener
+
+
+def analyze_text(resume_text: str, job_role: str, crew_value: str, use_cache: bool = True,
+                 token_budget: Optional[int] = None, on_task_output=None,
+                 cancel_event: Optional[threading.Event] = None,
+                 prefilter_min_score: Optional[int] = None, source_name: Optional[str] = None,
+                 reuse_duplicates: Optional[bool] = None, spans: Optional[Spans] = None,
+                 candidate_id: Optional[str] = None):
+    spans = spans or Spans()
+    with spans.span("dedup"):
+        doc_id, duplicate_of = find_near_duplicate(resume_text, source_name) if DEDUP_ENABLED else (None, None)
+    near_duplicate = duplicate_of and {
+        "similarity": duplicate_of["similarity"],
+        "name": duplicate_of["name"],
+        "first_seen": duplicate_of["added_at"],
+        "reused": False,
+    }
 
-    return response
+    with spans.span("compact"):
+        compacted = compact_resume(resume_text, token_budget)
+    resume_text = compacted.text
+    inputs = {"resume": resume_text}
+
+    # Job role is only required/used for full analysis (job matching)
+    if crew_value in JOB_ROLE_MODES:
+        inputs["job_role"] = job_role or "Software Developer"
+        # Derived once per role; a re-derived profile changes the cache key below
+        with spans.span("role_profile"):
+            inputs["role_profile"] = role_profiles.prompt_text(inputs["job_role"])
+
+    role_part = "\0".join(inputs[k] for k in ("job_role", "role_profile") if k in inputs) or None
+    key = cache_key(resume_text, crew_value, role_part)
+    # Same crew mode and role, any resume: which cached analysis a near-duplicate can reuse
+    variant = cache_key("", crew_value, role_part)
+    if use_cache:
+        with spans.span("cache_lookup"):
+            cached = result_cache.get(key)
+        if cached is not None:
+            if doc_id is not None:
+                dedup_index.record_analysis(doc_id, variant, key)
+            if crew_value not in LOCAL_MODES:
+                revisions.record(candidate_id, resume_text, cached.get("ats_full_report"))
+            ANALYSES.inc(crew=crew_value, outcome="cached")
+            return {**cached, "prompt_stats": compacted.stats, "near_duplicate": near_duplicate}
+
+        reuse = DEDUP_REUSE if reuse_duplicates is None else reuse_duplicates
+        prior_key = duplicate_of["analyses"].get(variant) if duplicate_of and reuse else None
+        prior = result_cache.get(prior_key) if prior_key else None
+        if prior is not None:
+            dedup_index.record_reuse()
+            ANALYSES.inc(crew=crew_value, outcome="reused")
+            return {**prior, "prompt_stats": compacted.stats,
+                    "near_duplicate": {**near_duplicate, "reused": True}}
+    else:
+        result_cache.record_bypass()
+
+    # A revision of a known candidate's resume re-scores only what its changed sections affect
+    plan = None
+    if candidate_id and crew_value not in LOCAL_MODES:
+        with spans.span("revision"):
+            plan = revisions.plan(candidate_id, resume_text)
+        if plan is not None:
+            inputs.update(plan.inputs())
+
+    threshold = PREFILTER_MIN_SCORE if prefilter_min_score is None else prefilter_min_score
+    with spans.span("crew"):
+        raw_result, timings = execute(crew_value, inputs, merged_listener(on_task_output, plan),
+                                      cancel_event, threshold)
+    spans.record_tasks(timings["tasks"])
+    revision = None
+    with spans.span("format_output"):
+        result = format_output(raw_result, output_labels(timings["mode"], timings.get("incremental", False)))
+        delta = result.pop("ats_delta", None)
+        if plan is not None and delta is not None:
+            merged = merge_ats(plan, delta)
+            apply_task_output(result, merged)
+            revision = merged["incremental"]
+
+    prefilter = timings.get("prefilter")
+    # Only a complete result is cached or remembered; a partial one is returned as it is
+    missing = [] if "error" in result else missing_sections(
+        result, timings["mode"], timings.get("incremental", False))
+    outcome = "local" if crew_value in LOCAL_MODES else "llm"
+    if "error" in result:
+        outcome = "error"
+    elif prefilter and not prefilter["passed"]:
+        outcome = "prefiltered"
+    elif missing:
+        outcome = "incomplete"
+    ANALYSES.inc(crew=crew_value, outcome=outcome)
+    if prefilter and not prefilter["passed"]:
+        # Only the local ATS scan ran; not cached so a later, lower threshold still reaches the LLM
+        result["prefiltered"] = prefilter
+        result["prompt_stats"] = compacted.stats
+        result["timings"] = timings
+    elif missing:
+        result["missing_sections"] = missing
+        result["prompt_stats"] = compacted.stats
+        result["timings"] = timings
+    elif "error" not in result:
+        result["prompt_stats"] = compacted.stats
+        result_cache.set(key, dict(result))
+        if doc_id is not None:
+            dedup_index.record_analysis(doc_id, variant, key)
+        if crew_value not in LOCAL_MODES:
+            revisions.record(candidate_id, resume_text, result.get("ats_full_report"))
+        # Timings describe this run only, so they are not cached
+        result["timings"] = timings
+        if revision is not None:
+            result["revision"] = revision
+    if "error" not in result:
+        result["near_duplicate"] = near_duplicate
+    return result
+
+
+async def read_resume_upload(resume_file: UploadFile) -> bytes:
+    try:
+        return await read_upload(resume_file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
+def resolve_docx_engine(docx_engine: Optional[str]) -> str:
+    engine = (docx_engine or DOCX_ENGINE).lower()
+    if engine not in DOCX_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"docx_engine must be one of: {', '.join(DOCX_ENGINES)}",
+        )
+    return engine
+
+
+async def submit_analysis(resume_file: UploadFile, job_role: Optional[str], crew: Optional[str],
+                          no_cache: bool = False, docx_engine: Optional[str] = None,
+                          token_budget: Optional[int] = None, spans: Optional[Spans] = None,
+                          **run_options):
+    crew_value = (crew or "minimal").lower()
+    engine = resolve_docx_engine(docx_engine)
+    spans = spans or Spans()
+    with spans.span("upload"):
+        data = await read_resume_upload(resume_file)
+    try:
+        return job_queue.submit(
+            run_analysis, resume_file.filename or "", data, job_role, crew_value,
+            use_cache=not no_cache, docx_engine=engine, token_budget=token_budget, spans=spans,
+            **run_options,
+            meta={"filename": resume_file.filename, "crew": crew_value},
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+
+async def submit_with_backpressure(fn, *args, meta=None, **kwargs):
+    # Batch items wait for queue capacity instead of failing the whole stream
+    while True:
+        try:
+            return job_queue.submit(fn, *args, meta=meta, **kwargs)
+        except QueueFullError:
+            await asyncio.sleep(1)
 
 
 # ---------------- ROUTES ----------------
@@ -109,42 +423,415 @@ async def home():
     return {"message": "Resume Analyzer API is running 🚀"}
 
 
+@app.get("/healthz")
+async def healthz():
+    # Liveness only: the process is up and serving the event loop
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    problems = []
+    try:
+        check_llm_config()
+    except ValueError as e:
+        problems.append(str(e))
+    if WARMUP and not is_warm():
+        problems.append("Warmup still in progress")
+
+    return JSONResponse(
+        status_code=503 if problems else 200,
+        content={
+            "ready": not problems,
+            "problems": problems,
+            "warm": is_warm(),
+            "startup_timings": STARTUP_TIMINGS,
+        },
+    )
+
+
 @app.post("/analyze")
 async def analyze_resume(
     resume_file: UploadFile = File(...),
     job_role: Optional[str] = Form("Software Developer"),
-    crew: Optional[str] = Form("minimal")
+    crew: Optional[str] = Form("minimal"),
+    no_cache: bool = Form(False),
+    docx_engine: Optional[str] = Form(None),
+    token_budget: Optional[int] = Form(None),
+    prefilter_min_score: Optional[int] = Form(None),
+    reuse_duplicates: Optional[bool] = Form(None),
+    candidate_id: Optional[str] = Form(None)
 ):
-    file_path = f"uploads/{resume_file.filename}"
-    os.makedirs("uploads", exist_ok=True)
+    spans = Spans()
+    # Runs on the worker pool; awaiting the future keeps the event loop free
+    job = await submit_analysis(
+        resume_file, job_role, crew, no_cache, docx_engine, token_budget, spans=spans,
+        prefilter_min_score=prefilter_min_score, reuse_duplicates=reuse_duplicates,
+        candidate_id=candidate_id,
+    )
+    result = await asyncio.wrap_future(job.future)
+    server_timing = spans.server_timing() if SERVER_TIMING else None
+    return JSONResponse(content=result, headers={"Server-Timing": server_timing} if server_timing else None)
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    with open(file_path, "wb") as f:
-        f.write(await resume_file.read())
 
-    resume_text = extract_text_from_resume(file_path)
+SECTION_KEYS = {
+    "ats": ("ats_full_report", "ats"),
+    "resume_markdown": ("resume_markdown",),
+    "job_fit": ("job_fit",),
+}
 
+
+@app.post("/analyze/stream")
+async def analyze_resume_stream(
+    request: Request,
+    resume_file: UploadFile = File(...),
+    job_role: Optional[str] = Form("Software Developer"),
+    crew: Optional[str] = Form("minimal"),
+    no_cache: bool = Form(False),
+    docx_engine: Optional[str] = Form(None),
+    token_budget: Optional[int] = Form(None),
+    prefilter_min_score: Optional[int] = Form(None),
+    reuse_duplicates: Optional[bool] = Form(None),
+    candidate_id: Optional[str] = Form(None)
+):
+    """
+    Server-Sent Events version of /analyze: emits each section (ats,
+    resume_markdown, job_fit) as soon as its task finishes, then `done`
+    with the full result. Disconnecting cancels the run between tasks.
+    """
+    loop = asyncio.get_running_loop()
+    task_events: asyncio.Queue = asyncio.Queue()
+    cancel_event = threading.Event()
+
+    def on_task_output(label, output):
+        # Worker thread: parse here, hand the payload to the event loop
+        parsed = parse_task_output(str(output), TASK_SECTIONS.get(label))
+        loop.call_soon_threadsafe(task_events.put_nowait, (label, parsed))
+
+    job = await submit_analysis(
+        resume_file, job_role, crew, no_cache, docx_engine, token_budget,
+        on_task_output=on_task_output, cancel_event=cancel_event,
+        prefilter_min_score=prefilter_min_score, reuse_duplicates=reuse_duplicates,
+        candidate_id=candidate_id,
+    )
+    job_future = asyncio.wrap_future(job.future)
+
+    async def stream():
+        response = empty_response()
+        sent = set()
+
+        def section_events(sections):
+            for section in sections:
+                if section not in sent:
+                    sent.add(section)
+                    yield sse_event(section, {key: response[key] for key in SECTION_KEYS[section]})
+
+        yield sse_event("queued", {"job_id": job.id})
+        try:
+            while not (job_future.done() and task_events.empty()):
+                if await request.is_disconnected():
+                    return
+                try:
+                    label, parsed = await asyncio.wait_for(task_events.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                sections = apply_task_output(response, parsed) if parsed else []
+                for event in section_events(sections):
+                    yield event
+                if not sections:
+                    yield sse_event("task", {"task": label, "parsed": False})
+
+            try:
+                result = job_future.result()
+            except AnalysisCancelled:
+                return
+            except Exception as e:
+                yield sse_event("error", {"detail": str(e) or e.__class__.__name__})
+                return
+
+            # Cache hits skip the task callbacks; send their sections now
+            if "error" not in result:
+                response.update({key: result.get(key) for key in response})
+                for event in section_events(s for s in SECTION_KEYS if response[SECTION_KEYS[s][0]]):
+                    yield event
+            yield sse_event("done", result)
+        finally:
+            if not job_future.done():
+                cancel_event.set()
+                job.future.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(
+    resume_files: List[UploadFile] = File(...),
+    job_role: Optional[str] = Form("Software Developer"),
+    crew: Optional[str] = Form("minimal"),
+    concurrency: Optional[int] = Form(None),
+    no_cache: bool = Form(False),
+    docx_engine: Optional[str] = Form(None),
+    token_budget: Optional[int] = Form(None),
+    prefilter_min_score: Optional[int] = Form(None),
+    reuse_duplicates: Optional[bool] = Form(None)
+):
+    """
+    Accepts several PDF/DOCX files and/or ZIP archives and streams one
+    NDJSON line per resume as soon as its analysis finishes.
+    """
     crew_value = (crew or "minimal").lower()
-    if crew_value == "minimal":
-        crew_to_run = min_crew
-    elif crew_value == "ats":
-        crew_to_run = only_ats_crew
-    else:
-        crew_to_run = full_crew
+    engine = resolve_docx_engine(docx_engine)
+    uploads = [(f.filename or "resume", await read_resume_upload(f)) for f in resume_files]
+    try:
+        entries = expand_batch(uploads)
+    except BatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not entries:
+        raise HTTPException(status_code=400, detail="No PDF or DOCX resumes found in the upload")
+
+    semaphore = asyncio.Semaphore(resolve_concurrency(concurrency))
+    jobs = []  # submitted to the worker pool, cancelled if the client goes away
+
+    async def process(index: int, filename: str, data: bytes):
+        line = {"index": index, "filename": filename}
+        if not is_supported(filename):
+            return {**line, "status": "error", "error": "Unsupported file format."}
+        try:
+            loop = asyncio.get_running_loop()
+            resume_text = await loop.run_in_executor(
+                get_extraction_pool(), extract_text_from_bytes, filename, data, engine, PAGE_BREAK
+            )
+            async with semaphore:
+                # Batch LLM calls yield to interactive uploads in the governor queue
+                job = await submit_with_backpressure(
+                    run_with_priority, BATCH, analyze_text, resume_text, job_role, crew_value,
+                    meta={"filename": filename, "crew": crew_value, "batch": True},
+                    use_cache=not no_cache, token_budget=token_budget,
+                    prefilter_min_score=prefilter_min_score,
+                    source_name=filename, reuse_duplicates=reuse_duplicates,
+                )
+                jobs.append(job)
+                result = await asyncio.wrap_future(job.future)
+            return {**line, "status": "ok", "result": result}
+        except Exception as e:
+            return {**line, "status": "error", "error": str(e) or e.__class__.__name__}
+
+    async def stream():
+        tasks = [
+            asyncio.create_task(process(i, name, data))
+            for i, (name, data) in enumerate(entries)
+        ]
+        succeeded = prefiltered = near_duplicates = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                succeeded += line["status"] == "ok"
+                prefiltered += "prefiltered" in line.get("result", {})
+                near_duplicates += bool(line.get("result", {}).get("near_duplicate"))
+                yield json.dumps(line) + "\n"
+            yield json.dumps({
+                "done": True, "total": len(entries),
+                "succeeded": succeeded, "failed": len(entries) - succeeded,
+                "prefiltered": prefiltered, "near_duplicates": near_duplicates,
+            }) + "\n"
+        finally:
+            # Client went away or batch finished: stop anything still pending. Jobs still
+            # queued are dropped and give their slot back (JobQueue marks them cancelled);
+            # running ones finish on their worker.
+            for task in tasks:
+                task.cancel()
+            for job in jobs:
+                job.future.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/rank")
+async def rank_shortlist(
+    resume_files: List[UploadFile] = File(...),
+    job_role: str = Form(...),
+    job_description: Optional[str] = Form(None),
+    top_k: int = Form(DEFAULT_TOP_K),
+    docx_engine: Optional[str] = Form(None)
+):
+    """
+    Rank many resumes (PDF/DOCX files and/or ZIPs) against a job role with
+    BM25, no LLM call. Run the job-fit crews on the returned shortlist only.
+    """
+    engine = resolve_docx_engine(docx_engine)
+    uploads = [(f.filename or "resume", await read_resume_upload(f)) for f in resume_files]
+    try:
+        entries = expand_batch(uploads)
+    except BatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    entries = [(name, data) for name, data in entries if is_supported(name)]
+    if not entries:
+        raise HTTPException(status_code=400, detail="No PDF or DOCX resumes found in the upload")
+
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    pool = get_extraction_pool()
+    extracted = await asyncio.gather(
+        *(loop.run_in_executor(pool, extract_text_from_bytes, name, data, engine) for name, data in entries),
+        return_exceptions=True,
+    )
+    names, texts, errors = [], [], []
+    for (name, _), text in zip(entries, extracted):
+        if isinstance(text, Exception):
+            errors.append({"filename": name, "error": str(text) or text.__class__.__name__})
+        else:
+            names.append(name)
+            texts.append(text)
+    extracted_at = time.perf_counter()
+
+    query = f"{job_role}\n{job_description or ''}"
+    ranking = await asyncio.to_thread(rank_resumes, texts, query, top_k)
+    shortlist = [{"filename": names[entry.pop("index")], **entry} for entry in ranking.ranked]
+
+    return JSONResponse(content={
+        "job_role": job_role,
+        "query_terms": ranking.terms,
+        "total": len(texts),
+        "shortlist": shortlist,
+        "errors": errors,
+        "timings": {
+            "extract_seconds": round(extracted_at - started, 3),
+            "rank_seconds": round(time.perf_counter() - extracted_at, 3),
+        },
+    })
 
-    inputs = {"resume": resume_text}
 
-    # Job role is only required/used for full analysis (job matching)
-    if crew_value == "full":
-        inputs["job_role"] = job_role or "Software Developer"
+# ---------------- ROLE PROFILES ----------------
+@app.get("/role-profiles")
+async def list_role_profiles():
+    return {"profiles": role_profiles.list(), "stats": role_profiles.stats()}
 
-    raw_result = crew_to_run.kickoff(inputs=inputs)
 
-    try:
-        os.remove(file_path)
-    except:
-        pass
+@app.get("/role-profiles/profile")
+async def get_role_profile(job_role: str, derive: bool = True):
+    """Stored requirement profile for a role; derives (one LLM call) when missing unless derive=false."""
+    entry = role_profiles.get(job_role)
+    if entry is None and derive:
+        try:
+            entry = await asyncio.to_thread(role_profiles.get_or_derive, job_role)
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Could not derive role profile: {e}")
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No stored profile for this role")
+    return entry
+
+
+@app.delete("/role-profiles/profile")
+async def invalidate_role_profile(job_role: str):
+    if not role_profiles.invalidate(job_role):
+        raise HTTPException(status_code=404, detail="No stored profile for this role")
+    return {"invalidated": job_role}
+
+
+@app.delete("/role-profiles")
+async def clear_role_profiles():
+    return {"invalidated": role_profiles.clear()}
+
+
+# ---------------- REVISIONS ----------------
+@app.get("/candidates/{candidate_id}/revision")
+async def get_revision(candidate_id: str):
+    """Latest stored resume version (section hashes and ATS report) for incremental re-analysis."""
+    entry = revisions.get(candidate_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No stored revision for this candidate")
+    return entry
+
+
+@app.delete("/candidates/{candidate_id}/revision")
+async def forget_revision(candidate_id: str):
+    """Drop the stored version so the next analysis is a full scan."""
+    if not revisions.forget(candidate_id):
+        raise HTTPException(status_code=404, detail="No stored revision for this candidate")
+    return {"forgotten": candidate_id}
+
+
+# ---------------- JOBS ----------------
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    resume_file: UploadFile = File(...),
+    job_role: Optional[str] = Form("Software Developer"),
+    crew: Optional[str] = Form("minimal"),
+    no_cache: bool = Form(False),
+    docx_engine: Optional[str] = Form(None),
+    token_budget: Optional[int] = Form(None),
+    prefilter_min_score: Optional[int] = Form(None),
+    reuse_duplicates: Optional[bool] = Form(None),
+    candidate_id: Optional[str] = Form(None)
+):
+    job = await submit_analysis(
+        resume_file, job_role, crew, no_cache, docx_engine, token_budget,
+        prefilter_min_score=prefilter_min_score, reuse_duplicates=reuse_duplicates,
+        candidate_id=candidate_id,
+    )
+    return job.to_dict()
+
+
+@app.get("/jobs/stats")
+async def job_stats():
+    return job_queue.stats()
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == FAILED:
+        return JSONResponse(status_code=500, content=job.to_dict())
+    if job.status == CANCELLED:
+        return JSONResponse(status_code=410, content=job.to_dict())
+    if job.status != DONE:
+        return JSONResponse(status_code=202, content=job.to_dict())
+    return JSONResponse(content=job.result)
+
+
+# ---------------- CACHE ----------------
+@app.get("/cache/stats")
+async def cache_stats():
+    return result_cache.stats()
+
+
+@app.get("/llm/stats")
+async def llm_stats():
+    return llm_governor.stats()
+
+
+@app.get("/dedup/stats")
+async def dedup_stats():
+    return dedup_index.stats()
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 
-    return JSONResponse(content=format_output(raw_result))
+@app.delete("/cache")
+async def clear_cache():
+    result_cache.clear()
+    return {"cleared": True}
 
 
 # ---------------- MAIN ----------------
@@ -0,0 +1,329 @@
+"""
+Deterministic, rule-based ATS scorer.
+
+Scores the same seven criteria (and point weights) as ats_scanning_task,
+locally and in milliseconds, and returns the same {"ats": {...}} JSON shape
+the LLM is asked for, so format_output handles it unchanged. Used as the
+`ats_fast` crew mode and as a pre-filter in front of LLM crews.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from compaction import split_sections
+
+# ============================================================================
+# VOCABULARY
+# ============================================================================
+
+ACTION_VERBS = frozenset("""
+accelerated achieved added administered advised analyzed architected assessed automated
+boosted built championed coached collaborated completed conceived conducted consolidated
+coordinated created cut debugged decreased defined delivered deployed designed developed
+devised directed doubled drove eliminated enabled engineered enhanced established evaluated
+executed expanded facilitated founded generated grew guided headed identified implemented
+improved increased initiated innovated installed integrated introduced launched led
+maintained managed mentored migrated modernized monitored negotiated optimized orchestrated
+organized oversaw owned partnered pioneered planned prepared presented prioritized produced
+programmed proposed published raised rebuilt redesigned reduced refactored resolved
+restructured revamped saved scaled secured shipped simplified spearheaded standardized
+streamlined strengthened supervised supported tested trained transformed tripled troubleshot
+upgraded validated won wrote
+""".split())
+
+SKILL_KEYWORDS = frozenset("""
+agile airflow android angular ansible api apis aws azure bash bigquery c c# c++ ci/cd
+cloud css data databases django docker elasticsearch etl excel fastapi figma firebase flask
+gcp git github gitlab go golang graphql hadoop html ios java javascript jenkins jira
+kafka kotlin kubernetes linux machine learning matlab microservices mongodb mysql next.js
+node.js nosql numpy oracle pandas php postgresql power bi powerbi python pytorch r react
+redis rest ruby rust salesforce sap scala scikit-learn scrum selenium snowflake spark
+spring sql swift tableau tensorflow terraform typescript unix vue
+""".split()) | {"machine learning", "power bi", "ci/cd", "data analysis", "project management",
+                "deep learning", "computer vision", "natural language processing", "rest api"}
+
+DEGREE_RE = re.compile(
+    r"\b(b\.?\s?tech|m\.?\s?tech|b\.?\s?e\b|m\.?\s?e\b|b\.?\s?sc|m\.?\s?sc|b\.?\s?com|m\.?\s?com|"
+    r"bca|mca|mba|bba|ph\.?\s?d|bachelor|master|diploma|associate degree|doctorate|"
+    r"b\.?\s?a\b|m\.?\s?a\b|b\.?\s?s\b|m\.?\s?s\b)",
+    re.IGNORECASE,
+)
+INSTITUTION_RE = re.compile(r"\b(university|college|institute|school|academy|iit|nit|iiit)\b", re.IGNORECASE)
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(r"(\+?\d[\d\s().-]{8,}\d)")
+LINKEDIN_RE = re.compile(r"\S*linkedin\.com/\S*", re.IGNORECASE)
+PROFILE_RE = re.compile(r"(github\.com/|gitlab\.com/|portfolio|behance\.net/|https?://)", re.IGNORECASE)
+
+MONTHS = r"(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE_RANGE_RE = re.compile(
+    rf"(({MONTHS}\s*\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})\s*(-|–|—|to)\s*({MONTHS}\s*\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}|present|current|now|till date))",
+    re.IGNORECASE,
+)
+DATE_STYLES = {
+    "month_year": re.compile(rf"\b{MONTHS}\s*\d{{4}}\b", re.IGNORECASE),
+    "numeric": re.compile(r"\b\d{1,2}/\d{4}\b"),
+}
+METRIC_RE = re.compile(r"(\d+(\.\d+)?\s*(%|percent|x\b|k\b|m\b|\+)|[$₹€£]\s?\d|\b\d{2,}\b)", re.IGNORECASE)
+BULLET_RE = re.compile(r"^\s*([-•*▪●◦‣]|\d+[.)])\s+")
+REPEATED_WORD_RE = re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE)
+FIRST_PERSON_RE = re.compile(r"\b(i|me|my)\b")
+
+CORE_SECTIONS = ("experience", "education", "skills")
+
+
+# ============================================================================
+# CRITERIA
+# ============================================================================
+
+# Every deduction is an Issue: why points were lost and what fixes it
+Issue = Tuple[str, str]  # (reason, recommendation)
+Criterion = Tuple[int, List[Issue], List[str]]  # (points, issues, examples)
+
+KEYWORDS_FOR_FULL_MARKS = 10  # 5 + 2 per keyword reaches 25
+DATE_RANGES_FOR_FULL_MARKS = 2
+METRIC_LINES_FOR_FULL_MARKS = 4
+
+
+def _bullets(lines: List[str]) -> List[str]:
+    return [BULLET_RE.sub("", line).strip() for line in lines if BULLET_RE.match(line)]
+
+
+def score_format(lines: List[str], sections: Dict[str, List[str]]) -> Criterion:
+    points, issues, examples = 20, [], []
+    missing = [name for name in CORE_SECTIONS if name not in sections]
+    if missing:
+        points -= 4 * len(missing)
+        issues.append(("Missing standard section headings: " + ", ".join(missing),
+                       "Add standard headings for " + ", ".join(name.title() for name in missing)))
+
+    words = sum(len(line.split()) for line in lines)
+    if words < 150:
+        points -= 4
+        issues.append((f"Resume is very short ({words} words)",
+                       "Expand the resume with role details, projects and achievements"))
+    elif words > 1400:
+        points -= 3
+        issues.append((f"Resume is long ({words} words); ATS parsers favour 1-2 pages",
+                       "Trim the resume to 1-2 pages, keeping the most relevant roles"))
+
+    if len(_bullets(lines)) < 3:
+        points -= 2
+        issues.append(("Few or no bullet points; dense paragraphs parse poorly",
+                       "Break experience and projects into bullet points"))
+
+    styles = [name for name, pattern in DATE_STYLES.items() if pattern.search("\n".join(lines))]
+    if len(styles) > 1:
+        points -= 2
+        issues.append(("Inconsistent date formats", "Use one date format throughout (e.g. Mon YYYY)"))
+
+    long_lines = [line for line in lines if len(line) > 220]
+    if long_lines:
+        points -= 2
+        issues.append(("Very long unbroken lines (possible table or column extraction issue)",
+                       "Avoid tables and multi-column layouts; use a single-column layout"))
+        examples.append(long_lines[0][:120] + "...")
+    return max(points, 0), issues, examples
+
+
+def score_keywords(text_lower: str, sections: Dict[str, List[str]],
+                   job_role: Optional[str]) -> Criterion:
+    found = sorted(k for k in SKILL_KEYWORDS if re.search(rf"(?<![\w+#]){re.escape(k)}(?![\w+#])", text_lower))
+    points = min(25, 5 + 2 * len(found)) if found else 0
+    issues, examples = [], found[:10]
+    if len(found) < KEYWORDS_FOR_FULL_MARKS:
+        issues.append((f"Only {len(found)} recognised technical/industry keywords "
+                       f"({KEYWORDS_FOR_FULL_MARKS} for full marks)",
+                       "Name the specific tools and technologies you used, matching the job description"))
+    if "skills" not in sections:
+        points = max(points - 5, 0)
+        issues.append(("No dedicated skills section",
+                       "Add a Skills section listing the tools and technologies from the target job description"))
+
+    if job_role:
+        role_terms = [t for t in re.findall(r"[a-z][a-z+#.]+", job_role.lower()) if len(t) > 2]
+        missing = [t for t in role_terms if t not in text_lower]
+        if missing:
+            points = max(points - 2 * len(missing), 0)
+            issues.append(("Job role terms not mentioned: " + ", ".join(missing),
+                           "Use the job title's terms (" + ", ".join(missing) + ") where they apply"))
+    return points, issues, examples
+
+
+def score_experience(lines: List[str], sections: Dict[str, List[str]]) -> Criterion:
+    body = sections.get("experience") or []
+    points, issues, examples = 0, [], []
+    if not body:
+        return 0, [("No work experience section found",
+                    "Add an Experience section listing each role with dates and achievements")], []
+
+    points += 6
+    date_ranges = DATE_RANGE_RE.findall("\n".join(body))
+    points += min(6, 3 * len(date_ranges))
+    examples.extend(match[0] for match in date_ranges[:3])
+    if not date_ranges:
+        issues.append(("No employment date ranges detected",
+                       "Give each role a date range (Mon YYYY - Mon YYYY)"))
+    elif len(date_ranges) < DATE_RANGES_FOR_FULL_MARKS:
+        issues.append((f"Only {len(date_ranges)} employment date range detected",
+                       "Give every role, internship and project a date range (Mon YYYY - Mon YYYY)"))
+
+    metric_lines = [line for line in body if METRIC_RE.search(line)]
+    points += min(8, 2 * len(metric_lines))
+    if not metric_lines:
+        issues.append(("No quantified achievements (numbers, %, $) in experience",
+                       "Quantify achievements in each role (numbers, %, $, users, time saved)"))
+    elif len(metric_lines) < METRIC_LINES_FOR_FULL_MARKS:
+        issues.append((f"Only {len(metric_lines)} experience lines with quantified results "
+                       f"({METRIC_LINES_FOR_FULL_MARKS} for full marks)",
+                       "Add measurable results to more experience bullets"))
+    return min(points, 20), issues, examples
+
+
+def score_contact(text: str) -> Criterion:
+    points, issues, examples = 0, [], []
+    email = EMAIL_RE.search(text)
+    if email:
+        points += 4
+        examples.append(email.group())
+    else:
+        issues.append(("No email address", "Add a professional email address at the top"))
+    # Date ranges like "2019 - 2021" also look like digit runs; a phone has 10-15 digits
+    if any(10 <= len(re.sub(r"\D", "", m)) <= 15 for m in PHONE_RE.findall(text)):
+        points += 3
+    else:
+        issues.append(("No phone number", "Add a phone number with country code"))
+    if LINKEDIN_RE.search(text):
+        points += 2
+    else:
+        issues.append(("No LinkedIn profile URL", "Add your LinkedIn profile URL"))
+    if PROFILE_RE.search(LINKEDIN_RE.sub("", text)):
+        points += 1
+    else:
+        issues.append(("No GitHub or portfolio link", "Link a GitHub profile or portfolio"))
+    return min(points, 10), issues, examples
+
+
+def score_education(text: str, sections: Dict[str, List[str]]) -> Criterion:
+    points, issues, examples = 0, [], []
+    if "education" in sections:
+        points += 4
+    else:
+        issues.append(("No education section", "Add an Education section"))
+    degree = DEGREE_RE.search(text)
+    if degree:
+        points += 4
+        examples.append(degree.group())
+    else:
+        issues.append(("No recognisable degree", "State the degree in full (e.g. B.Tech in Computer Science)"))
+    if INSTITUTION_RE.search(text):
+        points += 2
+    else:
+        issues.append(("No institution name detected", "Name the university or college and graduation year"))
+    return points, issues, examples
+
+
+def score_action_verbs(lines: List[str]) -> Criterion:
+    bullets = _bullets(lines) or [line for line in lines if len(line.split()) > 4]
+    if not bullets:
+        return 0, [("No achievement statements found",
+                    "Describe your work as achievement statements starting with an action verb")], []
+    strong = [b for b in bullets if b.split()[0].lower().strip(",.") in ACTION_VERBS]
+    with_metrics = [b for b in bullets if METRIC_RE.search(b)]
+    verb_ratio = len(strong) / len(bullets)
+    metric_ratio = len(with_metrics) / len(bullets)
+    # Rounded down, so any shortfall below the thresholds costs a point and has its reason
+    points = int(6 * min(verb_ratio / 0.6, 1) + 4 * min(metric_ratio / 0.4, 1))
+    issues = []
+    if verb_ratio < 0.6:
+        issues.append((f"Only {len(strong)}/{len(bullets)} statements start with a strong action verb",
+                       "Start each bullet with a strong action verb (built, led, reduced)"))
+    if metric_ratio < 0.4:
+        issues.append((f"Only {len(with_metrics)}/{len(bullets)} statements show measurable results",
+                       "Add a measurable result to more statements"))
+    weak = [b for b in bullets if b not in strong][:3]
+    return points, issues, weak
+
+
+def score_grammar(text: str) -> Criterion:
+    points, issues, examples = 5, [], []
+    repeated = REPEATED_WORD_RE.findall(text)
+    repeated = [word for word in repeated if not word.isdigit()]
+    if repeated:
+        points -= min(2, len(repeated))
+        issues.append(("Repeated words", "Remove repeated words"))
+        examples.extend(f"{w} {w}" for w in repeated[:3])
+    if len(FIRST_PERSON_RE.findall(text.lower())) > 5:
+        points -= 1
+        issues.append(("Frequent first-person pronouns", "Drop first-person pronouns (I, me, my)"))
+    if re.search(r"[!?]{2,}|\s[,.;:]", text):
+        points -= 1
+        issues.append(("Punctuation spacing issues", "Fix spaces before punctuation and repeated !/?"))
+    return max(points, 0), issues, examples
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+CRITERIA = (
+    ("Format & Structure", 20),
+    ("Keywords & Skills", 25),
+    ("Work Experience", 20),
+    ("Contact Information", 10),
+    ("Education", 10),
+    ("Action Verbs & Impact", 10),
+    ("Grammar & Spelling", 5),
+)
+
+
+def score_resume(text: str, job_role: Optional[str] = None) -> Dict:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    sections: Dict[str, List[str]] = {}
+    for name, body in split_sections(lines):
+        # Drop the heading line itself; repeated headings merge into one section
+        sections.setdefault(name, []).extend(body if name == "header" else body[1:])
+    text_lower = text.lower()
+
+    results = [
+        score_format(lines, sections),
+        score_keywords(text_lower, sections, job_role),
+        score_experience(lines, sections),
+        score_contact(text),
+        score_education(text, sections),
+        score_action_verbs(lines),
+        score_grammar(text),
+    ]
+
+    breakdown, critical, recommendations = [], [], []
+    total = 0
+    for (name, max_points), (points, issues, examples) in zip(CRITERIA, results):
+        total += points
+        deducted = max_points - points
+        reasons = [reason for reason, _ in issues]
+        breakdown.append({
+            "section": name,
+            "score": f"{points}/{max_points}",
+            "points_deducted": deducted,
+            "reason": "; ".join(reasons) if reasons else "No issues detected",
+            "examples": examples,
+        })
+        if deducted >= max_points / 2:
+            critical.append(f"{name}: " + "; ".join(reasons))
+        # One recommendation per deduction, for what was actually found missing
+        if deducted:
+            recommendations.extend(fix for _, fix in issues if fix not in recommendations)
+
+    return {
+        "ats": {
+            "overall_score": f"{total}/100",
+            "detailed_breakdown": breakdown,
+            "critical_issues": critical,
+            "recommendations": recommendations,
+            "scorer": "rules",
+        }
+    }
+
+
+def overall_points(report: Dict) -> int:
+    return int(report["ats"]["overall_score"].split("/")[0])
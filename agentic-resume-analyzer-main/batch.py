@@ -0,0 +1,104 @@
+"""
+Helpers for batch analysis: ZIP expansion and the text-extraction process pool.
+"""
+
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from text_extraction import SUPPORTED_EXTENSIONS
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BATCH_MAX_FILES = int(os.getenv("ANALYZER_BATCH_MAX_FILES", "500"))
+BATCH_CONCURRENCY = int(os.getenv("ANALYZER_BATCH_CONCURRENCY", "4"))
+EXTRACT_WORKERS = int(os.getenv("ANALYZER_EXTRACT_WORKERS", str(os.cpu_count() or 2)))
+ZIP_MAX_MEMBER_BYTES = int(os.getenv("ANALYZER_ZIP_MAX_MEMBER_BYTES", str(20 * 1024 * 1024)))
+# Uncompressed bytes of all resumes in one batch, ZIP members included
+BATCH_MAX_BYTES = int(os.getenv("ANALYZER_BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+
+
+class BatchError(Exception):
+    """Raised for batches that cannot be accepted (too many files or bytes, bad archive)."""
+
+
+# ============================================================================
+# ZIP EXPANSION
+# ============================================================================
+
+def is_supported(filename: str) -> bool:
+    return filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def check_batch_bytes(total: int):
+    if total > BATCH_MAX_BYTES:
+        raise BatchError(f"Batch exceeds the limit of {BATCH_MAX_BYTES} uncompressed bytes")
+
+
+def expand_zip(data: bytes, batch_bytes: int = 0) -> List[Tuple[str, bytes]]:
+    """Supported members of the archive; batch_bytes is what the batch already holds."""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise BatchError("Uploaded ZIP archive is corrupt or not a ZIP file")
+
+    entries = []
+    with archive:
+        for info in archive.infolist():
+            name = info.filename
+            base = os.path.basename(name)
+            # Skip folders, macOS resource forks and hidden files
+            if info.is_dir() or name.startswith("__MACOSX/") or base.startswith("."):
+                continue
+            if not is_supported(base):
+                continue
+            if info.file_size > ZIP_MAX_MEMBER_BYTES:
+                raise BatchError(f"'{name}' exceeds the per-file size limit")
+            # Checked against the declared size before anything is decompressed
+            batch_bytes += info.file_size
+            check_batch_bytes(batch_bytes)
+            entries.append((name, archive.read(info)))
+    return entries
+
+
+def expand_batch(uploads: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """Flatten uploaded files and ZIP archives into (filename, bytes) resume entries."""
+    entries = []
+    batch_bytes = 0
+    for filename, data in uploads:
+        if filename.lower().endswith(".zip"):
+            expanded = expand_zip(data, batch_bytes)
+            entries.extend(expanded)
+            batch_bytes += sum(len(member) for _, member in expanded)
+        else:
+            entries.append((filename, data))
+            batch_bytes += len(data)
+            check_batch_bytes(batch_bytes)
+
+        if len(entries) > BATCH_MAX_FILES:
+            raise BatchError(f"Batch exceeds the limit of {BATCH_MAX_FILES} resumes")
+    return entries
+
+
+def resolve_concurrency(requested: Optional[int]) -> int:
+    if not requested or requested < 1:
+        return BATCH_CONCURRENCY
+    return min(requested, BATCH_CONCURRENCY)
+
+
+# ============================================================================
+# EXTRACTION POOL
+# ============================================================================
+
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    return _extraction_pool
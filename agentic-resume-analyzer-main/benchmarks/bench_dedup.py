@@ -0,0 +1,106 @@
+"""
+Benchmark the MinHash/LSH near-duplicate index.
+
+Fills an in-memory index with synthetic signatures, plants one real resume,
+then reports signature cost per resume and lookup latency percentiles for
+near-duplicate hits and for misses, plus save/load time of the .npz file.
+
+    python benchmarks/bench_dedup.py [--sizes 10000 100000] [--lookups 2000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from dedup_index import NUM_PERM, DedupIndex, content_hash, minhash  # noqa: E402
+
+WORDS = (
+    "built designed led improved reduced delivered managed team service platform users latency "
+    "python java sql aws docker kubernetes react data pipeline customers project product system"
+).split()
+
+
+def make_resume(rng: random.Random, words: int = 600) -> str:
+    return " ".join(rng.choice(WORDS) + str(rng.randint(0, 50)) for _ in range(words))
+
+
+def edit(text: str, rng: random.Random, changes: int = 3) -> str:
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = "edited"
+    return " ".join(words)
+
+
+def percentiles(samples: list) -> dict:
+    values = np.array(samples) * 1e6
+    return {f"p{p}_us": round(float(np.percentile(values, p)), 1) for p in (50, 95, 99)}
+
+
+def run(size: int, lookups: int, rng: random.Random) -> dict:
+    index = DedupIndex(path="", threshold=0.85)
+    random_signatures = np.random.RandomState(size).randint(0, 2 ** 31, size=(size, NUM_PERM)).astype(np.uint32)
+    started = time.perf_counter()
+    for i, signature in enumerate(random_signatures):
+        index.add(signature, f"synthetic-{i}")
+    fill_seconds = time.perf_counter() - started
+
+    original = make_resume(rng)
+    index.add(minhash(original), content_hash(original), "original.pdf")
+
+    started = time.perf_counter()
+    near = minhash(edit(original, rng))
+    minhash_ms = (time.perf_counter() - started) * 1000
+
+    hits, misses = [], []
+    found = 0
+    for _ in range(lookups):
+        start = time.perf_counter()
+        found += index.query(near) is not None
+        hits.append(time.perf_counter() - start)
+        probe = random_signatures[rng.randrange(size)] ^ np.uint32(1)
+        start = time.perf_counter()
+        index.query(probe)
+        misses.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index.path = os.path.join(directory, "index.npz")
+        index._unsaved = 1
+        start = time.perf_counter()
+        index.save()
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        DedupIndex(path=index.path)
+        load_seconds = time.perf_counter() - start
+
+    return {
+        "resumes": size + 1,
+        "fill_seconds": round(fill_seconds, 2),
+        "minhash_ms": round(minhash_ms, 2),
+        "hit_rate": round(found / lookups, 3),
+        "hit": percentiles(hits),
+        "miss": percentiles(misses),
+        "save_seconds": round(save_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    for size in args.sizes:
+        print(json.dumps(run(size, args.lookups, rng)))
+
+
+if __name__ == "__main__":
+    main()
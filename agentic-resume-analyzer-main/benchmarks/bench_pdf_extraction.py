@@ -0,0 +1,86 @@
+"""
+Micro-benchmark for PDF text extraction modes.
+
+Generates synthetic resumes of increasing page count and compares the
+legacy `text += page.get_text()` loop against each pdf_extraction mode,
+sequential and page-parallel. Also checks that the default mode returns
+identical text to the legacy loop.
+
+    python benchmarks/bench_pdf_extraction.py [--pages 2 20 200] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # noqa: E402
+import pdf_extraction  # noqa: E402
+from pdf_extraction import extract_pdf_text, open_pdf  # noqa: E402
+
+LINE = "Led migration of {n} Python services to Kubernetes, cutting deploy time by {n}%"
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        y = 50
+        for n in range(45):
+            page.insert_text((50, y), LINE.format(n=n + page_number), fontsize=9)
+            y += 16
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def legacy_extract(data: bytes) -> str:
+    text = ""
+    with open_pdf(data) as doc:
+        for page in doc:
+            text += page.get_text()
+    return text.strip()
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 20, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--sorted-max-pages", type=int, default=20)
+    parser.add_argument("--parallel-min-pages", type=int, default=pdf_extraction.PDF_PARALLEL_MIN_PAGES)
+    args = parser.parse_args()
+    pdf_extraction.PDF_PARALLEL_MIN_PAGES = args.parallel_min_pages
+
+    for pages in args.pages:
+        data = make_pdf(pages)
+        legacy = legacy_extract(data)
+        row = {
+            "pages": pages,
+            "identical_default": extract_pdf_text(data, mode="default", workers=1) == legacy,
+            "identical_parallel": extract_pdf_text(data, mode="default", workers=args.workers) == legacy,
+            "legacy_ms": timed(lambda: legacy_extract(data), args.repeat),
+            "default_ms": timed(lambda: extract_pdf_text(data, mode="default", workers=1), args.repeat),
+            "parallel_ms": timed(lambda: extract_pdf_text(data, workers=args.workers), args.repeat),
+            "cpus": os.cpu_count(),
+        }
+        if pages <= args.sorted_max_pages:
+            # Block sorting is an order of magnitude slower; keep it to small docs
+            row["sorted_ms"] = timed(lambda: extract_pdf_text(data, mode="sorted", workers=1), args.repeat)
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark BM25 shortlist ranking.
+
+Generates a synthetic corpus of resume texts (~400 tokens each, drawn from a
+skills vocabulary plus filler words) and reports best-of-N time to rank the
+corpus against a job description, split into matrix build and scoring, plus
+peak traced memory.
+
+    python benchmarks/bench_ranking.py [--sizes 1000 10000] [--repeat 3] [--top-k 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ranking import bm25_scores, build_term_matrix, query_terms, rank_resumes  # noqa: E402
+
+SKILLS = (
+    "python django fastapi flask java spring kotlin go rust javascript typescript react angular "
+    "vue node.js sql postgresql mysql mongodb redis kafka spark airflow aws azure gcp docker "
+    "kubernetes terraform jenkins git linux pandas numpy pytorch tensorflow tableau excel"
+).split()
+FILLER = (
+    "built designed led improved reduced delivered managed team service platform users latency "
+    "pipeline customers project product data system reliability scale migrated owned mentored"
+).split()
+
+QUERY = (
+    "Senior Backend Engineer\n"
+    "Python, Django or FastAPI, PostgreSQL, Redis, Kafka, AWS, Docker, Kubernetes, Terraform"
+)
+
+
+def make_corpus(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        skills = rng.sample(SKILLS, rng.randint(4, 14))
+        words = [rng.choice(FILLER) for _ in range(rng.randint(250, 550))]
+        words += [rng.choice(skills) for _ in range(rng.randint(10, 60))]
+        rng.shuffle(words)
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def measure(corpus: list, repeat: int, top_k: int) -> dict:
+    vocabulary = {term: column for column, term in enumerate(query_terms(QUERY))}
+    best_build = best_score = best_total = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        counts, lengths = build_term_matrix(corpus, vocabulary)
+        built = time.perf_counter()
+        bm25_scores(counts, lengths)
+        scored = time.perf_counter()
+        rank_resumes(corpus, QUERY, top_k)
+        ranked = time.perf_counter()
+        best_build = min(best_build, built - start)
+        best_score = min(best_score, scored - built)
+        best_total = min(best_total, ranked - scored)
+
+    tracemalloc.start()
+    rank_resumes(corpus, QUERY, top_k)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "build_ms": round(best_build * 1000, 2),
+        "score_ms": round(best_score * 1000, 3),
+        "rank_ms": round(best_total * 1000, 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        corpus = make_corpus(size)
+        row = {"resumes": size, "tokens": sum(len(text.split()) for text in corpus)}
+        row.update(measure(corpus, args.repeat, args.top_k))
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
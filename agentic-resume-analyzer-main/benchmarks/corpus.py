@@ -0,0 +1,116 @@
+"""
+Synthetic resume corpus for the benchmarks.
+
+Builds PDF and DOCX resumes of a given size (pages for PDF, experience
+entries for DOCX) with realistic sections: contact header, summary,
+experience bullets with metrics, education and a skills table.
+
+    python benchmarks/corpus.py OUT_DIR [--sizes small medium large]
+"""
+
+import argparse
+import io
+import os
+import random
+from typing import Dict, List, Tuple
+
+import docx
+import fitz
+
+SIZES: Dict[str, Tuple[int, int]] = {
+    # name -> (experience entries, bullets per entry); ~1, ~3 and ~12 pages
+    "small": (3, 4),
+    "medium": (10, 6),
+    "large": (40, 8),
+}
+
+SKILLS = ["Python", "Django", "FastAPI", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS",
+          "React", "TypeScript", "Kafka", "Terraform", "Go", "Java", "Spark", "Airflow"]
+VERBS = ["Led", "Built", "Designed", "Reduced", "Improved", "Migrated", "Automated", "Launched"]
+OBJECTS = ["payment service", "data pipeline", "search API", "CI/CD workflow", "billing dashboard",
+           "event ingestion platform", "recommendation model", "internal admin tool"]
+
+
+def resume_lines(size: str, seed: int = 0) -> List[str]:
+    rng = random.Random(f"{size}-{seed}")
+    entries, bullets = SIZES[size]
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | +1 555 01{seed % 100:02d} | linkedin.com/in/candidate{seed}",
+        "Summary",
+        "Software engineer building reliable backend systems and data platforms.",
+        "Experience",
+    ]
+    for entry in range(entries):
+        start = 2024 - entry * 2
+        lines.append(f"Senior Engineer, Company {entry}  Jan {start - 2} - Dec {start - 1}")
+        for _ in range(bullets):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, "
+                f"cutting latency by {rng.randint(10, 70)}% for {rng.randint(1, 20)}M users"
+            )
+    lines += [
+        "Education",
+        "B.Tech Computer Science, National Institute of Technology, 2016",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 10)),
+    ]
+    return lines
+
+
+def make_pdf(lines: List[str]) -> bytes:
+    doc = fitz.open()
+    page, y = None, 0
+    for line in lines:
+        if page is None or y > 780:
+            page, y = doc.new_page(), 50
+        page.insert_text((50, y), line, fontsize=9)
+        y += 14
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_docx(lines: List[str]) -> bytes:
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = lines[1]
+    skills_at = lines.index("Skills")
+    for line in lines[:skills_at]:
+        document.add_paragraph(line)
+    table = document.add_table(rows=2, cols=2)
+    skills = lines[skills_at + 1].split(", ")
+    for row_index, row in enumerate(table.rows):
+        row.cells[0].text = "Languages" if row_index == 0 else "Platforms"
+        row.cells[1].text = ", ".join(skills[row_index * 5:(row_index + 1) * 5])
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def generate(sizes: List[str], per_size: int = 1) -> List[Tuple[str, bytes]]:
+    """Return [(filename, data)], one PDF and one DOCX per size and seed."""
+    files = []
+    for size in sizes:
+        for seed in range(per_size):
+            lines = resume_lines(size, seed)
+            files.append((f"{size}_{seed}.pdf", make_pdf(lines)))
+            files.append((f"{size}_{seed}.docx", make_docx(lines)))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out_dir")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--per-size", type=int, default=1)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for name, data in generate(args.sizes, args.per_size):
+        with open(os.path.join(args.out_dir, name), "wb") as handle:
+            handle.write(data)
+        print(name, len(data))
+
+
+if __name__ == "__main__":
+    main()
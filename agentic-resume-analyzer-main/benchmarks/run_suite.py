@@ -0,0 +1,263 @@
+"""
+End-to-end benchmark suite for the analyzer service.
+
+1. Function benchmarks on a generated corpus (benchmarks/corpus.py):
+   extract_text_from_pdf, extract_text_from_docx, clean_markdown and
+   format_output, best-of-N milliseconds per corpus file.
+2. Service benchmark: starts the API with the offline stub LLM backend
+   (ANALYZER_LLM_BACKEND=stub) and drives POST /analyze at each
+   concurrency level, reporting p50/p95/p99 latency, requests/s, errors
+   and the server's peak RSS.
+
+Everything is printed as one JSON document (and written to --output) so
+runs can be compared across commits.
+
+    python benchmarks/run_suite.py [--concurrency 1 4 16] [--requests 40]
+                                   [--stub-latency-ms 200] [--output bench.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+ANALYZER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ANALYZER_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the suite from writing stores next to the code
+for _name in ("ANALYZER_ROLE_PROFILE_DB", "ANALYZER_DEDUP_INDEX", "ANALYZER_CACHE_DB", "ANALYZER_REVISION_DB"):
+    os.environ.setdefault(_name, "")
+
+import corpus  # noqa: E402
+from llm_backends import stub_payload  # noqa: E402
+from text_extraction import extract_text_from_docx, extract_text_from_pdf  # noqa: E402
+
+
+def timed_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ANALYZER_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ============================================================================
+# FUNCTION BENCHMARKS
+# ============================================================================
+
+def bench_functions(files, repeat: int) -> dict:
+    from app import clean_markdown, format_output
+
+    results = {}
+    for name, data in files:
+        extract = extract_text_from_pdf if name.endswith(".pdf") else extract_text_from_docx
+        text = extract(data)
+        ats = json.dumps(stub_payload("Perform a comprehensive ATS scan\nThis is the resume: " + text))
+        markdown = json.dumps(stub_payload("Rewrite the resume\nThis is the resume: " + text))
+        job_fit = json.dumps(stub_payload("against the specified job role: Backend Engineer"))
+        raw = SimpleNamespace(tasks_output=[
+            "Final Answer: " + ats, "```json\n" + markdown + "\n```", job_fit,
+        ])
+        resume_markdown = json.loads(markdown)["resume_markdown"]
+        results[name] = {
+            "bytes": len(data),
+            "chars": len(text),
+            "extract_ms": timed_ms(lambda: extract(data), repeat),
+            "clean_markdown_ms": timed_ms(lambda: clean_markdown(resume_markdown), repeat),
+            "format_output_ms": timed_ms(lambda: format_output(raw), repeat),
+        }
+    return results
+
+
+# ============================================================================
+# SERVICE BENCHMARK
+# ============================================================================
+
+def multipart(fields: dict, filename: str, data: bytes):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for key, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="resume_file"; filename="{filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n".encode() + data + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def peak_rss_kib(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class Server:
+    def __init__(self, port: int, env: dict):
+        self.url = f"http://127.0.0.1:{port}"
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+             "--port", str(port), "--log-level", "warning"],
+            cwd=ANALYZER_DIR, env={**os.environ, **env},
+        )
+
+    def wait_ready(self, timeout: float = 60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            try:
+                with urllib.request.urlopen(self.url + "/healthz", timeout=1):
+                    return
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.2)
+        raise RuntimeError("Server did not become healthy")
+
+    def stop(self) -> int:
+        peak = peak_rss_kib(self.process.pid)
+        self.process.terminate()
+        self.process.wait(timeout=30)
+        # Fallback where /proc is unavailable: largest child RSS (KiB on Linux, bytes on macOS)
+        if not peak:
+            peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            if sys.platform == "darwin":
+                peak //= 1024
+        return peak
+
+
+def post_analyze(url: str, filename: str, data: bytes, crew: str, timeout: float):
+    body, content_type = multipart({"crew": crew, "no_cache": "true"}, filename, data)
+    request = urllib.request.Request(url + "/analyze", data=body, headers={"Content-Type": content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            ok = response.status == 200 and "error" not in json.loads(response.read())
+    except (urllib.error.URLError, ConnectionError, TimeoutError, ValueError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def drive(url: str, files, concurrency: int, total: int, crew: str, timeout: float) -> dict:
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def one(index: int):
+        nonlocal errors
+        name, data = files[index % len(files)]
+        seconds, ok = post_analyze(url, name, data, crew, timeout)
+        with lock:
+            if ok:
+                latencies.append(seconds)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def bench_service(files, args) -> dict:
+    env = {
+        "ANALYZER_LLM_BACKEND": "stub",
+        "ANALYZER_STUB_LATENCY_MS": str(args.stub_latency_ms),
+        "ANALYZER_STUB_JITTER_MS": str(args.stub_latency_ms // 4),
+        "ANALYZER_STUB_ERROR_RATE": str(args.stub_error_rate),
+        "ANALYZER_LLM_RPM": "0",
+        "ANALYZER_LLM_TPM": "0",
+        "ANALYZER_LLM_CONCURRENCY": str(max(args.concurrency) * 3),
+        "ANALYZER_WORKERS": str(max(args.concurrency)),
+        "ANALYZER_DEDUP": "false",
+    }
+    server = Server(args.port, env)
+    try:
+        server.wait_ready()
+        post_analyze(server.url, *files[0], args.crew, args.timeout)  # warm up crews and imports
+        runs = [drive(server.url, files, level, args.requests, args.crew, args.timeout)
+                for level in args.concurrency]
+    finally:
+        peak = server.stop()
+    return {"crew": args.crew, "stub_latency_ms": args.stub_latency_ms, "runs": runs, "peak_rss_kib": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=list(corpus.SIZES), choices=list(corpus.SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=40, help="requests per concurrency level")
+    parser.add_argument("--crew", default="minimal")
+    parser.add_argument("--stub-latency-ms", type=int, default=200)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--skip-service", action="store_true")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    files = corpus.generate(args.sizes)
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "functions": bench_functions(files, args.repeat),
+    }
+    if not args.skip_service:
+        report["service"] = bench_service(files, args)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
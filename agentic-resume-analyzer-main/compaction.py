@@ -0,0 +1,210 @@
+"""
+Resume compaction before prompting.
+
+The extracted text is pasted verbatim into {resume} for every task, so
+anything removed here shortens every LLM call. Stages:
+
+1. Normalize whitespace (collapse runs of spaces, at most one blank line).
+2. Strip page headers/footers: repeats of lines found at the top or bottom
+   of several pages (page breaks arrive as form feeds) and page numbers.
+3. Drop consecutive duplicate lines and repeated long lines.
+4. Detect sections and, if a token budget is set, drop low-value sections
+   first (declaration, references, hobbies, ...), then truncate.
+"""
+
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TOKEN_BUDGET = int(os.getenv("ANALYZER_TOKEN_BUDGET", "0"))  # 0 = no trimming
+CHARS_PER_TOKEN = 4  # rough average for Gemini/GPT-style tokenizers on English text
+
+PAGE_BREAK = "\f"
+EDGE_LINES = 3  # lines at the top/bottom of a page checked for headers/footers
+LONG_LINE_CHARS = 40  # only lines at least this long are deduped across the document
+
+PAGE_NUMBER_RE = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+
+# Section name -> heading aliases
+SECTION_ALIASES = {
+    "summary": ("summary", "professional summary", "profile", "objective", "career objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "work history", "internships", "internship"),
+    "education": ("education", "academic background", "academics", "qualifications",
+                  "educational qualifications"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "technologies", "tools"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses", "training"),
+    "awards": ("awards", "achievements", "honors", "honours", "accomplishments"),
+    "publications": ("publications", "papers", "research"),
+    "languages": ("languages", "languages known"),
+    "volunteer": ("volunteer", "volunteering", "volunteer experience"),
+    "extracurricular": ("extracurricular", "extracurricular activities", "activities",
+                        "positions of responsibility"),
+    "interests": ("interests", "hobbies", "hobbies and interests", "hobbies & interests"),
+    "personal_details": ("personal details", "personal information", "personal profile"),
+    "references": ("references", "referees"),
+    "declaration": ("declaration",),
+}
+
+# Dropped first-to-last when over budget; sections not listed are never dropped whole
+LOW_VALUE_SECTIONS = (
+    "declaration", "references", "personal_details", "interests", "extracurricular",
+    "volunteer", "languages", "publications", "awards",
+)
+
+_HEADINGS = {
+    alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    stats: Dict = field(default_factory=dict)
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+def normalize_whitespace(text: str) -> List[List[str]]:
+    """Return pages of whitespace-normalized lines."""
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = []
+        for line in page.splitlines():
+            line = " ".join(line.split())
+            if line or (lines and lines[-1]):
+                lines.append(line)
+        while lines and not lines[-1]:
+            lines.pop()
+        pages.append(lines)
+    return pages
+
+
+def edge_indexes(lines: List[str]) -> set:
+    """Indexes of the first and last EDGE_LINES non-empty lines of a page."""
+    content = [index for index, line in enumerate(lines) if line]
+    return set(content[:EDGE_LINES] + content[-EDGE_LINES:])
+
+
+def repeated_page_edges(pages: List[List[str]]) -> set:
+    if len(pages) < 2:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        counts.update({lines[index] for index in edge_indexes(lines)})
+    # A header/footer shows up on at least half the pages (and at least twice)
+    threshold = max(2, (len(pages) + 1) // 2)
+    return {line for line, count in counts.items() if count >= threshold}
+
+
+def strip_and_dedupe(pages: List[List[str]], stats: Dict) -> List[str]:
+    edges = repeated_page_edges(pages)
+    seen_edges = set()
+    seen_long = set()
+    output: List[str] = []
+    for lines in pages:
+        page_edges = edge_indexes(lines)
+        for index, line in enumerate(lines):
+            # Keep the first copy of a running header (often the candidate's name); a bare
+            # number is a page number only at the top or bottom of a page (not a CGPA or count)
+            if ((line in edges and line in seen_edges)
+                    or (index in page_edges and PAGE_NUMBER_RE.match(line))):
+                stats["removed_page_lines"] += 1
+                continue
+            if line in edges:
+                seen_edges.add(line)
+            if line and output and line == output[-1]:
+                stats["removed_duplicate_lines"] += 1
+                continue
+            if len(line) >= LONG_LINE_CHARS:
+                if line in seen_long:
+                    stats["removed_duplicate_lines"] += 1
+                    continue
+                seen_long.add(line)
+            if not line and output and not output[-1]:
+                continue
+            output.append(line)
+    while output and not output[-1]:
+        output.pop()
+    return output
+
+
+def heading_name(line: str) -> Optional[str]:
+    if not line or len(line) > 40:
+        return None
+    key = line.strip(" :-–|•").lower()
+    return _HEADINGS.get(key)
+
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    sections = [("header", [])]
+    for line in lines:
+        name = heading_name(line)
+        if name:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def enforce_budget(sections: List[Tuple[str, List[str]]], budget: int,
+                   stats: Dict) -> str:
+    def render(parts):
+        return "\n".join("\n".join(body) for _, body in parts)
+
+    text = render(sections)
+    if not budget or estimate_tokens(text) <= budget:
+        return text
+
+    for low_value in LOW_VALUE_SECTIONS:
+        if any(name == low_value for name, _ in sections):
+            sections = [(name, body) for name, body in sections if name != low_value]
+            stats["dropped_sections"].append(low_value)
+            text = render(sections)
+            if estimate_tokens(text) <= budget:
+                return text
+
+    # Still over budget: cut at the last line break that fits
+    limit = budget * CHARS_PER_TOKEN
+    cut = text.rfind("\n", 0, limit)
+    stats["truncated"] = True
+    return text[: cut if cut > 0 else limit].rstrip()
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def compact_resume(text: str, token_budget: Optional[int] = None) -> CompactionResult:
+    budget = TOKEN_BUDGET if token_budget is None else token_budget
+    stats = {
+        "tokens_before": estimate_tokens(text.replace(PAGE_BREAK, "\n")),
+        "tokens_after": 0,
+        "token_budget": budget or None,
+        "removed_page_lines": 0,
+        "removed_duplicate_lines": 0,
+        "sections": [],
+        "dropped_sections": [],
+        "truncated": False,
+    }
+
+    lines = strip_and_dedupe(normalize_whitespace(text), stats)
+    sections = split_sections(lines)
+    stats["sections"] = [name for name, _ in sections]
+    compacted = enforce_budget(sections, budget, stats)
+
+    stats["tokens_after"] = estimate_tokens(compacted)
+    return CompactionResult(text=compacted, stats=stats)
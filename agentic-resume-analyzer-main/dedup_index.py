@@ -0,0 +1,235 @@
+"""
+Near-duplicate resume detection with MinHash + LSH.
+
+Exact-hash caching misses re-applications with small edits and the same CV
+submitted under different names. Each resume becomes a MinHash signature of
+its word shingles; LSH splits the signature into bands and only resumes that
+share a band are compared. Band hashes live in per-band sorted NumPy arrays
+(binary search per lookup) plus a small unsorted tail for recent additions,
+so memory stays flat and lookups stay well under a millisecond at 100k+
+resumes. With ANALYZER_DEDUP_INDEX set, the index is saved to that .npz file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from result_cache import normalize_text
+
+logger = logging.getLogger("resume_analyzer")
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEDUP_ENABLED = os.getenv("ANALYZER_DEDUP", "true").lower() in ("1", "true", "yes")
+DEDUP_INDEX_PATH = os.getenv("ANALYZER_DEDUP_INDEX", "")  # empty = memory only
+DEDUP_THRESHOLD = float(os.getenv("ANALYZER_DEDUP_THRESHOLD", "0.85"))
+DEDUP_REUSE = os.getenv("ANALYZER_DEDUP_REUSE", "false").lower() in ("1", "true", "yes")
+DEDUP_SAVE_EVERY = int(os.getenv("ANALYZER_DEDUP_SAVE_EVERY", "200"))  # changes between saves
+
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS, ROWS = 16, 8  # BANDS * ROWS == NUM_PERM; candidate threshold ~ (1/16) ** (1/8) = 0.71
+MERGE_TAIL = 1024  # recent additions kept unsorted before merging into the band arrays
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(20240601)  # fixed: signatures must be comparable across restarts
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_BAND_MULT = (_rng.randint(1, 1 << 62, size=ROWS, dtype=np.int64).astype(np.uint64) | np.uint64(1))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).lower().encode("utf-8")).hexdigest()
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    words = normalize_text(text).lower().split()
+    if len(words) < SHINGLE_WORDS:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash(text: str) -> np.ndarray:
+    hashes = shingle_hashes(text)
+    if not hashes.size:
+        return np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    # a * h + b stays below 2**63 because a < 2**31 and h < 2**32
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_hashes(signatures: np.ndarray) -> np.ndarray:
+    """(n, NUM_PERM) signatures -> (n, BANDS) uint64 band keys (wrapping multiply-add)."""
+    bands = signatures.reshape(-1, BANDS, ROWS).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        return (bands * _BAND_MULT).sum(axis=2, dtype=np.uint64)
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class DedupIndex:
+    def __init__(self, path: str = DEDUP_INDEX_PATH, threshold: float = DEDUP_THRESHOLD,
+                 save_every: int = DEDUP_SAVE_EVERY):
+        self.path = path
+        self.threshold = threshold
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # serializes file writes, which happen outside _lock
+        self._signatures = np.empty((0, NUM_PERM), dtype=np.uint32)
+        self._keys = np.empty((0, BANDS), dtype=np.uint64)  # band keys per resume
+        self._count = 0
+        self._meta: List[Dict[str, Any]] = []
+        self._by_content: Dict[str, int] = {}
+        # Sorted per band: keys (BANDS, n) and the matching resume ids
+        self._band_keys = np.empty((BANDS, 0), dtype=np.uint64)
+        self._band_ids = np.empty((BANDS, 0), dtype=np.int64)
+        self._merged = 0  # ids below this are in the sorted arrays, the rest in the tail
+        self._unsaved = 0
+        self._counters = {"lookups": 0, "near_duplicates": 0, "reused": 0}
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ---------------- READ ----------------
+    def query(self, signature: np.ndarray, exclude_content: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Best stored match at or above the threshold, as {id, similarity, **meta}, or None."""
+        keys = band_hashes(signature)[0]
+        with self._lock:
+            self._counters["lookups"] += 1
+            candidates = []
+            for band in range(BANDS):
+                row = self._band_keys[band]
+                lo = np.searchsorted(row, keys[band], "left")
+                hi = np.searchsorted(row, keys[band], "right")
+                if hi > lo:
+                    candidates.append(self._band_ids[band, lo:hi])
+            if self._merged < self._count:
+                tail = self._keys[self._merged:self._count]
+                candidates.append(np.nonzero((tail == keys).any(axis=1))[0] + self._merged)
+            if not candidates:
+                return None
+            ids = np.unique(np.concatenate(candidates))
+            if exclude_content is not None and exclude_content in self._by_content:
+                ids = ids[ids != self._by_content[exclude_content]]
+            if not ids.size:
+                return None
+
+            similarity = (self._signatures[ids] == signature).mean(axis=1)
+            best = int(np.argmax(similarity))
+            if similarity[best] < self.threshold:
+                return None
+            self._counters["near_duplicates"] += 1
+            doc_id = int(ids[best])
+            return {"id": doc_id, "similarity": round(float(similarity[best]), 3), **self._meta[doc_id]}
+
+    # ---------------- WRITE ----------------
+    def add(self, signature: np.ndarray, content: str, name: Optional[str] = None) -> int:
+        """Store a resume (idempotent per content hash) and return its id."""
+        with self._lock:
+            if content in self._by_content:
+                return self._by_content[content]
+            if self._count == len(self._signatures):
+                capacity = max(1024, 2 * self._count)
+                self._signatures = np.resize(self._signatures, (capacity, NUM_PERM))
+                self._keys = np.resize(self._keys, (capacity, BANDS))
+            doc_id = self._count
+            self._signatures[doc_id] = signature
+            self._keys[doc_id] = band_hashes(signature)[0]
+            self._count += 1
+            self._meta.append({"content": content, "name": name, "added_at": time.time(), "analyses": {}})
+            self._by_content[content] = doc_id
+            if self._count - self._merged >= MERGE_TAIL:
+                self._merge_locked()
+            self._unsaved += 1
+        self._maybe_save()
+        return doc_id
+
+    def record_analysis(self, doc_id: int, variant: str, result_key: str):
+        """Remember which result-cache entry holds this resume's analysis for a crew/role variant."""
+        with self._lock:
+            self._meta[doc_id]["analyses"][variant] = result_key
+            self._unsaved += 1
+        self._maybe_save()
+
+    def record_reuse(self):
+        with self._lock:
+            self._counters["reused"] += 1
+
+    def _merge_locked(self):
+        keys = self._keys[:self._count].T  # (BANDS, n)
+        order = np.argsort(keys, axis=1, kind="stable")
+        self._band_keys = np.take_along_axis(keys, order, axis=1)
+        self._band_ids = order.astype(np.int64)
+        self._merged = self._count
+
+    # ---------------- PERSISTENCE ----------------
+    def _maybe_save(self):
+        if self.path and self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        with self._save_lock:
+            # Snapshot under the lock, write without it so lookups are not blocked on disk
+            with self._lock:
+                if not self._unsaved:
+                    return
+                signatures = self._signatures[:self._count].copy()
+                meta = json.dumps(self._meta)
+                self._unsaved = 0
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    np.savez(handle, signatures=signatures, meta=np.array(meta))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning("Could not save dedup index to %s: %s", self.path, e)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def _load(self):
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                signatures = data["signatures"]
+                meta = json.loads(str(data["meta"]))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable dedup index %s: %s", self.path, e)
+            return
+        self._signatures = np.array(signatures, dtype=np.uint32).reshape(-1, NUM_PERM)
+        self._keys = band_hashes(self._signatures)
+        self._count = len(self._signatures)
+        self._meta = meta
+        self._by_content = {entry["content"]: i for i, entry in enumerate(meta)}
+        self._merge_locked()
+
+    # ---------------- STATS ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._counters)
+            data["enabled"] = DEDUP_ENABLED
+            data["resumes"] = self._count
+            data["threshold"] = self.threshold
+            data["persisted"] = bool(self.path)
+            return data
+
+
+dedup_index = DedupIndex()
@@ -0,0 +1,133 @@
+"""
+Streaming DOCX text extraction.
+
+Reads the WordprocessingML parts straight out of the zip with iterparse
+instead of building python-docx's object model. Headers come first (that is
+where many resumes keep contact details), then the body, then footers.
+Reading order is preserved, including table cells (one line per row,
+cells separated by " | ") and text boxes. The mc:Fallback copies of text
+boxes are skipped so nothing is emitted twice.
+"""
+
+import io
+import re
+import zipfile
+from typing import List, Optional, Union
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+P, T, TAB, BR, CR = W + "p", W + "t", W + "tab", W + "br", W + "cr"
+TR, TC, TBL, TXBX = W + "tr", W + "tc", W + "tbl", W + "txbxContent"
+FALLBACK = MC + "Fallback"
+
+HEADER_RE = re.compile(r"^word/header\d*\.xml$")
+FOOTER_RE = re.compile(r"^word/footer\d*\.xml$")
+
+Source = Union[str, bytes]
+
+# Container kinds on the container stack
+ROOT, ROW, CELL = "root", "row", "cell"
+
+
+def _part_number(name: str) -> int:
+    digits = re.sub(r"\D", "", name.rsplit("/", 1)[-1])
+    return int(digits) if digits else 0
+
+
+def extract_part_lines(stream) -> List[str]:
+    """Extract the lines of one WordprocessingML part (document, header or footer)."""
+    lines: List[Optional[str]] = []
+    paragraphs = []  # stack of (slot, parts) for nested paragraphs (text boxes)
+    containers = [(ROOT, None)]
+    fallback_depth = 0
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+
+        if tag == FALLBACK:
+            fallback_depth += 1 if event == "start" else -1
+            if event == "end":
+                elem.clear()
+            continue
+        if fallback_depth:
+            continue
+
+        if event == "start":
+            if tag == P:
+                if containers[-1][0] == ROOT:
+                    # Reserve the slot now so a paragraph precedes its text boxes
+                    lines.append(None)
+                    paragraphs.append((len(lines) - 1, []))
+                else:
+                    paragraphs.append((None, []))
+            elif tag == TXBX:
+                containers.append((ROOT, None))
+            elif tag == TR:
+                containers.append((ROW, []))
+            elif tag == TC:
+                containers.append((CELL, []))
+            continue
+
+        # ---------------- END EVENTS ----------------
+        if tag == T:
+            if paragraphs:
+                paragraphs[-1][1].append(elem.text or "")
+        elif tag == TAB:
+            if paragraphs:
+                paragraphs[-1][1].append("\t")
+        elif tag in (BR, CR):
+            if paragraphs:
+                paragraphs[-1][1].append("\n")
+        elif tag == P:
+            slot, parts = paragraphs.pop()
+            text = "".join(parts)
+            if slot is not None:
+                lines[slot] = text
+            elif text.strip():
+                containers[-1][1].append(text)
+            if not paragraphs:
+                elem.clear()
+        elif tag == TXBX:
+            containers.pop()
+        elif tag == TC:
+            _, cell_parts = containers.pop()
+            containers[-1][1].append(" ".join(part.strip() for part in cell_parts))
+        elif tag == TR:
+            _, cells = containers.pop()
+            row_text = " | ".join(cell for cell in cells if cell)
+            if containers[-1][0] == ROOT:
+                lines.append(row_text)
+            elif row_text:
+                containers[-1][1].append(row_text)
+        elif tag == TBL and len(containers) == 1 and not paragraphs:
+            elem.clear()
+
+    return [line for line in lines if line is not None]
+
+
+def extract_docx_text_streaming(source: Source) -> str:
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        headers = sorted((n for n in names if HEADER_RE.match(n)), key=_part_number)
+        footers = sorted((n for n in names if FOOTER_RE.match(n)), key=_part_number)
+
+        sections = []
+        seen = set()
+        for name in headers + ["word/document.xml"] + footers:
+            if name not in names:
+                continue
+            with archive.open(name) as part:
+                text = "\n".join(extract_part_lines(part))
+            if name == "word/document.xml":
+                sections.append(text)
+            # First-page / even-page variants often repeat the same block
+            elif text.strip() and text not in seen:
+                seen.add(text)
+                sections.append(text)
+
+    return "\n".join(sections)
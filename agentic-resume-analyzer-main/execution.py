@@ -0,0 +1,201 @@
+"""
+Crew execution with per-task timings.
+
+Modes:
+    minimal   - ATS scan -> resume rewrite
+    ats       - ATS scan only
+    full      - ATS scan -> resume rewrite -> job fit (strictly sequential)
+    fast_full - [ATS scan -> resume rewrite] in parallel with [job fit on the
+                original resume]; only the real dependency is serialized
+    ats_fast  - rule-based ATS scan (ats_rules), no LLM call
+
+With a pre-filter threshold, LLM modes first score the resume locally and
+stop there when the score is below the threshold.
+
+When the inputs carry a revision plan (revisions.py), the ATS scan of the
+LLM modes is replaced by the ats_rescan task, which re-scores only the
+criteria affected by the changed sections.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ats_rules import overall_points, score_resume
+from llm_governor import start_usage, stop_usage
+from resume_agent import get_crew
+
+CREW_MODES = ("minimal", "ats", "full", "fast_full", "ats_fast")
+
+# Modes answered without the LLM
+LOCAL_MODES = ("ats_fast",)
+
+# Local ATS score (0-100) below which LLM modes are skipped; 0 = off
+PREFILTER_MIN_SCORE = int(os.getenv("ANALYZER_PREFILTER_MIN_SCORE", "0"))
+
+# Modes whose prompts reference {job_role}
+JOB_ROLE_MODES = ("full", "fast_full")
+
+# Called from the worker thread with (task_label, task_output) as each task finishes
+TaskListener = Optional[Callable[[str, Any], None]]
+
+
+class AnalysisCancelled(Exception):
+    """Raised between tasks once the caller has given up on the run."""
+
+
+TASK_LABELS = {
+    "minimal": ["ats_scan", "resume_rewrite"],
+    "ats": ["ats_scan"],
+    "full": ["ats_scan", "resume_rewrite", "job_fit"],
+    "minimal_delta": ["ats_rescan", "resume_rewrite"],
+    "ats_delta": ["ats_rescan"],
+    "full_delta": ["ats_rescan", "resume_rewrite", "job_fit"],
+}
+
+# Crew run for a revision plan; fast_full pairs minimal_delta with the job fit branch
+DELTA_CREWS = {"minimal": "minimal_delta", "ats": "ats_delta", "full": "full_delta", "fast_full": "minimal_delta"}
+
+# Task label -> key of the JSON payload it answers with (structured_output.py)
+TASK_SECTIONS = {
+    "ats_scan": "ats",
+    "ats_rescan": "ats_delta",
+    "resume_rewrite": "resume_markdown",
+    "job_fit": "job_fit",
+}
+
+
+def is_incremental(crew_value: str, inputs: Dict[str, Any]) -> bool:
+    return crew_value in DELTA_CREWS and "rescore_criteria" in inputs
+
+
+def output_labels(mode: str, incremental: bool = False) -> List[str]:
+    """Task label of each entry of tasks_output, in order, for the mode execute() reports."""
+    if mode in LOCAL_MODES:
+        return ["ats_scan"]
+    if incremental:
+        return TASK_LABELS[DELTA_CREWS[mode]] + (["job_fit"] if mode == "fast_full" else [])
+    if mode == "fast_full":
+        return TASK_LABELS["minimal"] + ["job_fit"]
+    return TASK_LABELS.get(mode, TASK_LABELS["full"])
+
+
+def kickoff_timed(crew, inputs: Dict[str, Any], labels: List[str], origin: float,
+                  on_task_output: TaskListener = None,
+                  cancel_event: Optional[threading.Event] = None) -> Tuple[Any, Dict[str, Dict[str, float]]]:
+    """
+    Run a private copy of the crew, recording when each task finishes and the
+    (estimated) LLM tokens it used.
+    Offsets are relative to `origin` so parallel branches share one clock.
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise AnalysisCancelled()
+
+    timings: Dict[str, Dict[str, float]] = {}
+    started = time.perf_counter()
+    previous = started
+    # Tasks run one after another on this thread, so the tally since the last task is this task's
+    usage, usage_token = start_usage()
+    counted = {"prompt": 0, "completion": 0}
+
+    def on_task_done(output):
+        nonlocal previous
+        now = time.perf_counter()
+        label = labels[len(timings)] if len(timings) < len(labels) else f"task_{len(timings)}"
+        timings[label] = {
+            "start": round(previous - origin, 3),
+            "end": round(now - origin, 3),
+            "seconds": round(now - previous, 3),
+            "tokens": {direction: usage[direction] - counted[direction] for direction in counted},
+        }
+        counted.update(usage)
+        previous = now
+        if on_task_output is not None:
+            on_task_output(label, output)
+        # Raising here stops the crew before it starts the next task
+        if cancel_event is not None and cancel_event.is_set():
+            raise AnalysisCancelled()
+
+    # Crew instances keep per-run state, so each run works on its own copy
+    run = crew.copy()
+    run.task_callback = on_task_done
+    try:
+        return run.kickoff(inputs=inputs), timings
+    finally:
+        stop_usage(usage_token)
+
+
+def score_locally(inputs: Dict[str, Any], origin: float) -> Tuple[Any, Dict[str, Dict[str, float]], Dict]:
+    started = time.perf_counter()
+    report = score_resume(inputs["resume"], inputs.get("job_role"))
+    now = time.perf_counter()
+    raw_result = SimpleNamespace(tasks_output=[json.dumps(report)])
+    timings = {"ats_scan": {
+        "start": round(started - origin, 3),
+        "end": round(now - origin, 3),
+        "seconds": round(now - started, 3),
+    }}
+    return raw_result, timings, report
+
+
+def execute(crew_value: str, inputs: Dict[str, Any], on_task_output: TaskListener = None,
+            cancel_event: Optional[threading.Event] = None,
+            prefilter_min_score: int = 0) -> Tuple[Any, Dict[str, Any]]:
+    origin = time.perf_counter()
+    raw_result, prefilter = None, None
+    incremental = is_incremental(crew_value, inputs)
+
+    if crew_value in LOCAL_MODES or prefilter_min_score:
+        raw_result, task_timings, report = score_locally(inputs, origin)
+        if crew_value not in LOCAL_MODES:
+            score = overall_points(report)
+            prefilter = {"score": score, "threshold": prefilter_min_score,
+                         "passed": score >= prefilter_min_score}
+            if prefilter["passed"]:
+                # Good enough for the LLM; the local scan only decided that
+                raw_result = None
+
+    if raw_result is not None:
+        if on_task_output is not None:
+            on_task_output("ats_scan", raw_result.tasks_output[0])
+    elif crew_value == "fast_full":
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-fit") as branch:
+            # copy_context carries the caller's LLM priority (llm_governor) into the branch thread
+            job_fit = branch.submit(
+                contextvars.copy_context().run,
+                kickoff_timed, get_crew("job_fit"), inputs, ["job_fit"], origin, on_task_output, cancel_event
+            )
+            chain = DELTA_CREWS["fast_full"] if incremental else "minimal"
+            chain_result, task_timings = kickoff_timed(
+                get_crew(chain), inputs, TASK_LABELS[chain], origin, on_task_output, cancel_event
+            )
+            fit_result, fit_timings = job_fit.result()
+        task_timings.update(fit_timings)
+        raw_result = SimpleNamespace(
+            tasks_output=list(chain_result.tasks_output) + list(fit_result.tasks_output)
+        )
+    else:
+        mode = crew_value if crew_value in DELTA_CREWS else "full"
+        if incremental:
+            mode = DELTA_CREWS[mode]
+        raw_result, task_timings = kickoff_timed(
+            get_crew(mode), inputs, TASK_LABELS[mode], origin, on_task_output, cancel_event
+        )
+
+    timings = {
+        "mode": crew_value if not prefilter or prefilter["passed"] else "ats_fast",
+        "tasks": task_timings,
+        "wall_seconds": round(time.perf_counter() - origin, 3),
+        # What the same tasks would cost back to back
+        "sequential_seconds": round(sum(t["seconds"] for t in task_timings.values()), 3),
+    }
+    if prefilter:
+        timings["prefilter"] = prefilter
+    if incremental and timings["mode"] == crew_value:
+        timings["incremental"] = True
+    return raw_result, timings
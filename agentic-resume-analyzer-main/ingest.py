@@ -0,0 +1,124 @@
+"""
+Upload ingestion with request size limits.
+
+BodySizeLimitMiddleware counts request body bytes as they arrive and answers
+413 as soon as a request crosses its limit, before the multipart body has
+been parsed (chunked uploads without Content-Length included). Starlette
+then spools each file part into a SpooledTemporaryFile, which moves to disk
+past 1 MB; read_upload applies the per-file limits to the parsed parts and
+hands the bytes to the extractors in memory.
+"""
+
+import json
+import os
+from typing import Optional
+
+from fastapi import UploadFile
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CHUNK_SIZE = 256 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("ANALYZER_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_ZIP_BYTES = int(os.getenv("ANALYZER_MAX_ZIP_BYTES", str(100 * 1024 * 1024)))
+# Whole body of multi-file requests (/analyze/batch, /rank); single-file requests get
+# MAX_UPLOAD_BYTES plus room for the form fields and multipart framing
+MAX_REQUEST_BYTES = int(os.getenv("ANALYZER_MAX_REQUEST_BYTES", str(MAX_ZIP_BYTES)))
+FORM_OVERHEAD_BYTES = 64 * 1024
+MULTI_FILE_PATHS = ("/analyze/batch", "/rank")
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds its size limit."""
+
+
+def limit_for(filename: Optional[str]) -> int:
+    if (filename or "").lower().endswith(".zip"):
+        return MAX_ZIP_BYTES
+    return MAX_UPLOAD_BYTES
+
+
+def request_limit(path: str) -> int:
+    if path.rstrip("/") in MULTI_FILE_PATHS:
+        return MAX_REQUEST_BYTES
+    return MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware: 413 once a request body passes request_limit(path), while it is received."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        limit = request_limit(scope["path"])
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            return await self.reject(send, limit)
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    # Stops the form parser; the app's error response is replaced below
+                    raise UploadTooLargeError(f"Request body exceeds {limit} bytes")
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                if not response_started:
+                    response_started = True
+                    await self.reject(send, limit)
+                return
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLargeError:
+            if not response_started:
+                await self.reject(send, limit)
+
+    @staticmethod
+    async def reject(send, limit: int):
+        body = json.dumps({"detail": f"Request body exceeds {limit} bytes"}).encode("utf-8")
+        await send({"type": "http.response.start", "status": 413, "headers": [
+            (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+            (b"connection", b"close"),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+
+async def read_upload(upload: UploadFile, max_bytes: Optional[int] = None) -> bytes:
+    """Read a parsed upload part into memory, enforcing its per-file limit."""
+    if max_bytes is None:
+        max_bytes = limit_for(upload.filename)
+
+    # Size is known up front for spooled multipart parts; reject without reading
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLargeError(
+            f"'{upload.filename}' is {upload.size} bytes; the limit is {max_bytes} bytes"
+        )
+
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise UploadTooLargeError(f"'{upload.filename}' exceeds the limit of {max_bytes} bytes")
+    return bytes(buffer)
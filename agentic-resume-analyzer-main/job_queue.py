@@ -0,0 +1,150 @@
+"""
+Bounded worker pool for crew runs.
+
+CrewAI's kickoff is blocking, so analyses are executed on a fixed-size
+thread pool instead of the uvicorn event loop. Jobs are tracked in memory
+so clients can submit, then poll for status/result.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+MAX_WORKERS = int(os.getenv("ANALYZER_WORKERS", "4"))
+MAX_QUEUE_DEPTH = int(os.getenv("ANALYZER_MAX_QUEUE", "200"))
+JOB_TTL_SECONDS = int(os.getenv("ANALYZER_JOB_TTL", "3600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"  # dropped while still queued
+
+
+class QueueFullError(Exception):
+    """Raised when the pool already holds MAX_QUEUE_DEPTH unfinished jobs."""
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = QUEUED
+    result: Any = None
+    error: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "meta": self.meta,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+# ============================================================================
+# JOB QUEUE
+# ============================================================================
+
+class JobQueue:
+    def __init__(self, max_workers: int = MAX_WORKERS, max_depth: int = MAX_QUEUE_DEPTH,
+                 ttl_seconds: int = JOB_TTL_SECONDS):
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="crew-worker"
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pending = 0  # queued + running
+
+    # ---------------- SUBMISSION ----------------
+    def submit(self, fn: Callable[..., Any], *args, meta: Optional[Dict[str, Any]] = None,
+               **kwargs) -> Job:
+        """Schedule fn(*args, **kwargs); raises QueueFullError under backpressure."""
+        with self._lock:
+            self._prune_locked()
+            if self._pending >= self.max_depth:
+                raise QueueFullError(
+                    f"Analysis queue is full ({self._pending}/{self.max_depth} jobs pending)"
+                )
+            job = Job(id=uuid.uuid4().hex, meta=meta or {})
+            self._jobs[job.id] = job
+            self._pending += 1
+
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        # Runs however the future ends, including a cancel before _run ever started
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def _run(self, job: Job, fn, args, kwargs):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = DONE
+            return job.result
+        except Exception as e:
+            job.error = str(e) or e.__class__.__name__
+            job.status = FAILED
+            raise
+        finally:
+            job.finished_at = time.time()
+
+    def _finish(self, job: Job, future: Future):
+        if future.cancelled():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        with self._lock:
+            self._pending -= 1
+
+    # ---------------- LOOKUP ----------------
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            running = sum(1 for j in self._jobs.values() if j.status == RUNNING)
+            return {
+                "workers": self.max_workers,
+                "max_queue_depth": self.max_depth,
+                "pending": self._pending,
+                "running": running,
+                "queued": self._pending - running,
+                "tracked_jobs": len(self._jobs),
+            }
+
+    def _prune_locked(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+job_queue = JobQueue()
@@ -0,0 +1,216 @@
+"""
+LLM backend selection.
+
+ANALYZER_LLM_BACKEND picks what the crews talk to:
+
+    gemini - Gemini through CrewAI's LLM class (needs GEMINI_API_KEY)
+    stub   - offline, deterministic stand-in for load tests and local runs:
+             answers every task prompt with schema-valid JSON (ATS report,
+             ATS re-scan, resume markdown, job fit, role profile) after a configurable
+             latency, and can inject retryable errors and malformed JSON
+             answers at configurable rates
+
+Both are wrapped by the LLM governor, so the stub also exercises rate
+limiting, retries and priorities end to end.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict
+
+from ats_rules import overall_points, score_resume
+from structured_output import REPAIR_MARKER, REPAIR_OUTPUT_MARKER
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+LLM_BACKENDS = ("gemini", "stub")
+LLM_BACKEND = os.getenv("ANALYZER_LLM_BACKEND", "gemini").lower()
+
+STUB_LATENCY_MS = float(os.getenv("ANALYZER_STUB_LATENCY_MS", "800"))
+STUB_JITTER_MS = float(os.getenv("ANALYZER_STUB_JITTER_MS", "200"))
+STUB_ERROR_RATE = float(os.getenv("ANALYZER_STUB_ERROR_RATE", "0"))
+# Share of task answers cut off mid-JSON, to exercise output repair
+STUB_MALFORMED_RATE = float(os.getenv("ANALYZER_STUB_MALFORMED_RATE", "0"))
+STUB_SEED = int(os.getenv("ANALYZER_STUB_SEED", "0"))
+
+# Task descriptions (resume_agent.py) the stub recognises
+ATS_MARKER = "Perform a comprehensive ATS scan"
+RESCAN_MARKER = "Update an existing ATS scan"
+REWRITE_MARKER = "Rewrite the resume"
+PROFILE_MARKER = "Build a requirement profile"
+JOB_FIT_MARKER = "against the specified job role"
+
+RESUME_RE = re.compile(r"This is the resume:\s*(.*?)(?:\n\s*This is the expected criteria|\Z)", re.DOTALL)
+JOB_ROLE_RE = re.compile(r"job role:\s*(.+)", re.IGNORECASE)
+REPAIR_SECTION_RE = re.compile(r'top-level key "(\w+)"')
+RESCORE_RE = re.compile(r"Re-score ONLY these criteria[^:]*:\s*(.+)")
+CHANGED_TEXT_RE = re.compile(r"Changed sections of the revised resume:\s*(.*?)\n\s*For EACH", re.DOTALL)
+
+
+class StubLLMError(Exception):
+    """Injected failure; carries an HTTP-like status so the governor treats it as retryable."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Stub backend: simulated {'rate limit' if status_code == 429 else 'overload'} ({status_code})")
+        self.status_code = status_code
+
+
+# ============================================================================
+# STUB RESPONSES
+# ============================================================================
+
+def prompt_text(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(m.get("content", "")) if isinstance(m, dict) else str(m) for m in messages or [])
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _resume(prompt: str) -> str:
+    matches = RESUME_RE.findall(prompt)
+    return matches[-1].strip() if matches else ""
+
+
+def _job_role(prompt: str) -> str:
+    match = JOB_ROLE_RE.search(prompt)
+    return match.group(1).strip() if match else "Software Developer"
+
+
+def stub_resume_markdown(resume: str) -> str:
+    lines = [line.strip() for line in resume.splitlines() if line.strip()]
+    if not lines:
+        return "# Resume"
+    markdown = [f"# {lines[0]}"]
+    for line in lines[1:]:
+        if len(line) <= 40 and line.rstrip(":").istitle() and len(line.split()) <= 4:
+            markdown.append(f"\n## {line.rstrip(':')}")
+        else:
+            markdown.append(f"- {line.lstrip('-•* ')}")
+    return "\n".join(markdown)
+
+
+def stub_rescan_payload(prompt: str) -> Dict[str, Any]:
+    """Rule-based scores of the changed text, for the requested criteria only."""
+    rescore = RESCORE_RE.search(prompt)
+    criteria = {name.strip() for name in rescore.group(1).split(";")} if rescore else set()
+    changed = CHANGED_TEXT_RE.search(prompt)
+    report = score_resume(changed.group(1) if changed else "")["ats"]
+    return {"ats_delta": {
+        "detailed_breakdown": [item for item in report["detailed_breakdown"] if item["section"] in criteria],
+        "critical_issues": report["critical_issues"],
+        "recommendations": report["recommendations"],
+    }}
+
+
+def stub_repair_payload(prompt: str) -> Dict[str, Any]:
+    """Answer to a repair prompt: the requested section, rebuilt from the failed output."""
+    match = REPAIR_SECTION_RE.search(prompt)
+    section = match.group(1) if match else ""
+    output = prompt.split(REPAIR_OUTPUT_MARKER, 1)[-1].strip()
+    if section == "resume_markdown":
+        return {"resume_markdown": output}
+    if section == "ats":
+        return score_resume(output)
+    if section == "ats_delta":
+        return {"ats_delta": {key: value for key, value in score_resume(output)["ats"].items()
+                              if key in ("detailed_breakdown", "critical_issues", "recommendations")}}
+    if section == "role_profile":
+        return stub_payload(f"{PROFILE_MARKER} for the job role: Software Developer")
+    return stub_payload(f"Analyze the resume {JOB_FIT_MARKER}: Software Developer")
+
+
+def stub_payload(prompt: str) -> Dict[str, Any]:
+    """The JSON a well-behaved model would return for this task prompt."""
+    if REPAIR_MARKER in prompt:
+        return stub_repair_payload(prompt)
+    if RESCAN_MARKER in prompt:
+        return stub_rescan_payload(prompt)
+    if ATS_MARKER in prompt:
+        return score_resume(_resume(prompt))
+    if REWRITE_MARKER in prompt:
+        return {"resume_markdown": stub_resume_markdown(_resume(prompt))}
+    if PROFILE_MARKER in prompt:
+        role = _job_role(prompt)
+        return {"role_profile": {
+            "job_role": role,
+            "must_have_skills": ["communication", "problem solving", role.split()[-1].lower()],
+            "nice_to_have_skills": ["cloud", "ci/cd"],
+            "min_years_experience": "2",
+            "seniority": "mid",
+            "responsibilities": [f"Core {role} duties"],
+            "education": ["Bachelor's degree or equivalent"],
+            "certifications": [],
+            "keywords": role.lower().split(),
+        }}
+    if JOB_FIT_MARKER in prompt:
+        role = _job_role(prompt)
+        resume = _resume(prompt)
+        score = overall_points(score_resume(resume, role)) if resume else 40 + _digest(prompt) % 50
+        verdict = "Apply" if score >= 75 else "Maybe" if score >= 50 else "Do Not Apply"
+        return {"job_fit": {
+            "job_role": role,
+            "match_score": f"{score}/100",
+            "verdict": verdict,
+            "strengths": ["Relevant technical background"],
+            "gaps": [] if score >= 75 else ["Limited evidence of role-specific experience"],
+            "recommendations": ["Quantify achievements for the target role"],
+        }}
+    return {}
+
+
+class StubBackend:
+    def __init__(self, latency_ms: float = STUB_LATENCY_MS, jitter_ms: float = STUB_JITTER_MS,
+                 error_rate: float = STUB_ERROR_RATE, malformed_rate: float = STUB_MALFORMED_RATE,
+                 seed: int = STUB_SEED):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def complete(self, messages: Any) -> str:
+        with self._lock:
+            delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self._random.random() < self.error_rate
+            status = self._random.choice((429, 503))
+            malformed = self._random.random() < self.malformed_rate
+        time.sleep(delay)
+        if fail:
+            raise StubLLMError(status)
+        prompt = prompt_text(messages)
+        answer = json.dumps(stub_payload(prompt))
+        if malformed and REPAIR_MARKER not in prompt:
+            answer = answer[:len(answer) // 2]
+        # ReAct-style answer, as CrewAI agents expect from a model
+        return "Thought: I now can give a great answer\nFinal Answer: " + answer
+
+
+def stub_llm_class(base: type) -> type:
+    """Subclass of CrewAI's LLM class answering from StubBackend, without any network."""
+
+    class StubLLM(base):
+        def __init__(self, backend: StubBackend = None, **kwargs):
+            super().__init__(model="stub/offline", **kwargs)
+            self.stub_backend = backend or StubBackend()
+
+        def call(self, messages, *args, **kwargs):
+            return self.stub_backend.complete(messages)
+
+        def supports_function_calling(self) -> bool:
+            return False
+
+        def supports_stop_words(self) -> bool:
+            return False
+
+    return StubLLM
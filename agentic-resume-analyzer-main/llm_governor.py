@@ -0,0 +1,233 @@
+"""
+Process-wide governor for LLM calls.
+
+Every call the crews make goes through one governor that enforces:
+
+- a requests-per-minute and a tokens-per-minute token bucket,
+- a cap on concurrent calls,
+- priority: waiting interactive calls (single uploads) go before batch ones,
+- jittered exponential retry for rate-limit / overload / timeout errors, so a
+  quota blip does not throw away minutes of crew work.
+
+GovernedLLM wraps CrewAI's LLM class so agents use it unchanged; the governor
+itself only needs a callable, which keeps it testable with a fake backend.
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+LLM_RPM = int(os.getenv("ANALYZER_LLM_RPM", "60"))  # 0 = unlimited
+LLM_TPM = int(os.getenv("ANALYZER_LLM_TPM", "1000000"))  # 0 = unlimited
+LLM_MAX_CONCURRENCY = int(os.getenv("ANALYZER_LLM_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = int(os.getenv("ANALYZER_LLM_MAX_RETRIES", "4"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("ANALYZER_LLM_RETRY_BASE", "2"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("ANALYZER_LLM_RETRY_MAX", "60"))
+
+# Output tokens are unknown up front; reserve this many per call in the TPM bucket
+OUTPUT_TOKENS_ESTIMATE = int(os.getenv("ANALYZER_LLM_OUTPUT_TOKENS", "1500"))
+CHARS_PER_TOKEN = 4
+
+INTERACTIVE, BATCH = 0, 1  # lower value is served first
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+RETRYABLE_MARKERS = (
+    "rate limit", "ratelimit", "rate_limit", "resource exhausted", "resource_exhausted", "quota",
+    "overloaded", "unavailable", "timed out", "timeout", "deadline exceeded", "429", "503",
+)
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+# Per-run token tally ({"prompt": n, "completion": n}) that governed calls add to, if set
+_usage: contextvars.ContextVar = contextvars.ContextVar("llm_usage", default=None)
+
+
+def run_with_priority(priority: int, fn: Callable[..., Any], *args, **kwargs):
+    """Run fn with every LLM call it makes (on this thread) queued at `priority`."""
+    token = _priority.set(priority)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _priority.reset(token)
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int) and status in RETRYABLE_STATUS:
+        return True
+    text = f"{error.__class__.__name__} {error}".lower()
+    return any(marker in text for marker in RETRYABLE_MARKERS)
+
+
+def estimate_tokens(messages: Any) -> int:
+    if isinstance(messages, str):
+        chars = len(messages)
+    else:
+        chars = sum(len(str(m.get("content", "")) if isinstance(m, dict) else str(m)) for m in messages or [])
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+def start_usage():
+    """Start a token tally for LLM calls made in this context; returns (usage, reset_token)."""
+    usage = {"prompt": 0, "completion": 0}
+    return usage, _usage.set(usage)
+
+
+def stop_usage(reset_token):
+    _usage.reset(reset_token)
+
+
+# ============================================================================
+# GOVERNOR
+# ============================================================================
+
+class LLMGovernor:
+    def __init__(self, rpm: int = LLM_RPM, tpm: int = LLM_TPM, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 max_retries: int = LLM_MAX_RETRIES, retry_base: float = LLM_RETRY_BASE_SECONDS,
+                 retry_max: float = LLM_RETRY_MAX_SECONDS, sleep: Callable[[float], None] = time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._sleep = sleep
+
+        self._cond = threading.Condition()
+        self._waiting: list = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._request_budget = float(rpm)
+        self._token_budget = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._counters = {"calls": 0, "retries": 0, "failures": 0, "wait_seconds": 0.0}
+
+    # ---------------- ADMISSION ----------------
+    def _refill_locked(self):
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.rpm:
+            self._request_budget = min(self.rpm, self._request_budget + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._token_budget = min(self.tpm, self._token_budget + elapsed * self.tpm / 60)
+
+    def _shortfall_seconds_locked(self, tokens: int) -> float:
+        """How long until both buckets can cover one call of `tokens` (0 = now)."""
+        wait = 0.0
+        if self.rpm and self._request_budget < 1:
+            wait = (1 - self._request_budget) * 60 / self.rpm
+        if self.tpm and self._token_budget < tokens:
+            wait = max(wait, (tokens - self._token_budget) * 60 / self.tpm)
+        return wait
+
+    def acquire(self, tokens: int = 0, priority: Optional[int] = None) -> float:
+        """Block until this call may start; returns the seconds spent waiting."""
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        ticket = (_priority.get() if priority is None else priority, next(self._sequence))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                self._refill_locked()
+                timeout = None
+                if self._waiting[0] == ticket and self._in_flight < self.max_concurrency:
+                    timeout = self._shortfall_seconds_locked(tokens)
+                    if timeout == 0:
+                        heapq.heappop(self._waiting)
+                        self._in_flight += 1
+                        if self.rpm:
+                            self._request_budget -= 1
+                        self._token_budget -= tokens
+                        waited = time.monotonic() - started
+                        self._counters["wait_seconds"] += waited
+                        # The next ticket may be admissible too
+                        self._cond.notify_all()
+                        return waited
+                self._cond.wait(timeout)
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    # ---------------- CALLS ----------------
+    def retry_delay(self, attempt: int, error: BaseException) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(retry_after, (int, float)) and retry_after > 0:
+            return min(float(retry_after), self.retry_max)
+        delay = min(self.retry_max, self.retry_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.5)
+
+    def call(self, fn: Callable[..., Any], *args, estimated_tokens: int = 0, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self.acquire(estimated_tokens)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                delay = self.retry_delay(attempt, e)
+            finally:
+                self._count("calls")
+                self.release()
+            self._sleep(delay)
+
+    def _count(self, name: str):
+        with self._cond:
+            self._counters[name] += 1
+
+    # ---------------- STATS ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._refill_locked()
+            data = dict(self._counters)
+            data["wait_seconds"] = round(data["wait_seconds"], 3)
+            data.update({
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiting),
+                "waiting_batch": sum(1 for priority, _ in self._waiting if priority == BATCH),
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "max_concurrency": self.max_concurrency,
+                "request_budget": round(self._request_budget, 2),
+                "token_budget": round(self._token_budget),
+            })
+            return data
+
+
+llm_governor = LLMGovernor()
+
+_governed_classes: Dict[type, type] = {}
+
+
+def governed_llm_class(base: type) -> type:
+    """Subclass of a CrewAI-style LLM class whose call() goes through llm_governor."""
+    if base not in _governed_classes:
+        class GovernedLLM(base):
+            def call(self, messages, *args, **kwargs):
+                prompt_tokens = estimate_tokens(messages)
+                response = llm_governor.call(
+                    super().call, messages, *args,
+                    estimated_tokens=prompt_tokens + OUTPUT_TOKENS_ESTIMATE, **kwargs
+                )
+                usage = _usage.get()
+                if usage is not None:
+                    usage["prompt"] += prompt_tokens
+                    usage["completion"] += estimate_tokens(str(response))
+                return response
+
+        _governed_classes[base] = GovernedLLM
+    return _governed_classes[base]
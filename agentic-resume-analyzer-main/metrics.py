@@ -0,0 +1,212 @@
+"""
+Prometheus metrics and per-request stage spans.
+
+A small in-process registry (no client library needed) rendered as
+Prometheus text format on GET /metrics:
+
+    analyzer_http_request_seconds{method,route,status}   histogram
+    analyzer_stage_seconds{stage}                         histogram
+        queue, upload, extract, dedup, compact, role_profile, cache_lookup,
+        revision, crew, format_output
+    analyzer_task_seconds{task}                           histogram
+    analyzer_llm_tokens_total{task,direction}             counter (estimated)
+    analyzer_analyses_total{crew,outcome}                 counter
+    analyzer_output_parse_failures_total{task,reason}     counter
+    analyzer_output_repairs_total{task,outcome}           counter
+    analyzer_<component>_<stat>                           gauges read from the
+        cache, job queue, LLM governor, dedup index, role profile and revision stats()
+
+Spans collects one request's stage durations; with ANALYZER_SERVER_TIMING
+they are also returned as a Server-Timing header.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SERVER_TIMING = os.getenv("ANALYZER_SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+# Seconds; LLM crews run for tens of seconds, local stages for milliseconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _label_text(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labels, key)} {_number(value)}" for key, value in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[slot] += 1
+            series[-1] += value
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        names = self.labels + ("le",)
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(names, key + (_number(bound),))} {cumulative}")
+            labels = _label_text(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_number(round(series[-1], 6))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self, prefix: str = "analyzer"):
+        self.prefix = prefix
+        self._metrics: List[Any] = []
+        self._collectors: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(f"{self.prefix}_{name}", help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(f"{self.prefix}_{name}", help_text, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, component: str, stats: Callable[[], Dict[str, Any]]):
+        """Expose the numeric fields of a component's stats() as gauges, read at scrape time."""
+        self._collectors.append((component, stats))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.lines())
+        for component, stats in self._collectors:
+            for key, value in stats().items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if not isinstance(value, (int, float)):
+                    continue
+                name = f"{self.prefix}_{component}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_SECONDS = registry.histogram(
+    "http_request_seconds", "Time to the response start, per route.", ("method", "route", "status"))
+STAGE_SECONDS = registry.histogram(
+    "stage_seconds", "Time spent in each analysis stage.", ("stage",))
+TASK_SECONDS = registry.histogram(
+    "task_seconds", "Time spent in each crew task.", ("task",))
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "LLM tokens per crew task, estimated from characters.", ("task", "direction"))
+ANALYSES = registry.counter(
+    "analyses_total", "Analyses by crew mode and outcome (llm, cached, reused, prefiltered, local, error).",
+    ("crew", "outcome"))
+OUTPUT_PARSE_FAILURES = registry.counter(
+    "output_parse_failures_total", "Task outputs without a valid JSON payload (no_json, schema).",
+    ("task", "reason"))
+OUTPUT_REPAIRS = registry.counter(
+    "output_repairs_total", "Re-asks for a failed task's JSON (repaired, failed).", ("task", "outcome"))
+
+
+# ============================================================================
+# SPANS
+# ============================================================================
+
+class Spans:
+    """Stage durations of one request; every span is also observed in the histograms."""
+
+    def __init__(self):
+        self.created = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+    @contextmanager
+    def span(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def record_tasks(self, tasks: Dict[str, Dict[str, Any]]):
+        for label, timing in tasks.items():
+            self.stages[f"task.{label}"] = timing["seconds"]
+            TASK_SECONDS.observe(timing["seconds"], task=label)
+            for direction, tokens in (timing.get("tokens") or {}).items():
+                LLM_TOKENS.inc(tokens, task=label, direction=direction)
+
+    def server_timing(self) -> Optional[str]:
+        if not self.stages:
+            return None
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items())
@@ -0,0 +1,139 @@
+"""
+Bulk shortlist ranking with BM25.
+
+Scores many resumes against a job role / job description without any LLM
+call, so the expensive job-fit analysis only runs on the shortlist. Only the
+query's terms matter to BM25, so the sparse document-term matrix is built
+over those columns alone (document lengths still count every token) and
+scoring is a handful of vectorized operations on its non-zeros.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+DEFAULT_TOP_K = 20
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could
+did do does for from had has have having he her his how i if in into is it its just me
+more most my no nor not of on only or other our out over own same she should so some
+such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you
+your ability candidate candidates good excellent strong knowledge looking must plus
+preferred required requirements responsibilities role skills team work working year years
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct, meaningful terms of a job role / description, in order."""
+    seen = {}
+    for token in tokenize(query):
+        # Single letters are noise except the language names
+        if (token not in STOPWORDS and not token.isdigit() and len(token) > 1) or token in ("c", "r"):
+            seen.setdefault(token, None)
+    return list(seen)
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+def build_term_matrix(texts: Sequence[str], vocabulary: Dict[str, int]):
+    """
+    Return (counts, doc_lengths): a CSR matrix of shape (len(texts), len(vocabulary))
+    holding term counts for the vocabulary's terms, and the full token count per text.
+    """
+    indptr = [0]
+    indices: List[int] = []
+    data: List[int] = []
+    doc_lengths = np.empty(len(texts), dtype=np.float64)
+
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        doc_lengths[row] = len(tokens)
+        # Counting every token runs in C; probing the (short) vocabulary afterwards is cheap
+        counts = Counter(tokens)
+        for term, column in vocabulary.items():
+            count = counts.get(term)
+            if count:
+                indices.append(column)
+                data.append(count)
+        indptr.append(len(indices))
+
+    counts = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(texts), len(vocabulary)),
+    )
+    return counts, doc_lengths
+
+
+def bm25_scores(counts, doc_lengths: np.ndarray, k1: float = BM25_K1, b: float = BM25_B) -> np.ndarray:
+    n_docs = counts.shape[0]
+    avg_length = doc_lengths.mean() if n_docs and doc_lengths.any() else 1.0
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log1p((n_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    # Per non-zero: BM25 term weight, using the row's length normalization
+    rows = np.repeat(np.arange(n_docs), np.diff(counts.indptr))
+    tf = counts.data
+    norm = k1 * (1 - b + b * doc_lengths[rows] / avg_length)
+    weights = idf[counts.indices] * tf * (k1 + 1) / (tf + norm)
+    return np.bincount(rows, weights=weights, minlength=n_docs)
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+@dataclass
+class Ranking:
+    terms: List[str]
+    ranked: List[Dict] = field(default_factory=list)
+
+
+def rank_resumes(texts: Sequence[str], query: str, top_k: int = DEFAULT_TOP_K) -> Ranking:
+    """
+    Rank `texts` against `query` and return the `top_k` best, each with its
+    index into `texts`, BM25 score, and matched / missing query terms.
+    """
+    terms = query_terms(query)
+    ranking = Ranking(terms=terms)
+    if not texts or not terms:
+        return ranking
+
+    vocabulary = {term: column for column, term in enumerate(terms)}
+    counts, doc_lengths = build_term_matrix(texts, vocabulary)
+    scores = bm25_scores(counts, doc_lengths)
+
+    top_k = min(max(top_k, 1), len(texts))
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    top = top[np.lexsort((top, -scores[top]))]  # score desc, then upload order
+
+    for position, row in enumerate(top, start=1):
+        present = set(counts.indices[counts.indptr[row]:counts.indptr[row + 1]])
+        ranking.ranked.append({
+            "rank": position,
+            "index": int(row),
+            "score": round(float(scores[row]), 4),
+            "coverage": round(len(present) / len(terms), 3),
+            "matched_keywords": [t for c, t in enumerate(terms) if c in present],
+            "missing_keywords": [t for c, t in enumerate(terms) if c not in present],
+        })
+    return ranking
@@ -0,0 +1,148 @@
+"""
+Content-addressed cache for formatted crew results.
+
+Keys are a hash of the normalized resume text plus the crew mode (and the
+job role for modes that use it). Results live in an in-memory LRU, with an
+optional SQLite tier so they survive restarts and are shared by workers.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CACHE_MEMORY_SIZE = int(os.getenv("ANALYZER_CACHE_SIZE", "256"))
+CACHE_TTL_SECONDS = int(os.getenv("ANALYZER_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_DB_PATH = os.getenv("ANALYZER_CACHE_DB", "")  # empty disables the disk tier
+CACHE_DISK_MAX_ENTRIES = int(os.getenv("ANALYZER_CACHE_DISK_MAX", "10000"))
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def cache_key(resume_text: str, crew_value: str, job_role: Optional[str] = None) -> str:
+    parts = [crew_value, job_role or "", normalize_text(resume_text)]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+# ============================================================================
+# RESULT CACHE
+# ============================================================================
+
+class ResultCache:
+    def __init__(self, max_entries: int = CACHE_MEMORY_SIZE, ttl_seconds: int = CACHE_TTL_SECONDS,
+                 db_path: str = CACHE_DB_PATH, disk_max_entries: int = CACHE_DISK_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_max_entries = disk_max_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed_at)")
+            self._db.commit()
+
+    # ---------------- READ ----------------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = json.loads(row[0]), row[1]
+                    if now - created_at <= self.ttl_seconds:
+                        self._db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._put_memory_locked(key, created_at, value)
+                        self._counters["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._counters["misses"] += 1
+            return None
+
+    # ---------------- WRITE ----------------
+    def set(self, key: str, value: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._put_memory_locked(key, now, value)
+            self._counters["stores"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now),
+                )
+                self._evict_disk_locked(now)
+                self._db.commit()
+
+    def record_bypass(self):
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def _put_memory_locked(self, key: str, created_at: float, value: Dict[str, Any]):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk_locked(self, now: float):
+        self._db.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+        overflow = count - self.disk_max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    # ---------------- STATS ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._counters)
+            data["memory_entries"] = len(self._memory)
+            data["disk_enabled"] = self._db is not None
+            if self._db is not None:
+                (data["disk_entries"],) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+            lookups = data["memory_hits"] + data["disk_hits"] + data["misses"]
+            data["hit_rate"] = round((data["memory_hits"] + data["disk_hits"]) / lookups, 4) if lookups else 0.0
+            return data
+
+
+result_cache = ResultCache()
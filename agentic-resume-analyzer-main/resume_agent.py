@@ -5,73 +5,94 @@ warnings.filterwarnings('ignore')
 # Required installations:
 # !pip install PyMuPDF python-docx crewai crewai-tools google-generativeai python-dotenv
 
-import fitz  # PyMuPDF for PDF processing
-import docx  # python-docx for DOCX processing
+# CrewAI and google-generativeai are imported on first use (see get_llm / get_crew),
+# so importing this module is cheap and works without GEMINI_API_KEY.
+
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import os
-from crewai import Agent, Task, Crew, LLM
-import google.generativeai as genai
+import threading
+from typing import Any, Dict
 from dotenv import load_dotenv
-from typing import Any
+
+from text_extraction import (
+    extract_text_from_pdf, extract_text_from_docx, extract_text_from_resume, extract_text_from_bytes
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Cold-start cost, in seconds, filled in as each stage first runs
+STARTUP_TIMINGS: Dict[str, float] = {}
+
+_registry_lock = threading.RLock()
+_registry: Dict[str, Any] = {}
+
 # ============================================================================
-# TEXT EXTRACTION FUNCTIONS
+# API CONFIGURATION - GEMINI
 # ============================================================================
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
-    with fitz.open(file_path) as doc:
-        for page in doc:
-            page_any: Any = page
-            text += page_any.get_text()
-    return text.strip()
+GEMINI_MODEL = "gemini/gemini-2.5-flash"
 
 
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    return "\n".join(para.text for para in doc.paragraphs)
+def get_gemini_api_key() -> str:
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file")
+    return gemini_api_key
 
 
-def extract_text_from_resume(file_path):
-    if file_path.endswith(".pdf"):
-        return extract_text_from_pdf(file_path)
-    elif file_path.endswith(".docx"):
-        return extract_text_from_docx(file_path)
-    else:
-        return "Unsupported file format."
+def check_llm_config():
+    """Raise ValueError when the selected backend (ANALYZER_LLM_BACKEND) cannot be used."""
+    from llm_backends import LLM_BACKEND, LLM_BACKENDS
 
-# ============================================================================
-# API CONFIGURATION - GEMINI
-# ============================================================================
+    if LLM_BACKEND not in LLM_BACKENDS:
+        raise ValueError(f"Unknown ANALYZER_LLM_BACKEND '{LLM_BACKEND}', expected one of {LLM_BACKENDS}")
+    if LLM_BACKEND == "gemini":
+        get_gemini_api_key()
 
-gemini_api_key = os.getenv('GEMINI_API_KEY')
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file")
 
-genai.configure(api_key=gemini_api_key)
+def get_llm():
+    with _registry_lock:
+        if "llm" not in _registry:
+            check_llm_config()
 
-llm = LLM(
-    model="gemini/gemini-2.5-flash",
-    api_key=gemini_api_key
-)
+            started = time.perf_counter()
+            from crewai import LLM
+            from llm_backends import LLM_BACKEND, stub_llm_class
+            from llm_governor import governed_llm_class
+            STARTUP_TIMINGS["import_crewai_seconds"] = round(time.perf_counter() - started, 4)
+
+            started = time.perf_counter()
+            # Every call goes through the process-wide rate/concurrency governor
+            if LLM_BACKEND == "stub":
+                _registry["llm"] = governed_llm_class(stub_llm_class(LLM))()
+            else:
+                import google.generativeai as genai
+
+                gemini_api_key = get_gemini_api_key()
+                genai.configure(api_key=gemini_api_key)
+                _registry["llm"] = governed_llm_class(LLM)(
+                    model=GEMINI_MODEL,
+                    api_key=gemini_api_key
+                )
+            STARTUP_TIMINGS["llm_init_seconds"] = round(time.perf_counter() - started, 4)
+        return _registry["llm"]
 
 # ============================================================================
 # AGENT 1: ATS SCANNER
 # ============================================================================
 
-ats_scanner = Agent(
+ATS_SCANNER = dict(
     role="ATS Resume Scanner Specialist",
     goal="Perform comprehensive ATS (Applicant Tracking System) scanning of the resume and provide a detailed score out of 100 with specific deductions marked.",
-    llm=llm,
-    verbose=False,
     backstory="""You are an expert ATS system analyzer with deep knowledge of how modern Applicant Tracking Systems parse and score resumes. 
     You understand keyword optimization, formatting issues, section structure, and what makes a resume ATS-friendly. 
     You provide detailed breakdowns of scoring with specific point deductions."""
 )
 
-ats_scanning_task = Task(
+ATS_SCANNING_TASK = dict(
     description="""Perform a comprehensive ATS scan of the resume and provide a detailed score out of 100.
         
         Evaluate the following criteria and assign points:
@@ -140,24 +161,71 @@ JSON FORMAT:
     "recommendations": ["string"]
   }
 }
-------------------------------""",
-    agent=ats_scanner
+------------------------------"""
+)
+
+# Incremental re-scan of a revised resume (see revisions.py): only the
+# criteria that read a changed section are scored again
+ATS_RESCAN_TASK = dict(
+    description="""Update an existing ATS scan for a revised version of the same resume.
+
+        Only these sections changed since the previous scan: {changed_sections}
+        Re-score ONLY these criteria, using the same point scale as a full scan: {rescore_criteria}
+        (Format & Structure /20, Keywords & Skills /25, Work Experience /20, Contact Information /10,
+        Education /10, Action Verbs & Impact /10, Grammar & Spelling /5)
+        The other criteria are unchanged and must not be returned.
+
+        Previous scores, issues and recommendations for those criteria:
+        {previous_ats}
+
+        Changed sections of the revised resume:
+        {changed_text}
+
+        For EACH re-scored criterion:
+        - Assign actual points earned
+        - Specify points deducted and WHY
+        - Provide specific examples from the changed sections
+
+        Then return the full, updated list of critical issues and recommendations for the
+        whole resume: drop the ones the revision fixed and keep the ones it did not touch.""",
+    expected_output="""The re-scored criteria with updated issues and recommendations.
+    ------------------------------
+FINAL OUTPUT FORMAT (MANDATORY)
+
+RETURN THE RESULT STRICTLY IN JSON FORMAT BELOW.
+
+JSON FORMAT:
+
+{
+  "ats_delta": {
+    "detailed_breakdown": [
+      {
+        "section": "Keywords & Skills",
+        "score": "X/25",
+        "points_deducted": number,
+        "reason": "string",
+        "examples": ["string"]
+      }
+    ],
+    "critical_issues": ["string"],
+    "recommendations": ["string"]
+  }
+}
+------------------------------"""
 )
 
 # ============================================================================
 # AGENT 2: RESUME ADVISOR
 # ============================================================================
 
-resume_advisor = Agent(
+RESUME_ADVISOR = dict(
     role="Professional Resume Writer",
     goal="Based on the ATS scan feedback, rewrite and improve the resume to make it ATS-friendly and stand out to recruiters.",
-    llm=llm,
-    verbose=False,
     backstory="""With a strategic mind and an eye for detail, you excel at refining resumes based on ATS feedback. 
     You know how to highlight relevant skills and experiences while ensuring the resume passes ATS systems with high scores."""
 )
 
-resume_advisor_task = Task(
+RESUME_ADVISOR_TASK = dict(
     description="""Rewrite the resume based on the ATS scanning feedback to make it ATS-friendly and stand out for recruiters. 
         
         Focus on:
@@ -184,41 +252,34 @@ JSON FORMAT:
 {
   "resume_markdown": "FULL RESUME IN MARKDOWN FORMAT"
 }
-------------------------------""",
-    context=[ats_scanning_task],
-    agent=resume_advisor
+------------------------------"""
 )
 
 # ============================================================================
 # AGENT 3: JOB ROLE ANALYZER
 # ============================================================================
 
-job_role_analyzer = Agent(
+JOB_ROLE_ANALYZER = dict(
     role="Senior Career Counselor & Job Match Specialist",
     goal="Analyze if the candidate has relevant skills, experience, and qualifications for the specified job role. Provide gap analysis and recommendations.",
-    llm=llm,
-    verbose=False,
     backstory="""You are an experienced career counselor who specializes in matching candidates to job roles. 
     You have deep understanding of various industries and can accurately assess if a candidate's background aligns with job requirements. 
     You provide honest, constructive feedback about skill gaps and career development paths."""
 )
 
-job_role_analysis_task = Task(
-    description= """Analyze the improved resume against the specified job role: {job_role}
-        
-        Provide a comprehensive analysis covering:
+JOB_FIT_ANALYSIS_POINTS = """Provide a comprehensive analysis covering:
         
         1. **Overall Match Score (0-100)**: How well does the candidate fit this role?
         
         2. **Skills Analysis:**
-           - Required skills for {job_role} that candidate HAS
-           - Required skills that candidate is MISSING
+           - Required skills from the profile that candidate HAS
+           - Required skills from the profile that candidate is MISSING
            - Transferable skills from candidate's background
         
         3. **Experience Analysis:**
            - Relevant experience that matches the role
            - Experience gaps or insufficient background areas
-           - Years of experience vs. typical requirements
+           - Years of experience vs. the profile's requirements
         
         4. **Qualifications Analysis:**
            - Educational background fit
@@ -240,8 +301,9 @@ job_role_analysis_task = Task(
         8. **Application Strategy:**
            - Should they apply? (Yes/No/Maybe with conditions)
            - How to position their application
-           - What to emphasize in cover letter""",
-    expected_output="""A comprehensive job role fit analysis report with:
+           - What to emphasize in cover letter"""
+
+JOB_FIT_EXPECTED_OUTPUT = """A comprehensive job role fit analysis report with:
     - Overall match score and verdict
     - Detailed skills gap analysis
     - Experience alignment assessment
@@ -269,35 +331,192 @@ JSON FORMAT:
     "recommendations": ["string"]
   }
 }
-------------------------------""",
-    context=[resume_advisor_task],
-    agent=job_role_analyzer
-)
+------------------------------"""
 
-# ============================================================================
-# CREW SETUP
-# ============================================================================
+# Filled from the role-profile store (role_profiles.py), so requirements are derived once per role
+ROLE_PROFILE_CONTEXT = """Requirement profile for {job_role}, shared by every candidate for this role.
+        Use it as the definitive statement of what the role requires; do not re-derive the requirements:
+        {role_profile}"""
 
-full_crew = Crew(
-    agents=[ats_scanner, resume_advisor, job_role_analyzer],
-    tasks=[ats_scanning_task, resume_advisor_task, job_role_analysis_task],
-    verbose=False,
-    show_tasks=False
+JOB_ROLE_ANALYSIS_TASK = dict(
+    description="""Analyze the improved resume against the specified job role: {job_role}
+        
+        """ + ROLE_PROFILE_CONTEXT + """
+        
+        """ + JOB_FIT_ANALYSIS_POINTS,
+    expected_output=JOB_FIT_EXPECTED_OUTPUT
 )
 
-min_crew = Crew(
-    agents=[ats_scanner, resume_advisor],
-    tasks=[ats_scanning_task, resume_advisor_task],
-    verbose=False,
-    show_tasks=False
+# Fast-full variant: matches the original resume so it can run alongside the ATS scan
+JOB_FIT_ORIGINAL_TASK = dict(
+    description="""Analyze the resume against the specified job role: {job_role}
+        
+        """ + ROLE_PROFILE_CONTEXT + """
+        
+        """ + JOB_FIT_ANALYSIS_POINTS + """
+        
+        This is the resume: {resume}""",
+    expected_output=JOB_FIT_EXPECTED_OUTPUT
 )
-only_ats_crew = Crew(
-    agents=[ats_scanner],
-    tasks=[ats_scanning_task],
-    verbose=False,
-    show_tasks=False
+
+# Run once per job role; the result is stored and injected as {role_profile}
+ROLE_PROFILE_TASK = dict(
+    description="""Build a requirement profile for the job role: {job_role}
+        
+        Describe what employers typically require when hiring for this role,
+        independent of any particular candidate:
+        - Must-have technical and domain skills
+        - Nice-to-have skills
+        - Typical minimum years of experience and seniority
+        - Core responsibilities
+        - Expected education and certifications
+        - Keywords recruiters and ATS systems screen for""",
+    expected_output="""A concise, structured requirement profile.
+    ------------------------------
+FINAL OUTPUT FORMAT (MANDATORY)
+
+RETURN THE PROFILE STRICTLY IN JSON FORMAT:
+
+{
+  "role_profile": {
+    "job_role": "string",
+    "must_have_skills": ["string"],
+    "nice_to_have_skills": ["string"],
+    "min_years_experience": "string",
+    "seniority": "string",
+    "responsibilities": ["string"],
+    "education": ["string"],
+    "certifications": ["string"],
+    "keywords": ["string"]
+  }
+}
+------------------------------"""
 )
 
+# Payload key -> task whose expected_output defines that JSON (used to re-ask for it)
+OUTPUT_FORMAT_TASKS = {
+    "ats": ATS_SCANNING_TASK,
+    "ats_delta": ATS_RESCAN_TASK,
+    "resume_markdown": RESUME_ADVISOR_TASK,
+    "job_fit": JOB_ROLE_ANALYSIS_TASK,
+    "role_profile": ROLE_PROFILE_TASK,
+}
+
+
+def output_json_format(section: str) -> str:
+    """The JSON FORMAT block of the task that produces `section`."""
+    expected_output = OUTPUT_FORMAT_TASKS[section]["expected_output"]
+    return expected_output.rsplit("JSON FORMAT", 1)[1].split("------", 1)[0].lstrip(":").strip()
+
+# ============================================================================
+# CREW SETUP (built lazily, once, on first use)
+# ============================================================================
+
+# Task name -> (task spec, agent name, context task names)
+TASK_LAYOUT = {
+    "ats_scanning_task": (ATS_SCANNING_TASK, "ats_scanner", ()),
+    "resume_advisor_task": (RESUME_ADVISOR_TASK, "resume_advisor", ("ats_scanning_task",)),
+    "job_role_analysis_task": (JOB_ROLE_ANALYSIS_TASK, "job_role_analyzer", ("resume_advisor_task",)),
+    "job_fit_original_task": (JOB_FIT_ORIGINAL_TASK, "job_role_analyzer", ()),
+    "role_profile_task": (ROLE_PROFILE_TASK, "job_role_analyzer", ()),
+    # Incremental variants: the rewrite and job fit read the re-scan instead of a full scan
+    "ats_rescan_task": (ATS_RESCAN_TASK, "ats_scanner", ()),
+    "resume_advisor_rescan_task": (RESUME_ADVISOR_TASK, "resume_advisor", ("ats_rescan_task",)),
+    "job_role_analysis_rescan_task": (JOB_ROLE_ANALYSIS_TASK, "job_role_analyzer", ("resume_advisor_rescan_task",)),
+}
+
+AGENT_SPECS = {
+    "ats_scanner": ATS_SCANNER,
+    "resume_advisor": RESUME_ADVISOR,
+    "job_role_analyzer": JOB_ROLE_ANALYZER,
+}
+
+CREW_LAYOUT = {
+    "full": ("ats_scanning_task", "resume_advisor_task", "job_role_analysis_task"),
+    "minimal": ("ats_scanning_task", "resume_advisor_task"),
+    "ats": ("ats_scanning_task",),
+    # Second branch of the "fast_full" mode, run concurrently with "minimal"
+    "job_fit": ("job_fit_original_task",),
+    # Derives the per-role requirement profile (see role_profiles.py)
+    "role_profile": ("role_profile_task",),
+    # Revisions of a known resume (see revisions.py)
+    "ats_delta": ("ats_rescan_task",),
+    "minimal_delta": ("ats_rescan_task", "resume_advisor_rescan_task"),
+    "full_delta": ("ats_rescan_task", "resume_advisor_rescan_task", "job_role_analysis_rescan_task"),
+}
+
+# Module attributes kept for existing imports (`from resume_agent import full_crew`)
+LEGACY_CREW_NAMES = {
+    "full_crew": "full",
+    "min_crew": "minimal",
+    "only_ats_crew": "ats",
+    "job_fit_crew": "job_fit",
+}
+
+
+def _get_agent(name: str):
+    key = f"agent:{name}"
+    if key not in _registry:
+        from crewai import Agent
+        _registry[key] = Agent(llm=get_llm(), verbose=False, **AGENT_SPECS[name])
+    return _registry[key]
+
+
+def _get_task(name: str):
+    key = f"task:{name}"
+    if key not in _registry:
+        from crewai import Task
+        spec, agent_name, context = TASK_LAYOUT[name]
+        kwargs = dict(spec, agent=_get_agent(agent_name))
+        if context:
+            kwargs["context"] = [_get_task(dep) for dep in context]
+        _registry[key] = Task(**kwargs)
+    return _registry[key]
+
+
+def get_crew(name: str):
+    with _registry_lock:
+        key = f"crew:{name}"
+        if key not in _registry:
+            from crewai import Crew
+            started = time.perf_counter()
+            tasks = [_get_task(task_name) for task_name in CREW_LAYOUT[name]]
+            agents = []
+            for task in tasks:
+                if not any(task.agent is agent for agent in agents):
+                    agents.append(task.agent)
+            _registry[key] = Crew(
+                agents=agents,
+                tasks=tasks,
+                verbose=False,
+                show_tasks=False
+            )
+            STARTUP_TIMINGS[f"build_{name}_crew_seconds"] = round(time.perf_counter() - started, 4)
+        return _registry[key]
+
+
+def warmup():
+    """Build the LLM client and every crew up front (used by ANALYZER_WARMUP)."""
+    started = time.perf_counter()
+    for name in CREW_LAYOUT:
+        get_crew(name)
+    STARTUP_TIMINGS["warmup_seconds"] = round(time.perf_counter() - started, 4)
+
+
+def is_warm() -> bool:
+    return all(f"crew:{name}" in _registry for name in CREW_LAYOUT)
+
+
+def __getattr__(name: str):
+    if name in LEGACY_CREW_NAMES:
+        return get_crew(LEGACY_CREW_NAMES[name])
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+STARTUP_TIMINGS["import_resume_agent_seconds"] = round(time.perf_counter() - _IMPORT_STARTED, 4)
+
 # ============================================================================
 # EXECUTION
 # ============================================================================
@@ -306,11 +525,14 @@ if __name__ == "__main__":
     resume_path = ""
     resume_text = extract_text_from_resume(resume_path)
 
-    crew_to_run = full_crew  # change to full_crew if needed
+    from role_profiles import role_profiles
+
+    crew_to_run = get_crew("full")  # change to get_crew("minimal") if needed
 
     raw_result = crew_to_run.kickoff(inputs={
         "resume": resume_text,
-        "job_role": "Software Developer"
+        "job_role": "Software Developer",
+        "role_profile": role_profiles.prompt_text("Software Developer")
     })
 
     print("\n==================== FINAL RESULT ====================\n")
@@ -0,0 +1,277 @@
+"""
+Incremental re-analysis of revised resumes.
+
+With a candidate_id, every analysis that produced an LLM ATS report stores
+the resume's per-section hashes and that report (in SQLite, or in memory).
+When the same candidate sends a revision, its sections are diffed against
+the stored version and only the ATS criteria that read a changed section
+are re-scored by the ats_rescan task, given just the changed sections; the
+rest of the breakdown is reused and the overall score is adjusted by the
+difference. Resumes that changed too much get a full scan.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ats_rules import CRITERIA
+from compaction import split_sections
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+REVISIONS_ENABLED = os.getenv("ANALYZER_REVISIONS", "true").lower() in ("1", "true", "yes")
+REVISION_DB_PATH = os.getenv("ANALYZER_REVISION_DB", "")  # empty = memory only
+# Above this share of changed sections a revision gets a full ATS scan
+INCREMENTAL_MAX_CHANGED = float(os.getenv("ANALYZER_INCREMENTAL_MAX_CHANGED", "0.5"))
+
+LAYOUT = "layout"  # criterion re-scored when sections are added, removed or reordered
+ANY_CHANGE = "any"  # criterion re-scored when any section changed
+
+# ATS criterion -> resume sections it is scored from (split_sections names)
+CRITERION_SECTIONS = {
+    "Format & Structure": LAYOUT,
+    "Keywords & Skills": ("skills", "experience", "projects", "summary", "certifications"),
+    "Work Experience": ("experience", "projects"),
+    "Contact Information": ("header", "personal_details"),
+    "Education": ("education", "certifications"),
+    "Action Verbs & Impact": ("experience", "projects", "summary"),
+    "Grammar & Spelling": ANY_CHANGE,
+}
+
+SCORE_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def resume_sections(text: str) -> Dict[str, str]:
+    """Section name -> text (heading included), in resume order; repeated headings merge."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    sections: Dict[str, List[str]] = {}
+    for name, body in split_sections(lines):
+        sections.setdefault(name, []).extend(body)
+    return {name: "\n".join(body) for name, body in sections.items()}
+
+
+def section_hash(text: str) -> str:
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()[:16]
+
+
+def _points(score: Any) -> Optional[float]:
+    match = SCORE_RE.search(str(score))
+    return float(match.group()) if match else None
+
+
+def _format_points(points: float) -> str:
+    return f"{points:g}"
+
+
+@dataclass
+class RevisionPlan:
+    candidate_id: str
+    revision: int
+    changed_sections: List[str]
+    rescore: List[str]
+    previous_ats: Dict[str, Any]
+    changed_text: str
+
+    def inputs(self) -> Dict[str, str]:
+        """Prompt inputs of the ats_rescan task."""
+        items = [i for i in self.previous_ats.get("detailed_breakdown", []) if i.get("section") in self.rescore]
+        previous = {
+            "detailed_breakdown": items,
+            "critical_issues": self.previous_ats.get("critical_issues", []),
+            "recommendations": self.previous_ats.get("recommendations", []),
+        }
+        return {
+            "changed_sections": ", ".join(self.changed_sections),
+            "rescore_criteria": "; ".join(self.rescore),
+            "previous_ats": json.dumps(previous, ensure_ascii=False),
+            "changed_text": self.changed_text,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "candidate_id": self.candidate_id,
+            "revision": self.revision,
+            "changed_sections": self.changed_sections,
+            "rescored": self.rescore,
+            "reused": [name for name, _ in CRITERIA if name not in self.rescore],
+        }
+
+
+def affected_criteria(changed: List[str], layout_changed: bool) -> List[str]:
+    rescore = []
+    for name, _ in CRITERIA:
+        sections = CRITERION_SECTIONS[name]
+        if sections == LAYOUT:
+            hit = layout_changed
+        elif sections == ANY_CHANGE:
+            hit = bool(changed)
+        else:
+            hit = any(section in sections for section in changed)
+        if hit:
+            rescore.append(name)
+    return rescore
+
+
+def merge_ats(plan: RevisionPlan, delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    {"ats": full report, "incremental": summary}: the previous breakdown with
+    the re-scored criteria swapped in and the overall score moved by their difference.
+    """
+    previous = plan.previous_ats
+    items = {item.get("section"): item for item in previous.get("detailed_breakdown", [])}
+    total = _points(previous.get("overall_score"))
+    rescored = []
+    for item in delta.get("detailed_breakdown", []):
+        name = next((c for c in plan.rescore if c.lower() == str(item.get("section", "")).lower()), None)
+        if name is None:
+            continue
+        old, new = _points(items.get(name, {}).get("score")), _points(item.get("score"))
+        if total is not None and new is not None:
+            total += new - (old or 0)
+        items[name] = {**item, "section": name}
+        rescored.append(name)
+
+    ordered = [items[name] for name, _ in CRITERIA if name in items]
+    ordered += [item for name, item in items.items() if name not in dict(CRITERIA)]
+    report = {
+        **previous,
+        "overall_score": f"{_format_points(max(0.0, min(100.0, total)))}/100" if total is not None
+        else previous.get("overall_score"),
+        "detailed_breakdown": ordered,
+        "critical_issues": delta.get("critical_issues", previous.get("critical_issues", [])),
+        "recommendations": delta.get("recommendations", previous.get("recommendations", [])),
+    }
+    summary = {**plan.summary(), "rescored": rescored,
+               "reused": [name for name, _ in CRITERIA if name not in rescored]}
+    return {"ats": report, "incremental": summary}
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class RevisionStore:
+    def __init__(self, db_path: str = REVISION_DB_PATH, max_changed: float = INCREMENTAL_MAX_CHANGED):
+        self.max_changed = max_changed
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"stored": 0, "incremental": 0, "full": 0, "rescored_criteria": 0,
+                          "reused_criteria": 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS revisions ("
+                "candidate_id TEXT PRIMARY KEY, revision INTEGER NOT NULL, sections TEXT NOT NULL, "
+                "ats TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    # ---------------- READ ----------------
+    def get(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """Latest stored revision ({candidate_id, revision, sections, ats, updated_at}) or None."""
+        with self._lock:
+            if self._db is None:
+                return self._memory.get(candidate_id)
+            row = self._db.execute(
+                "SELECT revision, sections, ats, updated_at FROM revisions WHERE candidate_id = ?",
+                (candidate_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"candidate_id": candidate_id, "revision": row[0], "sections": json.loads(row[1]),
+                "ats": json.loads(row[2]), "updated_at": row[3]}
+
+    def plan(self, candidate_id: str, resume_text: str) -> Optional[RevisionPlan]:
+        """What to re-score for this revision; None means a full ATS scan."""
+        if not REVISIONS_ENABLED or not candidate_id:
+            return None
+        current = resume_sections(resume_text)
+        hashes = [(name, section_hash(text)) for name, text in current.items()]
+        previous = self.get(candidate_id)
+        plan = None
+        if previous is not None:
+            before = dict(map(tuple, previous["sections"]))
+            after = dict(hashes)
+            changed = [name for name, digest in hashes if before.get(name) != digest]
+            changed += [name for name in before if name not in after]
+            layout_changed = [name for name, _ in hashes] != [name for name, _ in previous["sections"]]
+            rescore = affected_criteria(changed, layout_changed)
+            # Criteria the previous report lacks cannot be reused
+            known = {item.get("section") for item in previous["ats"].get("detailed_breakdown", [])}
+            rescore = [name for name, _ in CRITERIA if name in rescore or name not in known]
+            if changed and len(changed) <= self.max_changed * max(len(after), len(before)) \
+                    and len(rescore) < len(CRITERIA) and _points(previous["ats"].get("overall_score")) is not None:
+                changed_text = "\n\n".join(
+                    current[name] if name in current else f"{name}: (section removed)" for name in changed
+                )
+                plan = RevisionPlan(candidate_id, previous["revision"] + 1, changed, rescore,
+                                    previous["ats"], changed_text)
+        with self._lock:
+            if plan is None:
+                self._counters["full"] += 1
+            else:
+                self._counters["incremental"] += 1
+                self._counters["rescored_criteria"] += len(plan.rescore)
+                self._counters["reused_criteria"] += len(CRITERIA) - len(plan.rescore)
+        return plan
+
+    # ---------------- WRITE ----------------
+    def record(self, candidate_id: str, resume_text: str, ats_report: Dict[str, Any]):
+        """Store this version and its (LLM) ATS report as the candidate's latest."""
+        if not REVISIONS_ENABLED or not candidate_id or not ats_report:
+            return
+        sections = [(name, section_hash(text)) for name, text in resume_sections(resume_text).items()]
+        previous = self.get(candidate_id)
+        entry = {
+            "candidate_id": candidate_id,
+            "revision": previous["revision"] + 1 if previous else 1,
+            "sections": sections,
+            "ats": ats_report,
+            "updated_at": time.time(),
+        }
+        with self._lock:
+            self._counters["stored"] += 1
+            if self._db is None:
+                self._memory[candidate_id] = entry
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO revisions (candidate_id, revision, sections, ats, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (candidate_id, entry["revision"], json.dumps(sections), json.dumps(ats_report), entry["updated_at"]),
+            )
+            self._db.commit()
+
+    def forget(self, candidate_id: str) -> bool:
+        with self._lock:
+            removed = self._memory.pop(candidate_id, None) is not None
+            if self._db is not None:
+                removed = self._db.execute(
+                    "DELETE FROM revisions WHERE candidate_id = ?", (candidate_id,)
+                ).rowcount > 0 or removed
+                self._db.commit()
+            return removed
+
+    # ---------------- STATS ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._counters)
+            data["enabled"] = REVISIONS_ENABLED
+            data["disk_enabled"] = self._db is not None
+            if self._db is not None:
+                (data["candidates"],) = self._db.execute("SELECT COUNT(*) FROM revisions").fetchone()
+            else:
+                data["candidates"] = len(self._memory)
+            return data
+
+
+revisions = RevisionStore()
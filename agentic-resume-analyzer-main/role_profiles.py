@@ -0,0 +1,229 @@
+"""
+Per-job-role requirement profiles.
+
+The job-fit tasks compare a resume against what {job_role} requires. Instead
+of having the LLM work that out again for every candidate, a structured
+requirement profile is derived once per role (role_profile crew), kept in
+memory (and in SQLite when ANALYZER_ROLE_PROFILE_DB is set), and injected
+into the job-fit prompts as {role_profile}. Profiles stay until explicitly
+invalidated (or until the optional TTL passes), so every candidate for a
+role is judged against the same requirements. A failed derivation is
+remembered for a short while, so requests for that role do not each pay
+for another failing LLM call.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from structured_output import OUTPUT_REPAIR, parse_task_output, repair_task_output
+
+logger = logging.getLogger("resume_analyzer")
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ROLE_PROFILES_ENABLED = os.getenv("ANALYZER_ROLE_PROFILES", "true").lower() in ("1", "true", "yes")
+ROLE_PROFILE_DB_PATH = os.getenv("ANALYZER_ROLE_PROFILE_DB", "")  # empty = memory only
+ROLE_PROFILE_TTL_SECONDS = int(os.getenv("ANALYZER_ROLE_PROFILE_TTL", "0"))  # 0 = until invalidated
+# After a failed derivation, the role is answered with NO_PROFILE for this long before trying again
+ROLE_PROFILE_RETRY_SECONDS = int(os.getenv("ANALYZER_ROLE_PROFILE_RETRY", "300"))
+
+# Used when profiles are disabled or derivation failed; the task then infers requirements itself
+NO_PROFILE = "Not available - infer the typical requirements of the role yourself."
+
+
+class RoleProfileUnavailable(Exception):
+    """Raised while a role's last derivation failed less than ROLE_PROFILE_RETRY_SECONDS ago."""
+
+
+def role_key(job_role: str) -> str:
+    return " ".join((job_role or "").lower().split())
+
+
+def derive_with_llm(job_role: str) -> Dict[str, Any]:
+    from resume_agent import get_crew
+
+    result = get_crew("role_profile").copy().kickoff(inputs={"job_role": job_role})
+    outputs = getattr(result, "tasks_output", None) or [result]
+    text = str(outputs[-1])
+    payload = parse_task_output(text, "role_profile", task="role_profile")
+    if payload is None and OUTPUT_REPAIR:
+        payload = repair_task_output("role_profile", "role_profile", text)
+    if payload is None:
+        raise ValueError(f"No valid role profile JSON in the output for '{job_role}'")
+    return payload["role_profile"]
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class RoleProfileStore:
+    def __init__(self, db_path: str = ROLE_PROFILE_DB_PATH, ttl_seconds: int = ROLE_PROFILE_TTL_SECONDS,
+                 derive: Callable[[str], Dict[str, Any]] = derive_with_llm,
+                 retry_seconds: int = ROLE_PROFILE_RETRY_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.derive = derive
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        # role key -> (failed_at, error) of the last failed derivation
+        self._failures: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        # One lock per role so concurrent requests for a new role derive it once
+        self._role_locks: Dict[str, threading.Lock] = {}
+        self._counters = {"hits": 0, "derived": 0, "failures": 0, "skipped_after_failure": 0, "invalidated": 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS role_profiles ("
+                "role_key TEXT PRIMARY KEY, job_role TEXT NOT NULL, "
+                "profile TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return bool(self.ttl_seconds) and time.time() - entry["created_at"] > self.ttl_seconds
+
+    def _role_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._role_locks.setdefault(key, threading.Lock())
+
+    # ---------------- READ ----------------
+    def get(self, job_role: str) -> Optional[Dict[str, Any]]:
+        """Stored entry ({job_role, profile, created_at, version}) or None; never derives."""
+        key = role_key(job_role)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT job_role, profile, created_at FROM role_profiles WHERE role_key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = self._entry(row[0], json.loads(row[1]), row[2])
+                    self._memory[key] = entry
+            if entry is not None and self._expired(entry):
+                self._delete_locked(key)
+                entry = None
+            return entry
+
+    def get_or_derive(self, job_role: str) -> Dict[str, Any]:
+        entry = self.get(job_role)
+        if entry is not None:
+            with self._lock:
+                self._counters["hits"] += 1
+            return entry
+
+        key = role_key(job_role)
+        with self._role_lock(key):
+            # Another request may have derived it while we waited
+            entry = self.get(job_role)
+            if entry is not None:
+                with self._lock:
+                    self._counters["hits"] += 1
+                return entry
+            with self._lock:
+                failed_at, error = self._failures.get(key, (None, None))
+                if failed_at is not None and time.time() - failed_at < self.retry_seconds:
+                    self._counters["skipped_after_failure"] += 1
+                    raise RoleProfileUnavailable(f"Derivation failed {time.time() - failed_at:.0f}s ago: {error}")
+            try:
+                profile = self.derive(job_role)
+            except Exception as e:
+                with self._lock:
+                    self._counters["failures"] += 1
+                    self._failures[key] = (time.time(), str(e) or e.__class__.__name__)
+                raise
+            return self.set(job_role, profile, derived=True)
+
+    def prompt_text(self, job_role: str) -> str:
+        """The {role_profile} prompt input: the stored profile as JSON, deriving it if needed."""
+        if not ROLE_PROFILES_ENABLED:
+            return NO_PROFILE
+        try:
+            return json.dumps(self.get_or_derive(job_role)["profile"], ensure_ascii=False)
+        except Exception as e:
+            logger.warning("Role profile for '%s' unavailable: %s", job_role, e)
+            return NO_PROFILE
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._db is not None:
+                rows = self._db.execute(
+                    "SELECT job_role, profile, created_at FROM role_profiles ORDER BY created_at"
+                ).fetchall()
+                entries = [self._entry(r[0], json.loads(r[1]), r[2]) for r in rows]
+            else:
+                entries = sorted(self._memory.values(), key=lambda e: e["created_at"])
+        return [e for e in entries if not self._expired(e)]
+
+    # ---------------- WRITE ----------------
+    def set(self, job_role: str, profile: Dict[str, Any], derived: bool = False) -> Dict[str, Any]:
+        entry = self._entry(job_role, profile, time.time())
+        with self._lock:
+            self._memory[role_key(job_role)] = entry
+            self._failures.pop(role_key(job_role), None)
+            if derived:
+                self._counters["derived"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO role_profiles (role_key, job_role, profile, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (role_key(job_role), job_role, json.dumps(profile), entry["created_at"]),
+                )
+                self._db.commit()
+        return entry
+
+    def invalidate(self, job_role: str) -> bool:
+        """Drop the stored profile, or the failure that blocks re-deriving it."""
+        with self._lock:
+            failed = self._failures.pop(role_key(job_role), None) is not None
+            removed = self._delete_locked(role_key(job_role)) or failed
+            if removed:
+                self._counters["invalidated"] += 1
+            return removed
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._memory)
+            self._memory.clear()
+            self._failures.clear()
+            if self._db is not None:
+                count = self._db.execute("DELETE FROM role_profiles").rowcount
+                self._db.commit()
+            self._counters["invalidated"] += count
+            return count
+
+    def _delete_locked(self, key: str) -> bool:
+        removed = self._memory.pop(key, None) is not None
+        if self._db is not None:
+            removed = self._db.execute("DELETE FROM role_profiles WHERE role_key = ?", (key,)).rowcount > 0 or removed
+            self._db.commit()
+        return removed
+
+    @staticmethod
+    def _entry(job_role: str, profile: Dict[str, Any], created_at: float) -> Dict[str, Any]:
+        # Short content hash so clients can tell a re-derived profile apart
+        version = hashlib.sha256(json.dumps(profile, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        return {"job_role": job_role, "profile": profile, "created_at": created_at, "version": version}
+
+    # ---------------- STATS ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._counters)
+            data["enabled"] = ROLE_PROFILES_ENABLED
+            data["memory_entries"] = len(self._memory)
+            data["failing_roles"] = len(self._failures)
+            data["disk_enabled"] = self._db is not None
+            return data
+
+
+role_profiles = RoleProfileStore()
@@ -0,0 +1,374 @@
+"""
+Structured task outputs.
+
+Each crew task ends its answer with one JSON payload ({"ats": ...},
+{"ats_delta": ...}, {"resume_markdown": ...}, {"job_fit": ...},
+{"role_profile": ...}).
+This module finds that payload in the raw task text and validates it
+against a typed model:
+
+- extract_json decodes the first JSON object at each "{" in C (raw_decode
+  ignores whatever follows the object), so code fences, "Final Answer:"
+  prefixes, prose before or after and braces in resume text do not break
+  it and raw newlines inside strings are accepted. Only when that finds
+  nothing does a single-pass balanced-brace scan retry with trailing
+  commas removed.
+- The payload models coerce the usual LLM slips (numbers for "X/100"
+  scores, a string where a list is expected) and keep any extra fields.
+- repair_task_output re-asks the LLM for just the JSON of one failed task,
+  so a malformed answer does not cost a whole crew re-run.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+
+from metrics import OUTPUT_PARSE_FAILURES, OUTPUT_REPAIRS
+
+logger = logging.getLogger("resume_analyzer")
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+OUTPUT_REPAIR = os.getenv("ANALYZER_OUTPUT_REPAIR", "true").lower() in ("1", "true", "yes")
+OUTPUT_REPAIR_ATTEMPTS = int(os.getenv("ANALYZER_OUTPUT_REPAIR_ATTEMPTS", "1"))
+# Longest failed output sent back in a repair prompt
+REPAIR_MAX_CHARS = int(os.getenv("ANALYZER_OUTPUT_REPAIR_MAX_CHARS", "24000"))
+
+REPAIR_MARKER = "Convert the task output below into JSON"
+REPAIR_OUTPUT_MARKER = "TASK OUTPUT:"
+REPAIR_PROMPT = REPAIR_MARKER + """ with the top-level key "{section}".
+Keep every detail it contains; do not add new analysis.
+Return ONLY the JSON object, no markdown fences, in exactly this format:
+
+{json_format}
+
+""" + REPAIR_OUTPUT_MARKER + """
+{output}"""
+
+# ============================================================================
+# JSON EXTRACTION
+# ============================================================================
+
+# strict=False: LLMs put raw newlines inside markdown strings
+_DECODER = json.JSONDecoder(strict=False)
+# Only these characters change the scanner's state, so it jumps between them
+_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+# Where an object can start: "{" then a key or "}" ({job_role}-style prose is skipped)
+_OBJECT_START_RE = re.compile(r'\{\s*["}]')
+# Failed decodes are O(position) (the error computes a line number), so stop early
+MAX_DECODE_FAILURES = 8
+
+
+def _decoded_objects(text: str) -> Iterator[Any]:
+    """Yield each JSON value that decodes at an object start, skipping past it once decoded."""
+    end, failures = 0, 0
+    for match in _OBJECT_START_RE.finditer(text):
+        if match.start() < end:
+            continue
+        try:
+            value, end = _DECODER.raw_decode(text, match.start())
+        except ValueError:
+            failures += 1
+            if failures >= MAX_DECODE_FAILURES:
+                return
+            continue
+        yield value
+
+
+def _balanced_objects(text: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) of each top-level {...} span, ignoring braces inside JSON strings."""
+    stack: List[int] = []  # positions of open "{"
+    # Closed spans directly inside a still-open "{"; a parent that closes covers them
+    children: Dict[int, List[Tuple[int, int]]] = {}
+    in_string, skip = False, -1
+    for match in _STRUCTURAL_RE.finditer(text):
+        pos = match.start()
+        if pos == skip:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                skip = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == "{":
+            stack.append(pos)
+        elif not stack:
+            continue  # quotes and braces in prose outside any object
+        elif char == '"':
+            in_string = True
+        elif char == "}":
+            start = stack.pop()
+            children.pop(start, None)
+            if stack:
+                children.setdefault(stack[-1], []).append((start, pos + 1))
+            else:
+                yield start, pos + 1
+    # An unclosed "{" (prose, or a cut-off answer) hid the objects inside it
+    for start in stack:
+        yield from children.get(start, ())
+
+
+def _lenient_objects(text: str) -> Iterator[Any]:
+    for start, end in _balanced_objects(text):
+        try:
+            yield _DECODER.decode(_TRAILING_COMMA_RE.sub(r"\1", text[start:end]))
+        except ValueError:
+            continue
+
+
+def extract_json(text: str, keys: Tuple[str, ...] = ()) -> Optional[Dict[str, Any]]:
+    """
+    First JSON object in `text` containing one of `keys` (any object when
+    keys is empty). Falls back to the first object found at all.
+    """
+    fallback = None
+    for candidates in (_decoded_objects(text), _lenient_objects(text)):
+        for parsed in candidates:
+            if not isinstance(parsed, dict):
+                continue
+            if not keys or any(key in parsed for key in keys):
+                return parsed
+            if fallback is None:
+                fallback = parsed
+        if fallback is not None:
+            return fallback
+    return None
+
+
+# ============================================================================
+# PAYLOAD MODELS
+# ============================================================================
+
+def _as_text(value: Any) -> Any:
+    if isinstance(value, list):
+        return "; ".join(str(item) for item in value)
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "" if value is None else value
+
+
+def _as_list(value: Any) -> Any:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, list):
+        return [item if isinstance(item, str) else json.dumps(item) for item in value]
+    return value
+
+
+def _as_score(value: Any, out_of: int = 100) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return f"{value:g}/{out_of}"
+    return value
+
+
+class _Payload(BaseModel):
+    # Extra fields are kept: the full ATS report must not lose anything the model added
+    model_config = ConfigDict(extra="allow")
+
+
+class ATSBreakdownItem(_Payload):
+    section: str
+    score: str
+    points_deducted: Union[int, float] = 0
+    reason: str = ""
+    examples: List[str] = []
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def _score(cls, value):
+        return _as_text(value)
+
+    @field_validator("points_deducted", mode="before")
+    @classmethod
+    def _points(cls, value):
+        if isinstance(value, str):
+            match = re.search(r"-?\d+(?:\.\d+)?", value)
+            if not match:
+                return 0
+            number = float(match.group())
+            return int(number) if number.is_integer() else number
+        return 0 if value is None else value
+
+    @field_validator("reason", mode="before")
+    @classmethod
+    def _reason(cls, value):
+        return _as_text(value)
+
+    @field_validator("examples", mode="before")
+    @classmethod
+    def _examples(cls, value):
+        return _as_list(value)
+
+
+class ATSReport(_Payload):
+    overall_score: str
+    detailed_breakdown: List[ATSBreakdownItem] = []
+    critical_issues: List[str] = []
+    recommendations: List[str] = []
+
+    @field_validator("overall_score", mode="before")
+    @classmethod
+    def _overall(cls, value):
+        return _as_score(value)
+
+    @field_validator("critical_issues", "recommendations", mode="before")
+    @classmethod
+    def _lists(cls, value):
+        return _as_list(value)
+
+
+class JobFit(_Payload):
+    job_role: str = ""
+    match_score: str
+    verdict: str = ""
+    strengths: List[str] = []
+    gaps: List[str] = []
+    recommendations: List[str] = []
+
+    @field_validator("match_score", mode="before")
+    @classmethod
+    def _match(cls, value):
+        return _as_score(value)
+
+    @field_validator("strengths", "gaps", "recommendations", mode="before")
+    @classmethod
+    def _lists(cls, value):
+        return _as_list(value)
+
+
+class RoleProfile(_Payload):
+    job_role: str = ""
+    must_have_skills: List[str] = []
+    nice_to_have_skills: List[str] = []
+    min_years_experience: str = ""
+    seniority: str = ""
+    responsibilities: List[str] = []
+    education: List[str] = []
+    certifications: List[str] = []
+    keywords: List[str] = []
+
+    @field_validator("min_years_experience", "seniority", mode="before")
+    @classmethod
+    def _texts(cls, value):
+        return _as_text(value)
+
+    @field_validator("must_have_skills", "nice_to_have_skills", "responsibilities", "education",
+                     "certifications", "keywords", mode="before")
+    @classmethod
+    def _lists(cls, value):
+        return _as_list(value)
+
+
+class ATSDelta(_Payload):
+    """Re-scored criteria of a revised resume (revisions.py)."""
+    # Required, so a stray object from a cut-off answer is not taken for an empty re-scan
+    detailed_breakdown: List[ATSBreakdownItem]
+    critical_issues: List[str] = []
+    recommendations: List[str] = []
+
+    @field_validator("critical_issues", "recommendations", mode="before")
+    @classmethod
+    def _lists(cls, value):
+        return _as_list(value)
+
+
+class ATSPayload(BaseModel):
+    ats: ATSReport
+
+
+class ATSDeltaPayload(BaseModel):
+    ats_delta: ATSDelta
+
+
+class ResumeMarkdownPayload(BaseModel):
+    resume_markdown: str
+
+
+class JobFitPayload(BaseModel):
+    job_fit: JobFit
+
+
+class RoleProfilePayload(BaseModel):
+    role_profile: RoleProfile
+
+
+SECTION_MODELS: Dict[str, Type[BaseModel]] = {
+    "ats": ATSPayload,
+    "ats_delta": ATSDeltaPayload,
+    "resume_markdown": ResumeMarkdownPayload,
+    "job_fit": JobFitPayload,
+    "role_profile": RoleProfilePayload,
+}
+
+# Sections whose payload is an object (resume_markdown is a string)
+OBJECT_SECTIONS = ("ats", "ats_delta", "job_fit", "role_profile")
+
+
+# ============================================================================
+# PARSING AND REPAIR
+# ============================================================================
+
+def validate_payload(obj: Dict[str, Any], section: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Validated payload for `section` (or every known section present), None when invalid."""
+    if section in OBJECT_SECTIONS and section not in obj:
+        # Bare object without its wrapper key, e.g. the profile fields alone
+        obj = {section: obj}
+    sections = (section,) if section is not None else tuple(key for key in SECTION_MODELS if key in obj)
+    payload: Dict[str, Any] = {}
+    for name in sections:
+        if name not in obj:
+            return None
+        try:
+            payload.update(SECTION_MODELS[name].model_validate({name: obj[name]}).model_dump())
+        except ValidationError:
+            return None
+    return payload or None
+
+
+def parse_task_output(text: str, section: Optional[str] = None,
+                      task: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Validated payload from one task's raw output, or None.
+    With `task` set, failures are counted in the parse-failure metric.
+    """
+    obj = extract_json(text, (section,) if section else tuple(SECTION_MODELS))
+    payload = validate_payload(obj, section) if obj is not None else None
+    if payload is None and task is not None:
+        OUTPUT_PARSE_FAILURES.inc(task=task, reason="no_json" if obj is None else "schema")
+    return payload
+
+
+def repair_task_output(task: str, section: str, text: str,
+                       attempts: int = OUTPUT_REPAIR_ATTEMPTS) -> Optional[Dict[str, Any]]:
+    """Re-ask the LLM for only this task's JSON, given its malformed output."""
+    from resume_agent import get_llm, output_json_format
+
+    prompt = REPAIR_PROMPT.format(
+        section=section, json_format=output_json_format(section), output=text[-REPAIR_MAX_CHARS:]
+    )
+    for _ in range(attempts):
+        try:
+            answer = get_llm().call(prompt)
+        except Exception as e:
+            logger.warning("Output repair for %s failed: %s", task, e)
+            break
+        payload = parse_task_output(str(answer), section)
+        if payload is not None:
+            OUTPUT_REPAIRS.inc(task=task, outcome="repaired")
+            return payload
+    OUTPUT_REPAIRS.inc(task=task, outcome="failed")
+    return None
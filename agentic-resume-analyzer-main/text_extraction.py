@@ -0,0 +1,64 @@
+"""
+Resume text extraction (PDF / DOCX).
+
+Kept free of CrewAI / Gemini imports so it can run in worker processes
+without paying the agent stack's import cost.
+"""
+
+import io
+import os
+import docx  # python-docx for DOCX processing
+from typing import Union
+
+from pdf_extraction import extract_pdf_text
+from docx_extraction import extract_docx_text_streaming
+
+Source = Union[str, bytes]
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+# "stream" also reads tables, text boxes and header/footer parts;
+# "python-docx" is the original body-paragraphs-only reader
+DOCX_ENGINES = ("stream", "python-docx")
+DOCX_ENGINE = os.getenv("ANALYZER_DOCX_ENGINE", "stream")
+
+
+def extract_text_from_pdf(source: Source, **options) -> str:
+    # options: mode / max_pages / max_chars / workers, see pdf_extraction
+    return extract_pdf_text(source, **options)
+
+
+def extract_text_from_docx_python_docx(source: Source):
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    doc = docx.Document(source)
+    return "\n".join(para.text for para in doc.paragraphs)
+
+
+def extract_text_from_docx(source: Source, engine: str = DOCX_ENGINE):
+    if engine == "stream":
+        return extract_docx_text_streaming(source)
+    elif engine == "python-docx":
+        return extract_text_from_docx_python_docx(source)
+    raise ValueError(f"Unknown DOCX engine '{engine}', expected one of {DOCX_ENGINES}")
+
+
+def extract_text_from_resume(file_path, docx_engine: str = DOCX_ENGINE):
+    if file_path.endswith(".pdf"):
+        return extract_text_from_pdf(file_path)
+    elif file_path.endswith(".docx"):
+        return extract_text_from_docx(file_path, docx_engine)
+    else:
+        return "Unsupported file format."
+
+
+def extract_text_from_bytes(filename: str, data: bytes, docx_engine: str = DOCX_ENGINE,
+                            page_separator: str = ""):
+    """Extract from an in-memory upload, dispatching on the original filename."""
+    name = (filename or "").lower()
+    if name.endswith(".pdf"):
+        return extract_text_from_pdf(data, page_separator=page_separator)
+    elif name.endswith(".docx"):
+        return extract_text_from_docx(data, docx_engine)
+    else:
+        return "Unsupported file format."